@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""링크별 Bedrock 분석 결과 캐시
+
+편집자가 같은 호를 여러 번 AI 분석하고 같은 공고가 몇 주 연속으로 실리는데, 그때마다
+모델을 다시 호출했다. 모델 출력은 모델에 보내는 입력(정규 URL, 링크 텍스트, 카테고리,
+스크래핑한 key_info)과 모델 ID, 프롬프트 형식(link_prompt.PROMPT_VERSION)으로만 정해지므로
+이 값들로 만든 키마다 링크별 결과를 SQLite에 저장하고, 캐시에 없는 링크만 모델로 보낸다.
+bedrock_claude.py와 api/analyze_batch.py가 함께 사용하며, api/analysis_cache.py는 이 파일과 동일하게 유지할 것.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from link_prompt import PROMPT_VERSION, compact_link
+from scrape_cache import SCRAPE_CACHE_DB
+from url_canonical import canonical_url
+
+# 결과를 다시 쓸 기간(초)과 최대 항목 수 (넘으면 가장 오래전에 쓴 항목부터 삭제)
+ANALYSIS_CACHE_TTL = int(os.environ.get("ANALYSIS_CACHE_TTL", 30 * 86400))
+ANALYSIS_CACHE_MAX_ITEMS = int(os.environ.get("ANALYSIS_CACHE_MAX_ITEMS", 20000))
+
+
+def analysis_key(link, model_id):
+    """모델 입력과 모델 ID, 프롬프트 형식 버전으로 만든 캐시 키"""
+    row = compact_link(link)
+    row[0] = canonical_url(row[0])
+    return hashlib.sha256(
+        json.dumps([model_id, PROMPT_VERSION] + row, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+def is_cacheable(result):
+    """캐시에 저장할 수 있는 정상 분석 결과인지 확인"""
+    return isinstance(result, dict) and bool(result) and not result.get("error")
+
+
+class AnalysisCache:
+    """캐시 키 -> 링크 하나의 분석 결과를 저장하는 SQLite 캐시"""
+
+    def __init__(
+        self, path=SCRAPE_CACHE_DB, ttl=ANALYSIS_CACHE_TTL, max_items=ANALYSIS_CACHE_MAX_ITEMS
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_items = max_items
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS analysis_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    result TEXT NOT NULL,
+                    model_id TEXT NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )"""
+            )
+            self._local.conn = conn
+        return conn
+
+    def _count(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def get_many(self, links, model_id):
+        """캐시에 있는 링크의 결과를 URL -> 결과로 반환 (유효 기간이 지난 항목 제외)"""
+        keys = {}  # 캐시 키 -> 같은 키의 URL 목록 (예: 추적 파라미터만 다른 URL)
+        for link in links:
+            keys.setdefault(analysis_key(link, model_id), []).append(link["url"])
+        if not self.path or not keys:
+            return {}
+        found = {}
+        try:
+            conn = self._connect()
+            cache_keys = list(keys)
+            # SQLite 변수 개수 제한(기본 999) 아래로 나눠서 조회
+            for start in range(0, len(cache_keys), 500):
+                chunk = cache_keys[start:start + 500]
+                rows = conn.execute(
+                    "SELECT cache_key, result FROM analysis_cache "
+                    f"WHERE cache_key IN ({','.join('?' * len(chunk))}) AND created_at > ?",
+                    chunk + [time.time() - self.ttl],
+                ).fetchall()
+                for cache_key, result in rows:
+                    found[cache_key] = json.loads(result)
+                if rows:
+                    conn.execute(
+                        "UPDATE analysis_cache SET last_used = ? "
+                        f"WHERE cache_key IN ({','.join('?' * len(rows))})",
+                        [time.time()] + [row[0] for row in rows],
+                    )
+        except sqlite3.Error:
+            self._count(errors=1)
+            return {}
+        return {
+            url: found[cache_key]
+            for cache_key, urls in keys.items()
+            if cache_key in found
+            for url in urls
+        }
+
+    def put_many(self, links, results, model_id):
+        """URL을 키로 하는 분석 결과 중 정상 결과만 링크별 캐시 키로 저장"""
+        items = [
+            (analysis_key(link, model_id), results[link["url"]])
+            for link in links
+            if is_cacheable(results.get(link["url"]))
+        ]
+        if not self.path or not items:
+            return
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO analysis_cache VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            cache_key,
+                            json.dumps(result, ensure_ascii=False),
+                            model_id,
+                            PROMPT_VERSION,
+                            now,
+                            now,
+                        )
+                        for cache_key, result in items
+                    ],
+                )
+                conn.execute(
+                    "DELETE FROM analysis_cache WHERE rowid IN (SELECT rowid FROM analysis_cache "
+                    "ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_items,),
+                )
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            self._count(errors=1)
+            return
+        self._count(writes=len(items))
+
+    def _split(self, links, model_id):
+        """(URL -> 캐시된 결과, 모델로 보낼 링크 목록)"""
+        cached = self.get_many(links, model_id)
+        misses = [link for link in links if link["url"] not in cached]
+        self._count(hits=len(links) - len(misses), misses=len(misses))
+        return cached, misses
+
+    def run(self, links, model_id, analyze):
+        """캐시에 없는 링크만 analyze(링크 목록)로 분석하고 캐시된 결과와 합쳐 URL을 키로 반환
+
+        analyze 결과에 링크가 아닌 키(예: "error")가 있으면 그대로 남긴다.
+        """
+        cached, misses = self._split(links, model_id)
+        results = dict(analyze(misses)) if misses else {}
+        self.put_many(misses, results, model_id)
+        results.update(cached)
+        return results
+
+    def stream(self, links, model_id, analyze_stream):
+        """run의 스트리밍 버전: 캐시된 결과를 먼저, 새로 분석한 결과는 완성되는 대로 (URL, 결과) 반환"""
+        cached, misses = self._split(links, model_id)
+        yield from cached.items()
+        if not misses:
+            return
+        by_url = {}
+        for link in misses:
+            by_url.setdefault(link["url"], []).append(link)
+        for url, result in analyze_stream(misses):
+            self.put_many(by_url.get(url, []), {url: result}, model_id)
+            yield url, result
+
+    def stats(self):
+        items = None
+        try:
+            if self.path:
+                items = self._connect().execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            return {
+                "items": items,
+                "max_items": self.max_items,
+                "prompt_version": PROMPT_VERSION,
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "errors": self.errors,
+            }
+
+
+analysis_cache = AnalysisCache()
@@ -2,7 +2,85 @@ from http.server import BaseHTTPRequestHandler
 import json
 import os
 
+from analysis_cache import analysis_cache
+from bedrock_batch import analyze_in_chunks, iter_stream_text, stream_in_chunks, stream_line
+from link_prompt import batch_request_body
+
+MODEL_ID = 'anthropic.claude-3-haiku-20240307-v1:0'
+
+
+def analyze_links(client, links):
+    """출력 토큰 예산에 맞춘 묶음으로 나눠 동시에 분석하고 URL을 키로 하는 결과 반환 (캐시에 없는 링크만)"""
+    return analysis_cache.run(
+        links,
+        MODEL_ID,
+        lambda misses: analyze_in_chunks(misses, lambda chunk: analyze_chunk(client, chunk)),
+    )
+
+
+def stream_links(client, links):
+    """analyze_links의 스트리밍 버전: 링크별 결과가 완성되는 대로 (URL, 결과) 반환"""
+    return analysis_cache.stream(
+        links,
+        MODEL_ID,
+        lambda misses: stream_in_chunks(misses, lambda chunk: stream_chunk(client, chunk)),
+    )
+
+
+def stream_chunk(client, links):
+    """Bedrock 스트리밍 호출로 링크 묶음을 분석하며 생성되는 텍스트 조각 반환"""
+    bedrock_response = client.invoke_model_with_response_stream(
+        modelId=MODEL_ID,
+        body=batch_request_body(links),
+        contentType='application/json'
+    )
+    return iter_stream_text(bedrock_response)
+
+
+def analyze_chunk(client, links):
+    """Bedrock으로 링크 묶음을 분석해 URL을 키로 하는 결과 반환 (실패하면 error 키를 담은 dict)"""
+    # Bedrock API 호출
+    bedrock_response = client.invoke_model(
+        modelId=MODEL_ID,
+        body=batch_request_body(links),
+        contentType='application/json'
+    )
+    
+    response_body = json.loads(bedrock_response['body'].read())
+    content = response_body.get('content', [{}])[0].get('text', '{}')
+    
+    # JSON 파싱 시도
+    result = None
+    try:
+        result = json.loads(content)
+    except json.JSONDecodeError:
+        # JSON 파싱 실패 시 텍스트에서 JSON 부분 추출
+        import re
+        json_match = re.search(r'\{.*\}', content, re.DOTALL)
+        if json_match:
+            result = json.loads(json_match.group())
+        else:
+            result = {"error": "Failed to parse AI response", "raw": content}
+    return result
+
+
 class handler(BaseHTTPRequestHandler):
+    def stream_entries(self, entries, total, sse):
+        """(URL, 결과)를 한 줄씩 보내고 마지막에 done 줄을 보낸다"""
+        count = 0
+        try:
+            for url, result in entries:
+                self.wfile.write(stream_line({'url': url, 'result': result}, sse))
+                self.wfile.flush()
+                count += 1
+            self.wfile.write(stream_line({'done': True, 'count': count, 'total': total}, sse))
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # 브라우저가 연결을 끊음
+        except Exception as e:
+            self.wfile.write(
+                stream_line({'done': True, 'count': count, 'total': total, 'error': str(e)}, sse)
+            )
+
     def do_OPTIONS(self):
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
@@ -12,13 +90,6 @@ class handler(BaseHTTPRequestHandler):
 
     def do_POST(self):
         try:
-            # CORS 헤더 설정
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json; charset=utf-8')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
-            self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-            
             # POST 데이터 읽기
             content_length = int(self.headers.get('Content-Length', 0))
             post_data = self.rfile.read(content_length)
@@ -26,6 +97,22 @@ class handler(BaseHTTPRequestHandler):
             
             links = data.get('links', [])
             
+            # stream이면 링크별 결과가 완성되는 대로 NDJSON(Accept: text/event-stream이면 SSE)으로 전송
+            stream = bool(data.get('stream'))
+            sse = stream and 'text/event-stream' in self.headers.get('Accept', '')
+            
+            # CORS 헤더 설정
+            self.send_response(200)
+            if sse:
+                self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+            elif stream:
+                self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+            else:
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
+            self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+            
             # Vercel 환경변수 확인
             aws_access_key = os.environ.get('AWS_ACCESS_KEY_ID')
             aws_secret_key = os.environ.get('AWS_SECRET_ACCESS_KEY')
@@ -60,84 +147,22 @@ class handler(BaseHTTPRequestHandler):
                     aws_secret_access_key=aws_secret_key
                 )
                 
-                # 프롬프트 생성
-                prompt = f"""오렌지레터 뉴스레터의 링크들을 분석해주세요.
-
-링크 목록:
-{json.dumps(links, ensure_ascii=False, indent=2)}
-
-모든 링크를 분석하여 URL을 키로 하는 JSON 객체로 응답해주세요.
-각 링크에 대해 다음 정보를 포함해야 합니다:
-
-{{
-  "링크URL1": {{
-    "suggested_text": "카테고리별 규칙에 맞는 이상적인 링크 텍스트",
-    "accuracy": 0-100 사이의 정확도 점수,
-    "issues": ["개선사항1", "개선사항2"],
-    "key_info": {{
-      "title": "제목",
-      "organizer": "주최자/회사명",
-      "period": "기간/마감일",
-      "location": "장소",
-      "target": "대상"
-    }}
-  }},
-  "링크URL2": {{ ... }}
-}}
-
-카테고리별 링크 텍스트 규칙:
-- job (채용): [회사명] 직군 채용 (경력구분, 마감일)
-- funding (펀딩/캠페인): 프로젝트명 펀딩 (~마감일)
-- education (교육/모임): [주최] 프로그램명 (장소, 날짜)
-- contest (공모/지원): 공모전명 (~마감일)
-- event (행사): [주최] 행사명 (장소, 기간)
-
-중요: 반드시 모든 링크를 분석하고, URL을 키로 하는 단일 JSON 객체로 응답하세요."""
-
-                # Bedrock API 호출
-                request_body = json.dumps({
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "max_tokens": 4000,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.3,
-                    "top_p": 0.9
-                })
-                
-                bedrock_response = client.invoke_model(
-                    modelId="anthropic.claude-3-haiku-20240307-v1:0",
-                    body=request_body,
-                    contentType='application/json'
-                )
+                # 같은 링크를 같은 모델과 프롬프트로 분석한 결과는 analysis_cache에서 바로 돌려준다
+                if stream:
+                    entries = stream_links(client, links)
+                    self.send_header('Cache-Control', 'no-cache')
+                    self.end_headers()
+                    self.stream_entries(entries, len(links), sse)
+                    return
                 
-                response_body = json.loads(bedrock_response['body'].read())
-                content = response_body.get('content', [{}])[0].get('text', '{}')
+                result = analyze_links(client, links)
                 
-                # JSON 파싱 시도
-                result = None
-                try:
-                    result = json.loads(content)
-                except json.JSONDecodeError:
-                    # JSON 파싱 실패 시 텍스트에서 JSON 부분 추출
-                    import re
-                    json_match = re.search(r'\{.*\}', content, re.DOTALL)
-                    if json_match:
-                        result = json.loads(json_match.group())
+                # URL이 키인 결과만 쓰고, 결과가 없는 링크(실패한 묶음, 형식 오류)는 실패로 표시
+                formatted_result = {}
+                for link in links:
+                    if isinstance(result, dict) and isinstance(result.get(link['url']), dict):
+                        formatted_result[link['url']] = result[link['url']]
                     else:
-                        result = {"error": "Failed to parse AI response", "raw": content}
-                
-                # 응답이 이미 올바른 형식인지 확인
-                if isinstance(result, dict) and not result.get('error'):
-                    # URL이 키인 딕셔너리 형태로 되어 있는지 확인
-                    formatted_result = result
-                else:
-                    # 에러가 있거나 형식이 잘못된 경우
-                    formatted_result = {}
-                    for link in links:
                         formatted_result[link['url']] = {
                             'suggested_text': link['text'],
                             'accuracy': 0,
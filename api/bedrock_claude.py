@@ -1,7 +1,11 @@
 import json
 import boto3
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Tuple
+
+from analysis_cache import analysis_cache
+from bedrock_batch import analyze_in_chunks, iter_stream_text, stream_in_chunks
+from link_prompt import batch_request_body
 
 class BedrockClaude:
     def __init__(self):
@@ -14,43 +18,32 @@ class BedrockClaude:
         self.model_id = "anthropic.claude-3-haiku-20240307-v1:0"
     
     def analyze_links_batch(self, links: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """여러 링크를 한 번에 분석"""
-        
-        prompt = f"""오렌지레터 뉴스레터의 링크들을 분석해주세요.
-
-링크 목록:
-{json.dumps(links, ensure_ascii=False, indent=2)}
-
-각 링크에 대해 다음 정보를 JSON 형식으로 제공해주세요:
-1. suggested_text: 카테고리별 규칙에 맞는 이상적인 링크 텍스트
-2. accuracy: 현재 텍스트의 정확도 점수 (0-100)
-3. issues: 개선이 필요한 사항들 (배열)
-4. key_info: 링크에서 추출한 핵심 정보 (제목, 주최자, 기간, 장소 등)
+        """여러 링크를 출력 토큰 예산에 맞춘 묶음으로 나눠 동시에 분석 (캐시에 없는 링크만)"""
+        return analysis_cache.run(
+            links, self.model_id, lambda misses: analyze_in_chunks(misses, self._analyze_chunk)
+        )
 
-카테고리별 링크 텍스트 규칙:
-- job (채용): [회사명] 직군 채용 (경력구분, 마감일)
-- funding (펀딩/캠페인): 프로젝트명 펀딩 (~마감일)
-- education (교육/모임): [주최] 프로그램명 (장소, 날짜)
-- contest (공모/지원): 공모전명 (~마감일)
-- event (행사): [주최] 행사명 (장소, 기간)
+    def analyze_links_stream(self, links: List[Dict[str, Any]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """analyze_links_batch의 스트리밍 버전: 링크별 결과가 완성되는 대로 (URL, 결과) 반환"""
+        return analysis_cache.stream(
+            links, self.model_id, lambda misses: stream_in_chunks(misses, self._stream_chunk)
+        )
 
-JSON 형식으로만 응답해주세요."""
+    def _stream_chunk(self, links: List[Dict[str, Any]]) -> Iterator[str]:
+        """링크 묶음 하나를 스트리밍 호출로 분석하며 생성되는 텍스트 조각 반환"""
+        response = self.client.invoke_model_with_response_stream(
+            modelId=self.model_id,
+            body=batch_request_body(links),
+            contentType='application/json'
+        )
+        return iter_stream_text(response)
 
+    def _analyze_chunk(self, links: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """링크 묶음 하나를 한 번의 호출로 분석"""
         try:
             response = self.client.invoke_model(
                 modelId=self.model_id,
-                body=json.dumps({
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "max_tokens": 4000,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.3,
-                    "top_p": 0.9
-                }),
+                body=batch_request_body(links),
                 contentType='application/json'
             )
             
@@ -74,13 +67,13 @@ JSON 형식으로만 응답해주세요."""
             return {"error": str(e)}
     
     def extract_page_info(self, url: str, html_content: str) -> Dict[str, Any]:
-        """단일 페이지의 정보를 추출"""
+        """단일 페이지의 정보를 추출 (html_content는 HTML 또는 스크래핑한 본문 텍스트)"""
         
-        prompt = f"""다음 웹페이지의 HTML에서 정보를 추출해주세요.
+        prompt = f"""다음 웹페이지의 내용(HTML 또는 본문 텍스트)에서 정보를 추출해주세요.
 
 URL: {url}
 
-HTML (첫 5000자):
+내용 (첫 5000자):
 {html_content[:5000]}
 
 다음 정보를 JSON 형식으로 추출해주세요:
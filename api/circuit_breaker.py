@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""호스트별 서킷 브레이커
+
+응답하지 않거나 봇 차단(403)을 돌려주는 사이트는 링크마다 최대 45초를 기다리게 하고,
+한 호에 같은 사이트 링크가 여러 개 있는 경우가 많다. scrape_page가 분류한 오류로
+호스트마다 연속 실패를 세고, 실패가 쌓이면 일정 시간 동안 같은 호스트의 다른 링크는
+요청하지 않고 마지막 오류(errorType)로 바로 실패시킨다.
+
+- closed: 평소 상태, 요청을 보낸다
+- open: 실패가 CIRCUIT_FAILURE_THRESHOLD번 이어진 뒤 CIRCUIT_OPEN_SECONDS 동안 바로 실패
+- half_open: 대기 시간이 지나면 요청 하나만 보내 보고, 성공하면 closed, 실패하면 다시 open
+api/circuit_breaker.py는 이 파일과 동일하게 유지할 것.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+# 연속 실패 몇 번에 열지(0이면 사용 안 함), 열린 상태를 유지할 시간(초), 기억할 호스트 수
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", 2))
+CIRCUIT_OPEN_SECONDS = int(os.environ.get("CIRCUIT_OPEN_SECONDS", 120))
+CIRCUIT_MAX_HOSTS = 1024
+
+# 사이트 자체의 문제로 보는 HTTP 상태 코드 (404 등은 페이지 문제라서 세지 않음)
+HOST_FAILURE_CODES = {403, 429, 500, 502, 503, 504}
+
+
+def host_of(url):
+    host = urlparse(url.strip()).netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def is_host_failure(page_info):
+    """같은 호스트의 다른 페이지도 실패할 가능성이 높은 오류인지 확인"""
+    if not page_info or not page_info.get("error"):
+        return False
+    error_type = page_info.get("errorType")
+    if error_type in ("timeout", "connection", "ssl"):
+        return True
+    return error_type == "http" and page_info.get("errorCode") in HOST_FAILURE_CODES
+
+
+class HostCircuitBreaker:
+    """호스트마다 closed/open/half_open 상태와 마지막 실패 결과를 관리"""
+
+    def __init__(
+        self,
+        threshold=CIRCUIT_FAILURE_THRESHOLD,
+        open_seconds=CIRCUIT_OPEN_SECONDS,
+        max_hosts=CIRCUIT_MAX_HOSTS,
+    ):
+        self.threshold = threshold
+        self.open_seconds = open_seconds
+        self.max_hosts = max_hosts
+        self._hosts = OrderedDict()  # 호스트 -> 상태 dict
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.fast_failed = 0
+        self.probes = 0
+        self.recovered = 0
+
+    def before(self, url):
+        """요청을 보내도 되면 None, 아니면 바로 돌려줄 실패 page_info 반환"""
+        if self.threshold <= 0:
+            return None
+        host = host_of(url)
+        with self._lock:
+            circuit = self._hosts.get(host)
+            if circuit is None or circuit["state"] == "closed":
+                return None
+            if time.monotonic() - circuit["opened_at"] >= self.open_seconds:
+                # 대기 시간이 지났으면 이 요청 하나로 호스트가 살아났는지 확인
+                # (확인 요청이 끝나지 않은 채 open_seconds가 지나면 다시 하나를 보낸다)
+                circuit["state"] = "half_open"
+                circuit["opened_at"] = time.monotonic()
+                self.probes += 1
+                return None
+            self.fast_failed += 1
+            last_error = circuit["last_error"]
+
+        page_info = dict(last_error)
+        page_info["circuitOpen"] = True
+        page_info["errorMessage"] = (
+            f"{last_error.get('errorMessage') or last_error.get('description')} "
+            "(같은 사이트의 이전 요청이 실패해서 요청하지 않음)"
+        )
+        return page_info
+
+    def after(self, url, page_info):
+        """요청 결과로 호스트 상태 갱신 (page_info가 None이면 304 응답)"""
+        if self.threshold <= 0:
+            return
+        host = host_of(url)
+        with self._lock:
+            circuit = self._hosts.get(host)
+            if not is_host_failure(page_info):
+                # 호스트가 응답했으므로 (404 등 페이지 오류 포함) 실패 기록을 지운다
+                if circuit is not None:
+                    if circuit["state"] != "closed":
+                        self.recovered += 1
+                    del self._hosts[host]
+                return
+
+            if circuit is None:
+                circuit = self._hosts[host] = {"state": "closed", "failures": 0}
+                while len(self._hosts) > self.max_hosts:
+                    self._hosts.popitem(last=False)
+            circuit["failures"] += 1
+            circuit["last_error"] = dict(page_info)
+            self._hosts.move_to_end(host)
+            if circuit["state"] == "half_open" or (
+                circuit["state"] == "closed" and circuit["failures"] >= self.threshold
+            ):
+                circuit["state"] = "open"
+                circuit["opened_at"] = time.monotonic()
+                self.opened += 1
+
+    def stats(self):
+        with self._lock:
+            open_hosts = [
+                host for host, circuit in self._hosts.items() if circuit["state"] != "closed"
+            ]
+            return {
+                "threshold": self.threshold,
+                "open_seconds": self.open_seconds,
+                "failing_hosts": len(self._hosts),
+                "open_hosts": open_hosts[-20:],
+                "opened": self.opened,
+                "fast_failed": self.fast_failed,
+                "probes": self.probes,
+                "recovered": self.recovered,
+            }
+
+
+host_breaker = HostCircuitBreaker()
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 import json
-import requests
 from urllib.parse import parse_qs
 from http.server import BaseHTTPRequestHandler
 
+import http_client
+
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
         # Parse query parameters
@@ -13,24 +14,20 @@ class handler(BaseHTTPRequestHandler):
             url = query_params.get('url', [None])[0]
             
             if url:
+                response = None
                 try:
-                    headers = {
-                        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                        'Accept-Language': 'ko-KR,ko;q=0.9,en;q=0.8'
-                    }
-                    response = requests.get(url, headers=headers, timeout=30, allow_redirects=True)  # Vercel Pro: 10s -> 30s
+                    # 클라이언트가 보낸 검증자로 업스트림에 조건부 요청
+                    response, content_encoding, chunks = http_client.stream_upstream(
+                        url,
+                        self.headers.get('Accept-Encoding', ''),
+                        headers=http_client.forwarded_conditional_headers(self.headers) or None,
+                        timeout=30,  # Vercel Pro: 10s -> 30s
+                        allow_redirects=True
+                    )
                     response.raise_for_status()
-                    
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'text/html; charset=utf-8')
-                    self.send_header('Access-Control-Allow-Origin', '*')
-                    self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-                    self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-                    self.end_headers()
-                    self.wfile.write(response.content)
-                    return
                 except Exception as e:
+                    if response is not None:
+                        response.close()
                     self.send_response(500)
                     self.send_header('Content-Type', 'application/json')
                     self.send_header('Access-Control-Allow-Origin', '*')
@@ -38,6 +35,53 @@ class handler(BaseHTTPRequestHandler):
                     error_response = json.dumps({'error': str(e)})
                     self.wfile.write(error_response.encode())
                     return
+
+                validators = http_client.validator_headers(response, content_encoding)
+                if response.status_code == 304:
+                    # 바뀌지 않았으면 본문 없이 304만 전달
+                    response.close()
+                    self.send_response(304)
+                    for name, value in validators:
+                        self.send_header(name, value)
+                    self.send_header('Access-Control-Allow-Origin', '*')
+                    self.end_headers()
+                    return
+
+                # 업스트림 청크를 그대로 전달 (HTTP/1.1이면 chunked, 아니면 연결 종료로 끝을 알림)
+                chunked = self.request_version == 'HTTP/1.1'
+                if chunked:
+                    self.protocol_version = 'HTTP/1.1'
+                try:
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/html; charset=utf-8')
+                    if content_encoding:
+                        self.send_header('Content-Encoding', content_encoding)
+                    self.send_header('Vary', 'Accept-Encoding')
+                    for name, value in validators:
+                        self.send_header(name, value)
+                    if chunked:
+                        self.send_header('Transfer-Encoding', 'chunked')
+                    self.send_header('Connection', 'close')
+                    self.send_header('Access-Control-Allow-Origin', '*')
+                    self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+                    self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+                    self.end_headers()
+                    for chunk in chunks:
+                        if not chunk:
+                            continue
+                        if chunked:
+                            self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                        else:
+                            self.wfile.write(chunk)
+                    if chunked:
+                        self.wfile.write(b'0\r\n\r\n')
+                except Exception as e:
+                    # 헤더를 보낸 뒤에는 상태 코드를 바꿀 수 없으므로 기록만 하고 연결을 닫는다
+                    self.log_error('fetch proxy aborted: %s', e)
+                finally:
+                    self.close_connection = True
+                    response.close()
+                return
             else:
                 self.send_response(400)
                 self.send_header('Content-Type', 'application/json')
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""뉴스레터 호(issue)별 이전 AI 보강 결과 저장과 바뀐 링크만 다시 보강
+
+규칙 기반 스크래핑 결과는 link_index와 scrape_cache가 URL마다 다시 쓰지만, 신뢰도가 낮은
+링크를 Bedrock으로 보강하는 단계(escalation)는 같은 호를 다시 분석할 때마다 모델을 다시
+호출했다. 여기서는 호 URL마다 직전 실행에서 보강한 링크별 결과를 SQLite에 저장해 두고,
+다시 실행하면 정규 URL, 카테고리, 링크 텍스트와 규칙 기반 추출 결과의 내용 해시가 모두
+같은 링크는 저장된 결과를 돌려주고 새로 생기거나 바뀐 링크만 모델로 보낸다.
+페이지를 다시 가져와 추출 결과가 달라지면 해시가 바뀌므로 다시 보강한다.
+api/issue_store.py는 이 파일과 동일하게 유지할 것.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from escalation import low_confidence_fields
+from scrape_cache import SCRAPE_CACHE_DB
+from url_canonical import canonical_url
+
+# 결과를 보관할 호 수 (넘으면 가장 오래전에 실행한 호부터 삭제)
+ISSUE_STORE_MAX_ISSUES = int(os.environ.get("ISSUE_STORE_MAX_ISSUES", 200))
+
+
+def link_key(link, page_info):
+    """링크 비교용 키: 정규 URL, 카테고리, 링크 텍스트와 규칙 기반 추출 결과의 내용 해시"""
+    return hashlib.sha256(
+        json.dumps(
+            [
+                canonical_url(link.get("url") or ""),
+                link.get("category") or "",
+                (link.get("text") or "").strip(),
+                page_info,
+            ],
+            ensure_ascii=False,
+            sort_keys=True,
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+def is_reusable(result):
+    """다음 실행에서 다시 써도 되는 결과인지 (오류 결과는 다음에 다시 시도)"""
+    return isinstance(result, dict) and not result.get("error")
+
+
+class IssueStore:
+    """호 URL별 직전 실행에서 모델로 보강한 링크 키 -> 결과를 저장하는 SQLite 저장소"""
+
+    def __init__(self, path=SCRAPE_CACHE_DB, max_issues=ISSUE_STORE_MAX_ISSUES):
+        self.path = path
+        self.max_issues = max_issues
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.reused = 0
+        self.processed = 0
+        self.errors = 0
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS issue_escalations (
+                    issue_key TEXT PRIMARY KEY,
+                    results TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+            self._local.conn = conn
+        return conn
+
+    def _count(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def load(self, issue_url):
+        """직전 실행에서 저장한 링크 키 -> 결과 (없으면 빈 dict)"""
+        if not self.path:
+            return {}
+        try:
+            row = self._connect().execute(
+                "SELECT results FROM issue_escalations WHERE issue_key = ?",
+                (canonical_url(issue_url),),
+            ).fetchone()
+        except sqlite3.Error:
+            self._count(errors=1)
+            return {}
+        return json.loads(row[0]) if row else {}
+
+    def save(self, issue_url, results):
+        """이번 실행의 링크 키 -> 결과를 저장"""
+        if not self.path:
+            return
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO issue_escalations VALUES (?, ?, ?)",
+                (canonical_url(issue_url), json.dumps(results, ensure_ascii=False), time.time()),
+            )
+            conn.execute(
+                "DELETE FROM issue_escalations WHERE rowid IN (SELECT rowid FROM issue_escalations "
+                "ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_issues,),
+            )
+        except sqlite3.Error:
+            self._count(errors=1)
+
+    def run(self, issue, links, results, escalate_links):
+        """URL을 키로 하는 규칙 기반 결과 중 직전 실행과 달라진 링크만 escalate_links로 보강
+
+        issue는 {"url": 뉴스레터 URL}, links는 url/category/text를 담은 dict 목록이다.
+        escalate_links(results, 보낼 링크 목록)는 escalation.escalate처럼 URL을 키로 하는 결과를
+        반환하고 모델로 보내지 않은 링크는 받은 결과 객체를 그대로 둔다. 모델이 답한 결과만
+        저장하므로 제한 시간 때문에 건너뛴 링크는 다음 실행에서 다시 보낸다.
+        """
+        keys = {}  # URL -> 링크 키 (같은 URL은 escalate와 같이 첫 링크 기준)
+        for link in links:
+            url = link.get("url")
+            if url in keys or not low_confidence_fields(results.get(url), link.get("category")):
+                continue
+            keys[url] = link_key(link, results[url])
+        if not keys:
+            return results
+
+        stored = self.load(issue.get("url") or "")
+        merged = dict(results)
+        pending = []
+        pending_keys = {}  # 링크 키 -> 모델로 보낸 URL
+        for link in links:
+            url = link.get("url")
+            key = keys.get(url)
+            if key is None or key in stored or key in pending_keys:
+                continue
+            pending.append(link)
+            pending_keys[key] = url
+
+        escalated = escalate_links(results, pending) if pending else {}
+        current = {}
+        for url, key in keys.items():
+            if key in stored:
+                merged[url] = stored[key]
+            else:
+                # 키가 같은 링크(예: 추적 파라미터만 다른 URL)는 한 번만 보냈으므로 그 결과를 쓴다
+                source = pending_keys[key]
+                answer = escalated.get(source, results[source])
+                if answer is results[source]:
+                    continue  # 모델이 답하지 않았거나 시간이 모자라 보내지 않은 링크
+                merged[url] = answer
+                if not is_reusable(answer):
+                    continue
+            current[key] = merged[url]
+
+        self.save(issue.get("url") or "", current)
+        self._count(
+            runs=1,
+            reused=len({key for key in keys.values() if key in stored}),
+            processed=len(pending),
+        )
+        return merged
+
+    def stats(self):
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "reused": self.reused,
+                "processed": self.processed,
+                "errors": self.errors,
+            }
+
+
+issue_store = IssueStore()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""링크 일괄 분석용 최소 프롬프트 생성
+
+두 Bedrock 경로 모두 브라우저가 붙인 필드(id, section, order, position)까지
+json.dumps(links, indent=2)로 넣고 긴 규칙 문단을 매번 보냈다. 여기서는 모델에 필요한
+필드(url, text, category, 스크래핑한 key_info가 있으면 그 값)만 골라 링크마다 한 줄짜리
+JSON 배열로 보내고, 규칙은 짧게 줄여 system 프롬프트로 보낸다. 보내기 전에 입력 토큰을
+추정해서 이전 형식과 비교한 절약량을 집계한다.
+bedrock_claude.py와 api/analyze_batch.py가 함께 사용하며, api/link_prompt.py는 이 파일과 동일하게 유지할 것.
+"""
+import hashlib
+import json
+import threading
+
+from bedrock_batch import BEDROCK_MAX_TOKENS, estimate_tokens
+
+# 모델에 보낼 링크 필드와 key_info 항목
+PROMPT_FIELDS = ("url", "text", "category")
+KEY_INFO_FIELDS = ("title", "organizer", "period", "location", "target")
+
+SYSTEM_PROMPT = """오렌지레터 뉴스레터 링크 텍스트 검수. 링크마다 카테고리 규칙에 맞는 이상적인 링크 텍스트를 제안하고 현재 텍스트를 평가한다.
+규칙:
+job: [회사명] 직군 채용 (경력구분, 마감일)
+funding: 프로젝트명 펀딩 (~마감일)
+education: [주최] 프로그램명 (장소, 날짜)
+contest: 공모전명 (~마감일)
+event: [주최] 행사명 (장소, 기간)
+모든 링크를 빠짐없이, 링크 URL을 키로 하는 JSON 객체 하나로만 응답:
+{"URL":{"suggested_text":"","accuracy":0-100,"issues":[""],"key_info":{"title":"","organizer":"","period":"","location":"","target":""}}}"""
+
+USER_PROMPT_HEADER = "링크 (한 줄에 하나, [url, 현재 텍스트, 카테고리, 페이지 정보(있으면)]):"
+
+# 프롬프트 형식 버전: 규칙이나 링크 필드가 바뀌면 달라져서 이전 형식으로 받은 분석 캐시를 쓰지 않는다
+PROMPT_VERSION = hashlib.sha256(
+    json.dumps(
+        [SYSTEM_PROMPT, USER_PROMPT_HEADER, PROMPT_FIELDS, KEY_INFO_FIELDS], ensure_ascii=False
+    ).encode("utf-8")
+).hexdigest()[:16]
+
+# 이전 프롬프트의 고정 부분(설명과 규칙)의 추정 토큰 수, 절약량 계산에만 쓴다
+LEGACY_PROMPT_TOKENS = 274
+
+_stats = {"requests": 0, "links": 0, "input_tokens": 0, "legacy_input_tokens": 0, "last": None}
+_stats_lock = threading.Lock()
+
+
+def _key_info(link):
+    """스크래핑한 페이지 정보 중 값이 있는 항목만 ("Unknown" 기본값 제외)"""
+    page_info = link.get("key_info") or link.get("pageInfo") or {}
+    if not isinstance(page_info, dict):
+        return {}
+    key_info = {}
+    for field in KEY_INFO_FIELDS:
+        value = page_info.get(field)
+        if isinstance(value, str) and value.strip() and not value.startswith("Unknown"):
+            key_info[field] = value.strip()
+    return key_info
+
+
+def compact_link(link):
+    """링크 하나를 [url, text, category(, key_info)] 배열로 변환"""
+    row = [(link.get(field) or "").strip() for field in PROMPT_FIELDS]
+    key_info = _key_info(link)
+    if key_info:
+        row.append(key_info)
+    return row
+
+
+def build_user_prompt(links):
+    """링크마다 공백 없는 JSON 배열 한 줄"""
+    rows = (
+        json.dumps(compact_link(link), ensure_ascii=False, separators=(",", ":"))
+        for link in links
+    )
+    return USER_PROMPT_HEADER + "\n" + "\n".join(rows)
+
+
+def estimate_input_tokens(links):
+    """(이번 프롬프트, 이전 형식 프롬프트)의 추정 입력 토큰 수"""
+    tokens = estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(build_user_prompt(links))
+    legacy = LEGACY_PROMPT_TOKENS + estimate_tokens(json.dumps(links, ensure_ascii=False, indent=2))
+    return tokens, legacy
+
+
+def batch_request_body(links, max_tokens=BEDROCK_MAX_TOKENS):
+    """링크 묶음 분석용 Bedrock 요청 본문 (보내기 전 입력 토큰 추정치를 집계)"""
+    tokens, legacy = estimate_input_tokens(links)
+    with _stats_lock:
+        _stats["requests"] += 1
+        _stats["links"] += len(links)
+        _stats["input_tokens"] += tokens
+        _stats["legacy_input_tokens"] += legacy
+        _stats["last"] = {"links": len(links), "input_tokens": tokens, "saved_tokens": legacy - tokens}
+
+    return json.dumps({
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": max_tokens,
+        "system": SYSTEM_PROMPT,
+        "messages": [
+            {
+                "role": "user",
+                "content": build_user_prompt(links)
+            }
+        ],
+        "temperature": 0.3,
+        "top_p": 0.9
+    })
+
+
+def prompt_stats():
+    """/api/metrics용 프롬프트 토큰 통계 (추정치)"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["saved_tokens"] = stats["legacy_input_tokens"] - stats["input_tokens"]
+    stats["saved_ratio"] = (
+        round(stats["saved_tokens"] / stats["legacy_input_tokens"], 3)
+        if stats["legacy_input_tokens"]
+        else 0.0
+    )
+    return stats
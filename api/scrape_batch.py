@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+import json
+import os
+import time
+from http.server import BaseHTTPRequestHandler
+
+from escalation import escalate
+from issue_store import issue_store
+from link_index import link_index
+from scrape_cache import cached_scrape
+from scraper import BATCH_DEADLINE, batch_request, scrape_batch, scrape_page
+
+
+def bedrock_extractor():
+    """Bedrock 자격 증명이 있으면 BedrockClaude.extract_page_info, 없으면 None"""
+    if not os.environ.get("AWS_ACCESS_KEY_ID"):
+        return None
+    try:
+        from bedrock_claude import BedrockClaude
+    except ImportError:
+        return None
+    return BedrockClaude().extract_page_info
+
+
+class handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        try:
+            # 함수 제한 시간(vercel.json maxDuration) 안에 응답하도록 전체 제한 시간을 둔다
+            deadline = time.monotonic() + BATCH_DEADLINE
+            content_length = int(self.headers.get("Content-Length", 0))
+            post_data = self.rfile.read(content_length)
+
+            try:
+                data = json.loads(post_data.decode("utf-8"))
+                # {"urls": [...]} 또는 analyze-batch와 같은 {"links": [{"url": ...}]} 형식 지원
+                links, issue = batch_request(data)
+                if not links:
+                    raise ValueError("No URLs provided")
+            except ValueError as e:
+                # 잘못된 JSON이나 형식이 맞지 않는 요청 본문
+                self.send_response(400)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.end_headers()
+                error_response = json.dumps({"error": str(e)})
+                self.wfile.write(error_response.encode())
+                return
+
+            # escalate: 규칙 기반 추출의 신뢰도가 낮은 링크만 Bedrock으로 다시 추출
+            extract = bedrock_extractor() if data.get("escalate") else None
+
+            # URL을 키로 하는 결과 (analyze-batch 응답과 같은 형식)
+            # 지난 호에서 가져온 결과가 카테고리별 유효 기간 안이면 다시 쓴다
+            results = link_index.run(
+                links,
+                lambda pending_urls: scrape_batch(
+                    pending_urls,
+                    scrape_func=lambda url: cached_scrape(url, scrape_page),
+                    deadline=deadline,
+                ),
+                issue.get("url") if issue else None,
+            )
+            if extract:
+                def escalate_links(results, pending):
+                    return escalate(results, pending, extract, deadline=deadline)
+
+                if issue and issue.get("url"):
+                    # 같은 호를 다시 분석하면 새로 생기거나 바뀐 링크만 모델로 보낸다
+                    results = issue_store.run(issue, links, results, escalate_links)
+                else:
+                    results = escalate_links(results, links)
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("Access-Control-Allow-Methods", "POST, OPTIONS")
+            self.send_header("Access-Control-Allow-Headers", "Content-Type")
+            self.end_headers()
+            response_data = json.dumps(results, ensure_ascii=False)
+            self.wfile.write(response_data.encode("utf-8"))
+        except Exception as e:
+            self.send_response(500)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            error_response = json.dumps({"error": str(e)})
+            self.wfile.write(error_response.encode())
+
+    def do_OPTIONS(self):
+        self.send_response(200)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.end_headers()
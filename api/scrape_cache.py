@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""스크래핑 결과 캐시
+
+같은 링크가 연속된 뉴스레터 호에 반복해서 나오고 같은 호를 여러 번 분석하므로
+scrape_page 결과를 정규 URL(url_canonical.canonical_url) 기준으로 메모리와 SQLite 파일에 보관한다.
+SQLite 캐시는 서버 재시작이나 Vercel 콜드 스타트 뒤에도, 여러 프로세스 사이에서도 공유된다.
+TTL 기본값은 edge-config.js의 cacheConfig(scrapeResult 3600초, maxItems 1000)와 같다.
+api/scrape_cache.py는 이 파일과 동일하게 유지할 것.
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from url_canonical import canonical_url
+
+# 캐시 크기와 결과 종류별 유효 시간 (초)
+SCRAPE_CACHE_MAX_ITEMS = int(os.environ.get("SCRAPE_CACHE_MAX_ITEMS", 1000))
+SCRAPE_CACHE_TTL = int(os.environ.get("SCRAPE_CACHE_TTL", 3600))
+SCRAPE_CACHE_ERROR_TTL = int(os.environ.get("SCRAPE_CACHE_ERROR_TTL", 60))
+
+# 디스크 캐시 설정: 파일 경로(빈 값이면 사용 안 함), 최대 크기(바이트),
+# 만료 후에도 새로 가져오는 동안 이전 결과를 돌려줄 수 있는 기간(초)
+SCRAPE_CACHE_DB = os.environ.get(
+    "SCRAPE_CACHE_DB",
+    os.path.join(tempfile.gettempdir(), "orangeletter_scrape_cache.sqlite3"),
+)
+SCRAPE_CACHE_DB_MAX_BYTES = int(os.environ.get("SCRAPE_CACHE_DB_MAX_BYTES", 50 * 1024 * 1024))
+SCRAPE_CACHE_STALE_TTL = int(os.environ.get("SCRAPE_CACHE_STALE_TTL", 86400))
+
+RESULT_TTLS = {
+    "page": SCRAPE_CACHE_TTL,  # 정상적으로 추출한 페이지
+    "not_found": SCRAPE_CACHE_ERROR_TTL * 10,  # HTTP 404
+    "http": SCRAPE_CACHE_ERROR_TTL * 5,  # 403, 5xx 등
+    "error": SCRAPE_CACHE_ERROR_TTL,  # 시간 초과, 연결 오류 등 일시적인 오류
+}
+
+
+def result_type(page_info):
+    """page_info를 RESULT_TTLS의 결과 종류로 분류"""
+    if page_info.get("circuitOpen"):
+        # 요청하지 않고 호스트 상태로 실패시킨 결과는 일시적인 오류로 본다
+        return "error"
+    if page_info.get("error"):
+        if page_info.get("errorType") == "http":
+            return "not_found" if page_info.get("errorCode") == 404 else "http"
+        return "error"
+    return "page"
+
+
+class ScrapeCache:
+    """LRU 방식으로 항목 수를 제한하고 항목별 만료 시각을 두는 메모리 캐시"""
+
+    def __init__(self, max_items=SCRAPE_CACHE_MAX_ITEMS, ttls=None):
+        self.max_items = max_items
+        self.ttls = ttls or RESULT_TTLS
+        self._items = OrderedDict()  # 키 -> (만료 시각, page_info)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def get(self, url):
+        """캐시된 page_info 반환 (없거나 만료되면 None)"""
+        key = canonical_url(url)
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None and item[0] <= time.monotonic():
+                del self._items[key]
+                self.expired += 1
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return dict(item[1])
+
+    def put(self, url, page_info, ttl=None):
+        """결과 종류에 맞는 TTL(또는 지정한 ttl)로 저장"""
+        if ttl is None:
+            ttl = self.ttls.get(result_type(page_info), 0)
+        if ttl <= 0 or self.max_items <= 0:
+            return
+        key = canonical_url(url)
+        with self._lock:
+            self._items[key] = (time.monotonic() + ttl, dict(page_info))
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "items": len(self._items),
+                "max_items": self.max_items,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "expired": self.expired,
+                "evictions": self.evictions,
+            }
+
+
+class DiskScrapeCache:
+    """여러 프로세스가 함께 쓰는 SQLite 스크래핑 결과 캐시
+
+    page_info와 함께 응답 검증자(ETag, Last-Modified, 최종 URL)를 저장한다.
+    WAL 모드로 읽기와 쓰기가 서로를 막지 않으며, 연결은 스레드마다 따로 연다.
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 지운다.
+    """
+
+    def __init__(
+        self,
+        path,
+        max_bytes=SCRAPE_CACHE_DB_MAX_BYTES,
+        stale_ttl=SCRAPE_CACHE_STALE_TTL,
+        ttls=None,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.stale_ttl = stale_ttl
+        self.ttls = ttls or RESULT_TTLS
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS scrape_cache (
+                    key TEXT PRIMARY KEY,
+                    page_info TEXT NOT NULL,
+                    result_type TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    final_url TEXT,
+                    content_bytes INTEGER,
+                    parse_ms REAL,
+                    stored_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL
+                )"""
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS scrape_cache_accessed ON scrape_cache (accessed_at)"
+            )
+            # 이전 버전에서 만든 파일에는 없는 컬럼 추가
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(scrape_cache)")}
+            for column, column_type in (("content_bytes", "INTEGER"), ("parse_ms", "REAL")):
+                if column not in columns:
+                    try:
+                        conn.execute(
+                            f"ALTER TABLE scrape_cache ADD COLUMN {column} {column_type}"
+                        )
+                    except sqlite3.OperationalError:
+                        pass  # 다른 프로세스가 먼저 추가한 경우
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get(self, url):
+        """저장된 항목 반환 (없으면 None)
+
+        반환값은 page_info, validators, expires_at, state를 담은 dict이며 state는
+        fresh(유효), stale(만료되었지만 stale_ttl 안이어서 새로 가져오는 동안 쓸 수 있음),
+        expired(결과는 쓸 수 없고 검증자로 조건부 요청만 가능) 중 하나
+        """
+        key = canonical_url(url)
+        now = time.time()
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT page_info, result_type, etag, last_modified, final_url, "
+                "content_bytes, parse_ms, expires_at FROM scrape_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+            (
+                page_info,
+                kind,
+                etag,
+                last_modified,
+                final_url,
+                content_bytes,
+                parse_ms,
+                expires_at,
+            ) = row
+            if expires_at > now:
+                state = "fresh"
+            elif kind != "page":
+                # 오류 결과는 만료 후에 다시 쓰지 않는다
+                self._count("misses")
+                return None
+            elif expires_at + self.stale_ttl > now:
+                state = "stale"
+            elif etag or last_modified:
+                state = "expired"
+            else:
+                self._count("misses")
+                return None
+            conn.execute(
+                "UPDATE scrape_cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        except sqlite3.Error:
+            self._count("errors")
+            return None
+
+        self._count({"fresh": "hits", "stale": "stale_hits", "expired": "misses"}[state])
+        return {
+            "page_info": json.loads(page_info),
+            "validators": {
+                "etag": etag,
+                "last_modified": last_modified,
+                "final_url": final_url,
+                "content_bytes": content_bytes,
+                "parse_ms": parse_ms,
+            },
+            "expires_at": expires_at,
+            "state": state,
+        }
+
+    def put(self, url, page_info, validators=None):
+        """결과 종류에 맞는 TTL로 저장하고 크기 상한을 넘으면 오래된 항목 정리"""
+        kind = result_type(page_info)
+        ttl = self.ttls.get(kind, 0)
+        if ttl <= 0:
+            return
+        validators = validators or {}
+        data = json.dumps(page_info, ensure_ascii=False)
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO scrape_cache (key, page_info, result_type, etag, "
+                "last_modified, final_url, content_bytes, parse_ms, stored_at, expires_at, "
+                "accessed_at, size) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    canonical_url(url),
+                    data,
+                    kind,
+                    validators.get("etag"),
+                    validators.get("last_modified"),
+                    validators.get("final_url"),
+                    validators.get("content_bytes"),
+                    validators.get("parse_ms"),
+                    now,
+                    now + ttl,
+                    now,
+                    len(data.encode("utf-8")),
+                ),
+            )
+            self._count("writes")
+            self._evict(conn)
+        except sqlite3.Error:
+            self._count("errors")
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM scrape_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # 한 번에 상한의 90%까지 줄여서 매번 정리하지 않도록 한다
+        target = self.max_bytes * 0.9
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            removed = 0
+            for key, size in conn.execute(
+                "SELECT key, size FROM scrape_cache ORDER BY accessed_at"
+            ).fetchall():
+                if total <= target:
+                    break
+                conn.execute("DELETE FROM scrape_cache WHERE key = ?", (key,))
+                total -= size
+                removed += 1
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        with self._lock:
+            self.evictions += removed
+
+    def stats(self):
+        try:
+            items, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM scrape_cache"
+            ).fetchone()
+        except sqlite3.Error:
+            items, size = None, None
+        with self._lock:
+            return {
+                "path": self.path,
+                "items": items,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "errors": self.errors,
+            }
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 호출을 하나만 실행하고 나머지는 그 결과를 기다려 공유"""
+
+    def __init__(self):
+        self._calls = {}  # 키 -> 실행 중인 호출의 Future
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+        self.waiting = 0
+
+    def do(self, key, func):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+                self.waiting += 1
+
+        if not leader:
+            try:
+                return future.result()
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "leaders": self.leaders,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+                "waiting": self.waiting,
+            }
+
+
+scrape_cache = ScrapeCache()
+scrape_flight = SingleFlight()
+disk_cache = DiskScrapeCache(SCRAPE_CACHE_DB) if SCRAPE_CACHE_DB else None
+
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+_refresh_stats = {"started": 0, "skipped": 0, "kept_on_error": 0}
+
+# 304 응답으로 다시 받지 않은 바이트와 건너뛴 파싱 시간
+_revalidation = {"not_modified": 0, "bytes_saved": 0, "parse_ms_saved": 0.0}
+
+
+def _scrape_and_store(url, scrape_func, entry=None):
+    """스크래핑해서 캐시에 저장 (entry의 검증자가 있으면 조건부 요청)"""
+    validators = dict(entry["validators"]) if entry else {}
+    page_info = scrape_func(url, validators)
+    if page_info is None:
+        # 304 Not Modified: 저장된 추출 결과와 검증자를 그대로 다시 저장
+        page_info = entry["page_info"]
+        validators = entry["validators"]
+        with _refreshing_lock:
+            _revalidation["not_modified"] += 1
+            _revalidation["bytes_saved"] += validators.get("content_bytes") or 0
+            _revalidation["parse_ms_saved"] += validators.get("parse_ms") or 0.0
+    elif (
+        entry is not None
+        and result_type(entry["page_info"]) == "page"
+        and result_type(page_info) != "page"
+    ):
+        # 새로 가져오다 실패하면 저장된 페이지 결과를 오류로 덮어쓰지 않는다 (stale-if-error)
+        # stale 기간 동안은 다음 요청도 이전 결과를 쓰면서 다시 가져온다
+        with _refreshing_lock:
+            _refresh_stats["kept_on_error"] += 1
+        return page_info
+    scrape_cache.put(url, page_info)
+    if disk_cache is not None:
+        disk_cache.put(url, page_info, validators)
+    return page_info
+
+
+def _refresh_in_background(url, scrape_func, entry):
+    """만료된 항목을 백그라운드에서 조건부 요청으로 새로 가져오기 (같은 URL은 한 번만)"""
+    key = canonical_url(url)
+    with _refreshing_lock:
+        if key in _refreshing:
+            _refresh_stats["skipped"] += 1
+            return
+        _refreshing.add(key)
+        _refresh_stats["started"] += 1
+
+    def refresh():
+        try:
+            _scrape_and_store(url, scrape_func, entry)
+        except Exception:
+            pass
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=refresh, name="scrape-refresh", daemon=True).start()
+
+
+def cached_scrape(url, scrape_func):
+    """메모리 캐시, 디스크 캐시 순으로 찾고 없으면 scrape_func(url, validators) 결과를 저장
+
+    디스크 캐시 항목이 만료되었지만 stale 기간 안이면 이전 결과를 바로 반환하고
+    백그라운드에서 새로 가져온다 (stale-while-revalidate). 새로 가져올 때는 저장된
+    ETag/Last-Modified로 조건부 요청을 보내고, 304이면 파싱 없이 이전 결과를 쓴다.
+    새로 가져오다 실패하면 저장된 페이지 결과는 그대로 둔다 (stale-if-error).
+    """
+    page_info = scrape_cache.get(url)
+    if page_info is not None:
+        return page_info
+
+    # 같은 정규 URL을 동시에 요청하면 한 번만 가져오고 나머지는 그 결과를 나눠 쓴다
+    page_info = scrape_flight.do(
+        canonical_url(url), lambda: _load_or_scrape(url, scrape_func)
+    )
+    return dict(page_info)
+
+
+def _load_or_scrape(url, scrape_func):
+    """디스크 캐시에서 찾고 없으면 스크래핑 (메모리 캐시를 확인한 뒤 호출)"""
+    entry = disk_cache.get(url) if disk_cache is not None else None
+    if entry is not None and entry["state"] == "fresh":
+        # 디스크 항목이 만료되는 시각까지만 메모리에 둔다
+        scrape_cache.put(url, entry["page_info"], entry["expires_at"] - time.time())
+        return entry["page_info"]
+    if entry is not None and entry["state"] == "stale":
+        _refresh_in_background(url, scrape_func, entry)
+        return entry["page_info"]
+
+    return _scrape_and_store(url, scrape_func, entry)
+
+
+def cache_stats():
+    """/api/metrics용 캐시 통계"""
+    with _refreshing_lock:
+        refresh = dict(_refresh_stats, in_progress=len(_refreshing))
+        revalidation = dict(_revalidation)
+    revalidation["parse_ms_saved"] = round(revalidation["parse_ms_saved"], 1)
+    return {
+        "memory": scrape_cache.stats(),
+        "disk": disk_cache.stats() if disk_cache is not None else None,
+        "refresh": refresh,
+        "revalidation": revalidation,
+        "coalescing": scrape_flight.stats(),
+    }
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""단축 URL(bit.ly, han.gl, me2.do 등)의 최종 URL 확인
+
+단축 URL을 allow_redirects=True로 GET 하면 도착 페이지 본문까지 받은 뒤
+추출할 때 같은 페이지를 또 받게 된다. 여기서는 본문 없이 Location 헤더만
+따라가고, 단축 URL -> 최종 URL 매핑은 바뀌지 않으므로 메모리와 SQLite에 저장해 둔다.
+api/short_links.py는 이 파일과 동일하게 유지할 것.
+"""
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
+
+import http_client
+from scrape_cache import SCRAPE_CACHE_DB
+
+# Location 헤더를 따라갈 단축 URL 호스트
+# forms.gle은 확인하지 않아도 scraper가 구글 폼 고정 결과를 돌려주므로 넣지 않는다
+# 예: SHORTENER_HOSTS="bit.ly,han.gl"
+SHORTENER_HOSTS = {
+    host.strip().lower()
+    for host in os.environ.get(
+        "SHORTENER_HOSTS",
+        "bit.ly,han.gl,me2.do,naver.me,buly.kr,url.kr,vo.la,lrl.kr,"
+        "tinyurl.com,goo.gl,t.co,t.ly,rb.gy,shorturl.at,tiny.cc",
+    ).split(",")
+    if host.strip()
+}
+
+SHORT_LINK_TIMEOUT = 10
+SHORT_LINK_MAX_HOPS = 10
+SHORT_LINK_MAX_WORKERS = int(os.environ.get("SHORT_LINK_MAX_WORKERS", 8))
+
+# 확인에 실패한 단축 URL을 다시 묻지 않을 기간(초, 메모리에만 저장)
+# 같은 요청 안에서 일괄 확인과 페이지 스크래핑이 같은 링크를 두 번 묻지 않게 한다
+SHORT_LINK_FAILURE_TTL = float(os.environ.get("SHORT_LINK_FAILURE_TTL", 300))
+
+# HEAD를 지원하지 않는 단축 URL 서비스가 돌려주는 상태 코드
+_HEAD_UNSUPPORTED = {400, 403, 404, 405, 501}
+
+
+def is_short_link(url):
+    """단축 URL 서비스 호스트인지 확인"""
+    host = urlparse(url.strip()).netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return host in SHORTENER_HOSTS
+
+
+def _next_location(url):
+    """url이 리다이렉트하는 위치 (리다이렉트가 아니면 None)
+
+    HEAD로 묻고, HEAD를 거부하면 본문을 읽지 않는 GET으로 다시 묻는다.
+    """
+    response = http_client.head(url, timeout=SHORT_LINK_TIMEOUT, allow_redirects=False)
+    if response.status_code in _HEAD_UNSUPPORTED:
+        response = http_client.get(
+            url, timeout=SHORT_LINK_TIMEOUT, allow_redirects=False, stream=True
+        )
+        response.close()
+    location = response.headers.get("Location")
+    if response.is_redirect and location:
+        return urljoin(url, location)
+    return None
+
+
+class ShortLinkResolver:
+    """단축 URL -> 최종 URL 매핑을 메모리와 SQLite에 저장하며 확인"""
+
+    def __init__(self, path=SCRAPE_CACHE_DB):
+        self.path = path
+        self._mappings = {}
+        self._failures = {}  # 단축 URL -> 실패한 시각 (time.monotonic())
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.resolved = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.failures = 0
+        self.failure_hits = 0
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS short_links (
+                    short_url TEXT PRIMARY KEY,
+                    final_url TEXT NOT NULL,
+                    resolved_at REAL NOT NULL
+                )"""
+            )
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _fail(self, url):
+        now = time.monotonic()
+        with self._lock:
+            self.failures += 1
+            # 오래 실행되는 서버에서 쌓이지 않도록 기간이 지난 항목을 정리
+            for failed_url, failed_at in list(self._failures.items()):
+                if now - failed_at >= SHORT_LINK_FAILURE_TTL:
+                    del self._failures[failed_url]
+            self._failures[url] = now
+        return url
+
+    def _recently_failed(self, url):
+        with self._lock:
+            failed_at = self._failures.get(url)
+            if failed_at is None:
+                return False
+            if time.monotonic() - failed_at < SHORT_LINK_FAILURE_TTL:
+                self.failure_hits += 1
+                return True
+            del self._failures[url]
+            return False
+
+    def _load(self, url):
+        if not self.path:
+            return None
+        try:
+            row = self._connect().execute(
+                "SELECT final_url FROM short_links WHERE short_url = ?", (url,)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def _store(self, url, final_url):
+        with self._lock:
+            self._mappings[url] = final_url
+        if not self.path:
+            return
+        try:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO short_links VALUES (?, ?, ?)",
+                (url, final_url, time.time()),
+            )
+        except sqlite3.Error:
+            pass
+
+    def resolve(self, url):
+        """단축 URL이면 최종 URL을, 아니면 url을 그대로 반환 (확인에 실패해도 url)"""
+        url = url.strip()
+        if not is_short_link(url):
+            return url
+
+        with self._lock:
+            final_url = self._mappings.get(url)
+        if final_url:
+            self._count("memory_hits")
+            return final_url
+        final_url = self._load(url)
+        if final_url:
+            self._count("disk_hits")
+            with self._lock:
+                self._mappings[url] = final_url
+            return final_url
+        if self._recently_failed(url):
+            return url
+
+        # 단축 URL 호스트를 벗어날 때까지만 따라간다 (도착 페이지의 리다이렉트는 본 요청에서 처리)
+        current = url
+        try:
+            for _ in range(SHORT_LINK_MAX_HOPS):
+                if not is_short_link(current):
+                    break
+                location = _next_location(current)
+                if not location:
+                    break
+                current = location
+        except Exception:
+            return self._fail(url)
+
+        if current == url:
+            return self._fail(url)
+        self._count("resolved")
+        self._store(url, current)
+        return current
+
+    def resolve_many(self, urls, max_workers=SHORT_LINK_MAX_WORKERS):
+        """여러 URL을 동시에 확인해 원래 URL -> 최종 URL dict로 반환"""
+        short_urls = list(dict.fromkeys(url for url in urls if url and is_short_link(url)))
+        resolved = {url: url for url in urls if url}
+        if short_urls:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(short_urls))) as executor:
+                resolved.update(zip(short_urls, executor.map(self.resolve, short_urls)))
+        return resolved
+
+    def stats(self):
+        with self._lock:
+            return {
+                "resolved": self.resolved,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "failures": self.failures,
+                "failure_hits": self.failure_hits,
+                "cached": len(self._mappings),
+            }
+
+
+short_link_resolver = ShortLinkResolver()
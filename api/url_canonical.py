@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""같은 페이지를 가리키는 URL 변형을 하나의 정규 URL로 변환
+
+utm_* 같은 추적 파라미터, 끝의 /, http/https, 호스트 대소문자, 쿼리 순서만 다른
+링크를 같은 페이지로 보고 캐시 키, 동시 요청 합치기, 배치 중복 제거에 쓴다.
+정규 URL은 키로만 쓰고 실제 요청은 원래 URL로 보낸다.
+api/url_canonical.py는 이 파일과 동일하게 유지할 것.
+"""
+import os
+import re
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit, urlunsplit
+
+# 제거할 추적 파라미터 (끝에 *가 있으면 접두어로 비교)
+# 예: TRACKING_PARAMS="utm_*,fbclid,gclid"
+TRACKING_PARAMS = [
+    param.strip().lower()
+    for param in os.environ.get(
+        "TRACKING_PARAMS",
+        "utm_*,fbclid,gclid,dclid,msclkid,igshid,mc_cid,mc_eid,_ga,_gl,yclid,"
+        "n_media,n_query,n_rank,n_ad_group,n_ad,n_keyword_id,n_keyword,n_campaign_type",
+    ).split(",")
+    if param.strip()
+]
+
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+_PERCENT_ESCAPE = re.compile(r"%[0-9a-fA-F]{2}")
+
+
+def is_tracking_param(name):
+    """추적 파라미터인지 확인"""
+    name = name.lower()
+    for param in TRACKING_PARAMS:
+        if param.endswith("*"):
+            if name.startswith(param[:-1]):
+                return True
+        elif name == param:
+            return True
+    return False
+
+
+def canonical_url(url):
+    """URL을 비교용 정규 형식으로 변환
+
+    - 스킴은 https로 통일하고 호스트는 소문자, 기본 포트는 제거
+    - 경로 끝의 /와 fragment 제거 (#/나 #!로 시작하는 해시 라우팅은 유지)
+    - 추적 파라미터를 지우고 나머지 쿼리 파라미터는 정렬
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    if parts.scheme.lower() not in _DEFAULT_PORTS or not parts.hostname:
+        return url
+
+    host = parts.hostname.rstrip(".")
+    if ":" in host:
+        host = f"[{host}]"  # IPv6
+    if port is not None and str(port) != _DEFAULT_PORTS[parts.scheme.lower()]:
+        host = f"{host}:{port}"
+
+    path = _PERCENT_ESCAPE.sub(lambda m: m.group(0).upper(), parts.path)
+    path = path.rstrip("/") or "/"
+
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not is_tracking_param(name)
+    )
+
+    fragment = parts.fragment if parts.fragment.startswith(("/", "!")) else ""
+    return urlunsplit(("https", host, path, urlencode(query, quote_via=quote), fragment))
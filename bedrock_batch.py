@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""링크 일괄 분석을 출력 토큰 예산에 맞춘 묶음(chunk)으로 나눠 동시에 실행
+
+한 호의 링크를 모두 한 프롬프트에 넣으면 60개 정도에서 max_tokens(4000)를 넘어
+JSON이 잘리고 모든 링크가 "AI 분석 실패"가 되거나, 하나의 긴 생성을 기다려야 한다.
+링크마다 예상 출력 토큰을 더해서 예산 안에 들어가도록 나누고, 묶음을 제한된 수의
+스레드에서 동시에 실행해 URL을 키로 하는 결과를 합친다. 실패하거나 응답에서 빠진
+링크는 그 묶음만 다시 요청한다. 스트리밍 모드에서는 묶음마다 응답을 받는 동안
+완성된 링크 결과를 바로 내보낸다.
+bedrock_claude.py와 api/analyze_batch.py가 함께 사용하며, api/bedrock_batch.py는 이 파일과 동일하게 유지할 것.
+"""
+import json
+import math
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 한 번 호출의 max_tokens와 링크 하나에 필요한 대략적인 출력 토큰 수 (URL, 제안 텍스트 제외)
+BEDROCK_MAX_TOKENS = int(os.environ.get("BEDROCK_MAX_TOKENS", 4000))
+BEDROCK_OUTPUT_TOKENS_PER_LINK = int(os.environ.get("BEDROCK_OUTPUT_TOKENS_PER_LINK", 200))
+
+# 동시에 실행할 묶음 수와 묶음별 재시도 횟수
+BEDROCK_MAX_WORKERS = int(os.environ.get("BEDROCK_MAX_WORKERS", 4))
+BEDROCK_CHUNK_RETRIES = int(os.environ.get("BEDROCK_CHUNK_RETRIES", 2))
+
+# max_tokens 중 예상 출력에 쓸 비율 (추정이 빗나가도 JSON이 잘리지 않도록 여유를 둔다)
+OUTPUT_BUDGET_RATIO = 0.75
+
+_stats = {"batches": 0, "chunks": 0, "retries": 0, "failed_chunks": 0}
+_stats_lock = threading.Lock()
+
+
+def estimate_tokens(text):
+    """Claude 토크나이저 기준 대략적인 토큰 수 (영문/숫자는 4자, 한글 등은 1.5자에 1토큰)"""
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5)
+
+
+def estimate_output_tokens(link):
+    """링크 하나의 분석 결과에 필요한 출력 토큰 수 추정 (URL 키와 제안 텍스트 포함)"""
+    return (
+        BEDROCK_OUTPUT_TOKENS_PER_LINK
+        + estimate_tokens(link.get("url") or "")
+        + estimate_tokens(link.get("text") or "")
+    )
+
+
+def chunk_links(links, max_tokens=BEDROCK_MAX_TOKENS):
+    """예상 출력 토큰 합이 max_tokens * OUTPUT_BUDGET_RATIO를 넘지 않도록 링크를 나눈다"""
+    budget = max_tokens * OUTPUT_BUDGET_RATIO
+    chunks = []
+    chunk, used = [], 0
+    for link in links:
+        tokens = estimate_output_tokens(link)
+        if chunk and used + tokens > budget:
+            chunks.append(chunk)
+            chunk, used = [], 0
+        chunk.append(link)
+        used += tokens
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def _count(name, value=1):
+    with _stats_lock:
+        _stats[name] += value
+
+
+def _run_chunk(chunk, analyze_chunk, retries):
+    """묶음 하나를 분석하고 실패하거나 응답에서 빠진 링크만 다시 요청
+
+    (URL -> 결과, 마지막 오류 메시지)를 반환한다.
+    """
+    results = {}
+    pending = chunk
+    error = None
+    for attempt in range(retries + 1):
+        if attempt:
+            _count("retries")
+            time.sleep(min(2 ** (attempt - 1), 8))
+        try:
+            response = analyze_chunk(pending)
+        except Exception as e:
+            response = {"error": str(e)}
+        if not isinstance(response, dict):
+            response = {"error": "Unexpected response"}
+        error = response.get("error") or error
+
+        for link in pending:
+            if isinstance(response.get(link["url"]), dict):
+                results[link["url"]] = response[link["url"]]
+        pending = [link for link in pending if link["url"] not in results]
+        if not pending:
+            break
+    if pending:
+        _count("failed_chunks")
+    return results, error
+
+
+def analyze_in_chunks(
+    links,
+    analyze_chunk,
+    max_tokens=BEDROCK_MAX_TOKENS,
+    max_workers=BEDROCK_MAX_WORKERS,
+    retries=BEDROCK_CHUNK_RETRIES,
+):
+    """links를 묶음으로 나눠 analyze_chunk(묶음 링크 목록)를 동시에 호출하고 결과를 합친다
+
+    analyze_chunk는 URL을 키로 하는 dict(실패하면 error 키)를 반환해야 한다.
+    모든 묶음이 실패하면 이전과 같이 {"error": ...}를 반환한다.
+    """
+    chunks = chunk_links(links, max_tokens)
+    if not chunks:
+        return {}
+    _count("batches")
+    _count("chunks", len(chunks))
+
+    merged = {}
+    errors = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks)))) as executor:
+        for results, error in executor.map(
+            lambda chunk: _run_chunk(chunk, analyze_chunk, retries), chunks
+        ):
+            merged.update(results)
+            if error:
+                errors.append(error)
+
+    if not merged and errors:
+        return {"error": errors[-1]}
+    return merged
+
+
+def batch_stats():
+    """/api/metrics용 묶음 분석 통계"""
+    with _stats_lock:
+        return dict(_stats)
+
+
+class JsonObjectStream:
+    """생성 중인 JSON 객체 텍스트를 받아 최상위 "키": 값 항목이 닫히는 즉시 꺼내는 파서
+
+    {"URL1": {...}, "URL2": {...}} 형식의 응답에서 URL1의 객체가 닫히면 전체 응답을
+    기다리지 않고 (URL1, 결과)를 돌려준다. 여는 { 앞에 붙은 설명 문장은 무시한다.
+    """
+
+    def __init__(self):
+        self._buffer = []  # 지금 읽고 있는 최상위 항목의 텍스트
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text):
+        """text를 이어 붙이고 새로 완성된 (키, 값) 목록 반환"""
+        entries = []
+        for char in text:
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                continue
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    entries.extend(self._flush())
+                    continue
+            elif char == "," and self._depth == 1:
+                entries.extend(self._flush())
+                continue
+            self._buffer.append(char)
+        return entries
+
+    def _flush(self):
+        member = "".join(self._buffer).strip()
+        self._buffer = []
+        if not member:
+            return []
+        try:
+            return list(json.loads("{" + member + "}").items())
+        except json.JSONDecodeError:
+            return []
+
+
+def iter_stream_text(response):
+    """invoke_model_with_response_stream 응답에서 생성된 텍스트 조각을 차례로 반환"""
+    for event in response["body"]:
+        chunk = event.get("chunk")
+        if not chunk:
+            continue
+        data = json.loads(chunk["bytes"])
+        if data.get("type") == "content_block_delta":
+            yield data.get("delta", {}).get("text", "")
+
+
+def _stream_chunk(chunk, stream_chunk, retries, emit):
+    """묶음 하나를 스트리밍으로 분석해 항목이 완성될 때마다 emit(url, 결과) 호출
+
+    응답이 끊기거나 빠진 링크는 그 링크만 다시 요청한다.
+    """
+    urls = {link["url"] for link in chunk}
+    pending = chunk
+    for attempt in range(retries + 1):
+        if attempt:
+            _count("retries")
+            time.sleep(min(2 ** (attempt - 1), 8))
+        done = set()
+        parser = JsonObjectStream()
+        try:
+            for text in stream_chunk(pending):
+                for url, result in parser.feed(text):
+                    if url in urls and url not in done and isinstance(result, dict):
+                        done.add(url)
+                        emit(url, result)
+        except Exception:
+            pass
+        urls -= done
+        pending = [link for link in pending if link["url"] in urls]
+        if not pending:
+            return
+    _count("failed_chunks")
+
+
+def stream_in_chunks(
+    links,
+    stream_chunk,
+    max_tokens=BEDROCK_MAX_TOKENS,
+    max_workers=BEDROCK_MAX_WORKERS,
+    retries=BEDROCK_CHUNK_RETRIES,
+):
+    """analyze_in_chunks의 스트리밍 버전: 완성된 (URL, 결과)를 도착하는 순서대로 반환
+
+    stream_chunk(묶음 링크 목록)는 모델이 생성하는 텍스트 조각을 차례로 반환해야 한다.
+    """
+    chunks = chunk_links(links, max_tokens)
+    if not chunks:
+        return
+    _count("batches")
+    _count("chunks", len(chunks))
+
+    entries = queue.Queue()
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(chunks))))
+    futures = [
+        executor.submit(
+            _stream_chunk, chunk, stream_chunk, retries, lambda url, result: entries.put((url, result))
+        )
+        for chunk in chunks
+    ]
+    for future in futures:
+        future.add_done_callback(lambda _: entries.put(None))
+    executor.shutdown(wait=False)
+
+    remaining = len(futures)
+    while remaining:
+        entry = entries.get()
+        if entry is None:
+            remaining -= 1
+            continue
+        yield entry
+
+
+def stream_line(data, sse=False):
+    """스트리밍 응답 한 줄 (NDJSON 또는 server-sent events)"""
+    line = json.dumps(data, ensure_ascii=False)
+    return (f"data: {line}\n\n" if sse else line + "\n").encode("utf-8")
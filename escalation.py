@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""신뢰도가 낮은 링크만 Bedrock으로 다시 추출
+
+지금까지는 AI 분석을 켜면 모든 링크를 Claude로 보내고, 끄면 하나도 보내지 않았다.
+규칙 기반 추출(scraper.extract_page_info)이 항목마다 남기는 신뢰도(구조화 데이터 high,
+본문 패턴 medium, "Unknown ..." 기본값 low)를 보고, 카테고리에 필요한 항목 중 신뢰도가
+낮은 항목이 있는 링크만 스크래핑한 본문과 함께 BedrockClaude.extract_page_info로 보낸다.
+모델이 채운 항목은 신뢰도를 "llm"으로 표시한다.
+server.py와 api/scrape_batch.py가 함께 사용하며, api/escalation.py는 이 파일과 동일하게 유지할 것.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+CONFIDENCE_FIELDS = ("title", "organizer", "period", "location", "target")
+CONFIDENCE_LEVELS = {"low": 0, "medium": 1, "high": 2, "llm": 2}
+
+# 이 신뢰도보다 낮은 항목이 있으면 모델로 보낸다
+# (medium이면 기본값인 항목만, high면 본문 패턴으로 찾은 항목도)
+ESCALATION_MIN_CONFIDENCE = os.environ.get("ESCALATION_MIN_CONFIDENCE", "medium")
+
+# 동시에 보낼 추출 요청 수
+ESCALATION_MAX_WORKERS = int(os.environ.get("ESCALATION_MAX_WORKERS", 4))
+
+# 제한 시간까지 이보다 적게 남았으면 모델로 보내지 않는다 (초, 추출 한 번의 대략적인 시간)
+ESCALATION_MIN_SECONDS = float(os.environ.get("ESCALATION_MIN_SECONDS", 8))
+
+# 카테고리별로 확인할 항목 (script.js getCategoryRules의 requiredFields와 같다)
+CATEGORY_FIELDS = {
+    "job": ("organizer", "title", "target"),
+    "funding": ("title", "period"),
+    "education": ("organizer", "title", "location"),
+    "contest": ("title", "period"),
+    "event": ("organizer", "title", "location", "period"),
+}
+DEFAULT_FIELDS = ("title", "organizer", "period", "location")
+
+# 모델에 보낼 스크래핑 결과 항목 (본문 텍스트 위주)
+TEXT_FIELDS = ("title", "description", "main_content", "details", "contact_info", "full_text")
+PLACEHOLDER_VALUES = {
+    "Unknown",
+    "Unknown Title",
+    "Unknown Organizer",
+    "Unknown Period",
+    "Unknown Location",
+    "Unknown Target",
+    "확인 필요",
+    "No description available",
+    "No content available",
+    "No contact info",
+    "No details available",
+}
+
+_stats = {"checked": 0, "escalated": 0, "filled_fields": 0, "failed": 0, "skipped_deadline": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(**counts):
+    with _stats_lock:
+        for name, value in counts.items():
+            _stats[name] += value
+
+
+def is_placeholder(value):
+    return not isinstance(value, str) or not value.strip() or value.strip() in PLACEHOLDER_VALUES
+
+
+def field_confidence(page_info, field):
+    """항목의 신뢰도 (신뢰도 기록이 없는 이전 캐시 결과는 값으로 판단)"""
+    confidence = page_info.get("confidence")
+    if isinstance(confidence, dict) and field in confidence:
+        return confidence[field]
+    return "low" if is_placeholder(page_info.get(field)) else "medium"
+
+
+def low_confidence_fields(page_info, category=None):
+    """카테고리에 필요한 항목 중 ESCALATION_MIN_CONFIDENCE보다 신뢰도가 낮은 항목 목록
+
+    오류 결과(페이지를 가져오지 못함)는 모델에 보낼 본문이 없으므로 빈 목록이다.
+    """
+    if not isinstance(page_info, dict) or page_info.get("error"):
+        return []
+    minimum = CONFIDENCE_LEVELS.get(ESCALATION_MIN_CONFIDENCE, 1)
+    return [
+        field
+        for field in CATEGORY_FIELDS.get(category or "", DEFAULT_FIELDS)
+        if CONFIDENCE_LEVELS.get(field_confidence(page_info, field), 0) < minimum
+    ]
+
+
+def page_text(page_info):
+    """모델에 보낼 스크래핑 본문 (기본값 항목은 뺀다)"""
+    return "\n".join(
+        f"{field}: {page_info[field]}"
+        for field in TEXT_FIELDS
+        if not is_placeholder(page_info.get(field))
+    )
+
+
+def merge_extracted(page_info, extracted, fields):
+    """모델이 추출한 값으로 fields 항목만 채운 새 page_info (채운 항목 수와 함께 반환)"""
+    merged = dict(page_info)
+    confidence = {field: field_confidence(page_info, field) for field in CONFIDENCE_FIELDS}
+    filled = 0
+    for field in fields:
+        value = extracted.get(field)
+        if isinstance(value, str) and not is_placeholder(value):
+            merged[field] = value.strip()
+            confidence[field] = "llm"
+            filled += 1
+    merged["confidence"] = confidence
+    if filled:
+        merged["escalated"] = True
+    return merged, filled
+
+
+def escalate(results, links, extract, max_workers=ESCALATION_MAX_WORKERS, deadline=None):
+    """URL을 키로 하는 스크래핑 결과 중 신뢰도가 낮은 링크만 extract(url, 본문)로 다시 추출
+
+    links는 url과 category를 담은 dict 목록, extract는 title/organizer/period/location/target을
+    담은 dict(실패하면 None)를 반환한다. 같은 URL은 한 번만 보내고, 결과가 없거나 실패한
+    링크는 규칙 기반 결과를 그대로 둔다. deadline(time.monotonic() 기준 시각)까지
+    ESCALATION_MIN_SECONDS보다 적게 남았으면 보내지 않고, deadline까지 끝나지 않은
+    추출은 기다리지 않는다.
+    """
+    pending = {}  # URL -> 낮은 신뢰도 항목
+    for link in links:
+        url = link.get("url")
+        if url in pending or url not in results:
+            continue
+        fields = low_confidence_fields(results[url], link.get("category"))
+        if fields and page_text(results[url]):
+            pending[url] = fields
+    _count(checked=len({link.get("url") for link in links if link.get("url") in results}))
+    if not pending:
+        return results
+    if deadline is not None and deadline - time.monotonic() < ESCALATION_MIN_SECONDS:
+        _count(skipped_deadline=len(pending))
+        return results
+
+    def extract_one(url):
+        try:
+            return extract(url, page_text(results[url]))
+        except Exception:
+            return None
+
+    escalated = dict(results)
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending))))
+    futures = {url: executor.submit(extract_one, url) for url in pending}
+    wait(
+        futures.values(),
+        timeout=None if deadline is None else max(0, deadline - time.monotonic()),
+    )
+    executor.shutdown(wait=False, cancel_futures=True)
+    for url, future in futures.items():
+        if not future.done() or future.cancelled():
+            _count(skipped_deadline=1)
+            continue
+        extracted = future.result()
+        if not isinstance(extracted, dict):
+            _count(escalated=1, failed=1)
+            continue
+        escalated[url], filled = merge_extracted(results[url], extracted, pending[url])
+        _count(escalated=1, filled_fields=filled)
+    return escalated
+
+
+def escalation_stats():
+    """/api/metrics용 모델 추출 통계"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["min_confidence"] = ESCALATION_MIN_CONFIDENCE
+    stats["escalated_ratio"] = (
+        round(stats["escalated"] / stats["checked"], 3) if stats["checked"] else 0.0
+    )
+    return stats
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""본문 필드 패턴 검색(FIELD_SCANNER)과 이전 방식(패턴마다 re.search)의 결과와 시간 비교
+
+fixtures/field_corpus의 HTML과 한 줄짜리 긴 페이지를 대상으로
+1. 필드마다 FIELD_SCANNER.iter가 돌려주는 매치가 패턴 순서대로 re.search한 결과와 같은지,
+2. extract_page_info 결과가 이전 방식으로 추출한 결과와 항목별로 같은지 확인하고
+페이지별 추출 시간을 출력한다. 차이가 있으면 종료 코드 1로 끝난다.
+
+사용법:
+    python field_scanner_benchmark.py                 # 기본 코퍼스
+    python field_scanner_benchmark.py pages/*.html    # 저장해 둔 HTML 파일 추가
+"""
+import glob
+import os
+import re
+import statistics
+import sys
+import time
+
+import http_client
+import scraper
+from scraper import FIELD_PATTERNS, FIELD_SCANNER
+
+# 같은 본문을 반복해서 추출하므로 본문 해시 캐시와 <head> 빠른 경로는 끈다
+scraper.EXTRACTION_CACHE_SIZE = 0
+scraper.HEAD_FAST_PATH = False
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'field_corpus')
+repeat = 5
+
+
+class SequentialScanner:
+    """user-008 이전 방식: 필드마다 패턴 목록을 순서대로 re.search"""
+
+    def iter(self, field, text):
+        flags, patterns = FIELD_PATTERNS[field]
+        for pattern in patterns:
+            match = re.search(pattern, text, flags)
+            if match:
+                yield match
+
+
+def long_line_page():
+    """줄바꿈 없는 긴 본문 (게으른 반복 패턴이 제곱 시간이 되던 경우)"""
+    filler = '지역 돌봄 활동가 모임 소식과 후원 안내 ' * 200
+    body = f'<p>{filler}12월 31일까지 접수 {filler}</p>'
+    return f'<html><head><title>긴 한 줄 페이지</title></head><body>{body}</body></html>'
+
+
+def load_corpus(paths):
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(CORPUS_DIR, '*.html'))) + list(paths):
+        with open(path, 'rb') as f:
+            corpus.append((os.path.basename(path), http_client.decode_html(f.read())))
+    corpus.append(('long_line (generated)', long_line_page()))
+    return corpus
+
+
+def match_signature(match):
+    return match.span(), match.groups()
+
+
+def compare_scans(text):
+    """필드별 매치 목록이 다른 필드 이름 목록"""
+    reference = SequentialScanner()
+    return [
+        field
+        for field in FIELD_PATTERNS
+        if [match_signature(m) for m in FIELD_SCANNER.iter(field, text)]
+        != [match_signature(m) for m in reference.iter(field, text)]
+    ]
+
+
+def timed_scan(text, scanner):
+    """모든 필드를 패턴 순서대로 끝까지 검색하는 평균 시간"""
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        for field in FIELD_PATTERNS:
+            for _match in scanner.iter(field, text):
+                pass
+    return (time.perf_counter() - start_time) / repeat
+
+
+def timed_extract(url, content, scanner):
+    scraper.FIELD_SCANNER = scanner
+    try:
+        times = []
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            result = scraper.extract_page_info(url, content)
+            times.append(time.perf_counter() - start_time)
+        return result, statistics.mean(times)
+    finally:
+        scraper.FIELD_SCANNER = FIELD_SCANNER
+
+
+def format_times(times):
+    return ' '.join(
+        f'{times[key] * 1000:8.1f}ms' for key in ('scan_before', 'scan_after', 'before', 'after')
+    )
+
+
+def benchmark(corpus):
+    failures = 0
+    totals = {'scan_before': 0.0, 'scan_after': 0.0, 'before': 0.0, 'after': 0.0}
+    print(f'{"":32s} {"field scan":^21s} {"extract_page_info":^21s}')
+    print(f'{"page":32s} {"before":>10s} {"after":>10s} {"before":>10s} {"after":>10s}  result')
+
+    for name, content in corpus:
+        url = f'https://example.org/{name}'
+        body_text = scraper.collect_page_snapshot(scraper.make_soup(content))['text']
+        scan_diffs = compare_scans(body_text)
+        times = {
+            'scan_before': timed_scan(body_text, SequentialScanner()),
+            'scan_after': timed_scan(body_text, FIELD_SCANNER),
+        }
+
+        before, times['before'] = timed_extract(url, content, SequentialScanner())
+        after, times['after'] = timed_extract(url, content, FIELD_SCANNER)
+        for key, value in times.items():
+            totals[key] += value
+
+        field_diffs = [key for key in before.keys() | after.keys() if before.get(key) != after.get(key)]
+        if scan_diffs or field_diffs:
+            failures += 1
+            status = f'DIFF scan={scan_diffs} fields={field_diffs}'
+        else:
+            status = 'same'
+        print(f'{name[:32]:32s} {format_times(times)}  {status}')
+
+    print(f'\n{"total":32s} {format_times(totals)}')
+    print(f'{len(corpus) - failures}/{len(corpus)} pages identical')
+    return failures
+
+
+if __name__ == "__main__":
+    sys.exit(1 if benchmark(load_corpus(sys.argv[1:])) else 0)
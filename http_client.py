@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""프로세스 전역에서 공유하는 HTTP 클라이언트
+
+모든 외부 요청은 이 모듈의 세션을 거쳐 같은 호스트로의 연결(TCP/TLS)을
+keep-alive로 재사용한다. api/http_client.py는 이 파일과 동일하게 유지할 것.
+"""
+import codecs
+import http.cookiejar
+import os
+import re
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+# 모든 요청에 공통으로 쓰는 헤더
+# Accept-Encoding은 urllib3가 실제로 해제할 수 있는 인코딩만 광고한다 (brotli 미설치 시 br 제외)
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
+    "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1"
+}
+
+# 연결 풀 설정: 유지할 호스트 풀 수와 호스트별 최대 연결 수
+HTTP_POOL_HOSTS = int(os.environ.get("HTTP_POOL_HOSTS", 50))
+HTTP_POOL_PER_HOST = int(os.environ.get("HTTP_POOL_PER_HOST", 8))
+
+# 스트리밍 다운로드 설정: 전체 다운로드 상한과 </head> 이후 읽을 본문 크기
+MAX_HTML_BYTES = int(os.environ.get("MAX_HTML_BYTES", 2 * 1024 * 1024))
+BODY_PREFIX_BYTES = int(os.environ.get("BODY_PREFIX_BYTES", 256 * 1024))
+STREAM_CHUNK_SIZE = 16 * 1024
+
+_HEAD_END = re.compile(rb"</head\s*>", re.IGNORECASE)
+
+# 문자 인코딩 판별 설정: <meta charset>을 찾을 앞부분 크기와 호스트별 판별 결과 캐시 크기
+CHARSET_SNIFF_BYTES = int(os.environ.get("CHARSET_SNIFF_BYTES", 8 * 1024))
+HOST_CHARSET_CACHE_SIZE = int(os.environ.get("HOST_CHARSET_CACHE_SIZE", 1024))
+
+_CONTENT_TYPE_CHARSET = re.compile(r"charset\s*=\s*[\"']?\s*([\w.:-]+)", re.IGNORECASE)
+_META_CHARSET = re.compile(rb"<meta[^>]+?charset\s*=\s*[\"']?\s*([\w.:-]+)", re.IGNORECASE)
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+# 선언된 이름보다 실제로 많이 쓰이는 상위 호환 인코딩으로 디코딩
+# (EUC-KR로 선언하고 CP949 확장 한글을 쓰는 페이지가 많다)
+_CHARSET_ALIASES = {
+    "euc-kr": "cp949",
+    "euc_kr": "cp949",
+    "ks_c_5601-1987": "cp949",
+    "x-windows-949": "cp949",
+    "iso-8859-1": "cp1252",
+    "latin1": "cp1252",
+    "us-ascii": "cp1252",
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+# 조건부 요청(If-None-Match/If-Modified-Since) 횟수와 그중 304로 끝난 횟수
+_revalidation_stats = {"conditional_requests": 0, "not_modified": 0}
+_revalidation_lock = threading.Lock()
+
+_host_charsets = {}
+_charset_lock = threading.Lock()
+# 판별 근거별 횟수 (fallback: 선언된 인코딩으로 디코딩할 수 없었던 경우)
+_charset_stats = {"header": 0, "bom": 0, "meta": 0, "host": 0, "sniff": 0, "fallback": 0}
+
+
+def get_session():
+    """공유 requests.Session 반환 (최초 호출 시 생성)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # 호스트별 연결이 모두 사용 중이면 새 연결을 열었다 버리지 않고 반납을 기다린다
+                adapter = HTTPAdapter(
+                    pool_connections=HTTP_POOL_HOSTS,
+                    pool_maxsize=HTTP_POOL_PER_HOST,
+                    pool_block=True,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update(DEFAULT_HEADERS)
+                # 여러 사이트와 여러 사용자의 요청이 세션을 함께 쓰므로 쿠키는 세션에 남기지 않는다
+                # (한 요청 안의 리다이렉트에서는 requests가 요청별 쿠키를 그대로 전달한다)
+                session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+                _session = session
+    return _session
+
+
+def get(url, headers=None, **kwargs):
+    """공유 세션으로 GET 요청 (headers는 기본 헤더에 덮어씀)"""
+    response = get_session().get(url, headers=headers, **kwargs)
+    if headers and ("If-None-Match" in headers or "If-Modified-Since" in headers):
+        with _revalidation_lock:
+            _revalidation_stats["conditional_requests"] += 1
+            if response.status_code == 304:
+                _revalidation_stats["not_modified"] += 1
+    return response
+
+
+def plain_headers(headers):
+    """DEFAULT_HEADERS 대신 requests 기본 헤더에 headers만 더한 요청 헤더
+
+    브라우저 헤더 전체를 보내면 응답이 달라지는 사이트에 requests.get(url, headers=headers)와
+    같은 헤더를 보낼 때 쓴다 (값이 None인 세션 헤더는 보내지 않는다).
+    """
+    plain = {name: None for name in DEFAULT_HEADERS}
+    plain.update(requests.utils.default_headers())
+    plain.update(headers)
+    return plain
+
+
+def head(url, headers=None, **kwargs):
+    """공유 세션으로 HEAD 요청"""
+    return get_session().head(url, headers=headers, **kwargs)
+
+
+def conditional_headers(validators):
+    """저장해 둔 ETag/Last-Modified로 조건부 요청 헤더 생성 (없으면 빈 dict)"""
+    headers = {}
+    if validators and validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators and validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def forwarded_conditional_headers(request_headers):
+    """클라이언트 요청의 If-None-Match/If-Modified-Since를 업스트림에 그대로 전달할 헤더"""
+    return {
+        name: request_headers[name]
+        for name in ("If-None-Match", "If-Modified-Since")
+        if request_headers.get(name)
+    }
+
+
+def validator_headers(response, content_encoding):
+    """업스트림 검증자를 클라이언트 응답 헤더로 변환
+
+    압축을 해제해서 전달하면 바이트가 달라지므로 ETag를 약한 검증자(W/)로 바꾼다.
+    """
+    headers = []
+    etag = response.headers.get("ETag")
+    if etag:
+        encoded = response.headers.get("Content-Encoding", "identity").lower()
+        if not content_encoding and encoded != "identity" and not etag.startswith("W/"):
+            etag = "W/" + etag
+        headers.append(("ETag", etag))
+    if response.headers.get("Last-Modified"):
+        headers.append(("Last-Modified", response.headers["Last-Modified"]))
+    return headers
+
+
+def revalidation_stats():
+    """조건부 요청 통계"""
+    with _revalidation_lock:
+        return dict(_revalidation_stats)
+
+
+def fetch_html(
+    url,
+    max_bytes=MAX_HTML_BYTES,
+    body_prefix_bytes=BODY_PREFIX_BYTES,
+    headers=None,
+    **kwargs
+):
+    """HTML을 스트리밍으로 받아 메타데이터 추출에 필요한 만큼만 읽기
+
+    전체 max_bytes를 넘거나, </head> 이후 본문을 body_prefix_bytes만큼 읽으면
+    다운로드를 중단한다. 반환된 response의 content에는 읽은 부분만 담기며
+    truncated 속성으로 중단 여부를 알 수 있다.
+    """
+    response = get(url, headers=headers, stream=True, **kwargs)
+    buffer = bytearray()
+    head_end = None
+    enough = False
+    truncated = False
+    try:
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            if enough:
+                # 읽을 데이터가 남아 있는데 중단하는 경우에만 truncated로 기록
+                truncated = True
+                break
+            search_from = max(0, len(buffer) - 16)
+            buffer.extend(chunk)
+            if head_end is None:
+                match = _HEAD_END.search(buffer, search_from)
+                if match:
+                    head_end = match.end()
+            limit = max_bytes
+            if head_end is not None:
+                limit = min(max_bytes, head_end + body_prefix_bytes)
+            enough = len(buffer) >= limit
+    finally:
+        response.close()
+
+    response._content = bytes(buffer)
+    response.truncated = truncated
+    return response
+
+
+def accepts_encoding(accept_encoding, encoding):
+    """클라이언트 Accept-Encoding 헤더가 해당 인코딩을 허용하는지 확인"""
+    for item in accept_encoding.split(","):
+        token, _, params = item.partition(";")
+        if token.strip().lower() in (encoding, "*"):
+            quality = params.replace(" ", "").lower()
+            return not re.fullmatch(r"q=0(\.0*)?", quality)
+    return False
+
+
+def stream_upstream(url, client_accept_encoding="", headers=None, **kwargs):
+    """업스트림 응답을 버퍼링 없이 전달하기 위한 (response, content_encoding, chunks) 반환
+
+    클라이언트가 업스트림의 Content-Encoding을 허용하면 압축된 바이트를 해제하지 않고
+    그대로 넘기고, 그렇지 않으면 해제한 바이트를 넘긴다 (이때 content_encoding은 None).
+    다 읽은 뒤에는 호출한 쪽에서 response.close()를 호출해야 한다.
+    """
+    response = get(url, headers=headers, stream=True, **kwargs)
+    encoding = response.headers.get("Content-Encoding", "").strip().lower()
+    if encoding and encoding != "identity" and accepts_encoding(
+        client_accept_encoding, encoding
+    ):
+        chunks = response.raw.stream(STREAM_CHUNK_SIZE, decode_content=False)
+        return response, encoding, chunks
+    return response, None, response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+
+
+def _normalize_charset(name):
+    """charset 이름을 파이썬 코덱 이름으로 변환 (알 수 없는 이름이면 None)"""
+    name = name.strip().lower()
+    name = _CHARSET_ALIASES.get(name, name)
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def _remember_charset(host, encoding):
+    with _charset_lock:
+        _host_charsets.pop(host, None)
+        _host_charsets[host] = encoding
+        if len(_host_charsets) > HOST_CHARSET_CACHE_SIZE:
+            # 가장 오래전에 기록된 호스트부터 제거
+            del _host_charsets[next(iter(_host_charsets))]
+
+
+def resolve_charset(content, content_type="", host=""):
+    """HTTP 헤더, BOM, <meta charset>, 호스트별 판별 결과 순으로 문자 인코딩 결정
+
+    반환값은 (인코딩, 판별 근거)이며 단서가 없으면 인코딩은 None
+    """
+    match = _CONTENT_TYPE_CHARSET.search(content_type or "")
+    encoding = match and _normalize_charset(match.group(1))
+    if encoding:
+        return encoding, "header"
+    for bom, bom_encoding in _BOMS:
+        if content.startswith(bom):
+            return bom_encoding, "bom"
+    match = _META_CHARSET.search(content, 0, CHARSET_SNIFF_BYTES)
+    encoding = match and _normalize_charset(match.group(1).decode("ascii"))
+    if encoding:
+        return encoding, "meta"
+    with _charset_lock:
+        encoding = _host_charsets.get(host)
+    if encoding:
+        return encoding, "host"
+    return None, "sniff"
+
+
+def decode_html(content, content_type="", host=""):
+    """HTML 바이트를 str로 디코딩 (UnicodeDammit처럼 여러 인코딩을 시험하지 않음)
+
+    판별한 인코딩으로 한 번 디코딩하고, 선언이 실제와 달라 실패할 때만 UTF-8을
+    시도한다. 단서가 없으면 UTF-8, 그다음 CP949 순이다. 끝까지 실패하면
+    디코딩할 수 없는 바이트를 대체 문자로 바꾼다.
+    """
+    encoding, source = resolve_charset(content, content_type, host)
+    for candidate in dict.fromkeys([encoding or "utf-8", "utf-8"]):
+        try:
+            # 다운로드를 중간에 멈춰 끝에 잘린 글자가 있어도 실패로 보지 않는다
+            text = codecs.getincrementaldecoder(candidate)().decode(content, final=False)
+        except UnicodeDecodeError:
+            continue
+        if candidate != encoding:
+            source = "fallback" if encoding else source
+        elif source in ("header", "bom", "meta") and host:
+            # 페이지가 직접 선언한 인코딩만 같은 호스트의 다른 페이지에 적용
+            _remember_charset(host, candidate)
+        with _charset_lock:
+            _charset_stats[source] += 1
+        return text
+
+    with _charset_lock:
+        _charset_stats["fallback" if encoding else source] += 1
+    return content.decode(encoding or "cp949", errors="replace")
+
+
+def decode_response(response):
+    """fetch_html 응답의 본문을 str로 디코딩 (response.text 대신 사용)"""
+    return decode_html(
+        response.content,
+        response.headers.get("Content-Type", ""),
+        urlparse(response.url or "").netloc.lower(),
+    )
+
+
+def charset_stats():
+    """문자 인코딩 판별 근거별 횟수"""
+    with _charset_lock:
+        return dict(_charset_stats, cached_hosts=len(_host_charsets))
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""여러 호에 걸친 링크 색인
+
+같은 채용 공고나 캠페인이 2~4주 연속으로 실리므로 정규 URL마다 마지막 추출 결과,
+가져온 시각, 이 링크를 실은 호를 SQLite에 기록해 두고 일괄 스크래핑 전에 먼저 찾는다.
+결과를 다시 쓸 수 있는 기간은 카테고리마다 다르다 (마감이 있는 채용은 짧게, 소식은 길게).
+api/link_index.py는 이 파일과 동일하게 유지할 것.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from scrape_cache import SCRAPE_CACHE_DB
+from url_canonical import canonical_url
+
+# 카테고리별 색인 결과 유효 기간 (초), 목록에 없는 카테고리는 LINK_INDEX_DEFAULT_TTL
+# 예: LINK_INDEX_TTLS="job=21600,news=1209600"
+LINK_INDEX_TTLS = {
+    "job": 12 * 3600,
+    "contest": 86400,
+    "funding": 86400,
+    "education": 2 * 86400,
+    "event": 2 * 86400,
+    "news": 7 * 86400,
+    "interview": 7 * 86400,
+    "thought": 7 * 86400,
+}
+LINK_INDEX_TTLS.update(
+    (category.strip(), int(seconds))
+    for category, _, seconds in (
+        item.partition("=") for item in os.environ.get("LINK_INDEX_TTLS", "").split(",")
+    )
+    if category.strip() and seconds.strip()
+)
+LINK_INDEX_DEFAULT_TTL = int(os.environ.get("LINK_INDEX_DEFAULT_TTL", 86400))
+LINK_INDEX_MAX_ITEMS = int(os.environ.get("LINK_INDEX_MAX_ITEMS", 20000))
+
+# 링크마다 기록해 둘 최근 호 수
+LINK_INDEX_MAX_ISSUES = 20
+
+
+class LinkIndex:
+    """정규 URL -> 마지막 추출 결과, 가져온 시각, 이 링크를 실은 호 목록"""
+
+    def __init__(self, path=SCRAPE_CACHE_DB, ttls=None, max_items=LINK_INDEX_MAX_ITEMS):
+        self.path = path
+        self.ttls = ttls or LINK_INDEX_TTLS
+        self.max_items = max_items
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.expired = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS link_index (
+                    url_key TEXT PRIMARY KEY,
+                    page_info TEXT NOT NULL,
+                    category TEXT,
+                    fetched_at REAL NOT NULL,
+                    issues TEXT NOT NULL,
+                    last_seen REAL NOT NULL
+                )"""
+            )
+            self._local.conn = conn
+        return conn
+
+    def _count(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def ttl(self, category):
+        return self.ttls.get(category or "", LINK_INDEX_DEFAULT_TTL)
+
+    def lookup(self, links):
+        """색인에 있는 링크의 저장 내용을 정규 URL -> dict로 반환 (유효 기간과 관계없이)"""
+        keys = list(dict.fromkeys(canonical_url(link["url"]) for link in links))
+        if not self.path or not keys:
+            return {}
+        entries = {}
+        try:
+            conn = self._connect()
+            # SQLite 변수 개수 제한(기본 999) 아래로 나눠서 조회
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = conn.execute(
+                    "SELECT url_key, page_info, fetched_at, issues FROM link_index "
+                    f"WHERE url_key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for url_key, page_info, fetched_at, issues in rows:
+                    entries[url_key] = {
+                        "page_info": json.loads(page_info),
+                        "fetched_at": fetched_at,
+                        "issues": json.loads(issues),
+                    }
+        except sqlite3.Error:
+            self._count(errors=1)
+            return {}
+        return entries
+
+    def record(self, items, issue_url=None):
+        """(url, category, page_info, fetched_at) 목록을 저장하고 issue_url을 각 링크의 호 목록에 추가
+
+        page_info가 None이면 결과는 그대로 두고 호 목록만 갱신한다.
+        """
+        if not self.path or not items:
+            return
+        issue_key = canonical_url(issue_url) if issue_url else None
+        now = time.time()
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for url, category, page_info, fetched_at in items:
+                    url_key = canonical_url(url)
+                    row = conn.execute(
+                        "SELECT issues FROM link_index WHERE url_key = ?", (url_key,)
+                    ).fetchone()
+                    issues = json.loads(row[0]) if row else []
+                    if issue_key and issue_key not in issues:
+                        issues = (issues + [issue_key])[-LINK_INDEX_MAX_ISSUES:]
+                    if page_info is None:
+                        conn.execute(
+                            "UPDATE link_index SET issues = ?, last_seen = ? WHERE url_key = ?",
+                            (json.dumps(issues), now, url_key),
+                        )
+                        continue
+                    conn.execute(
+                        "INSERT OR REPLACE INTO link_index VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            url_key,
+                            json.dumps(page_info, ensure_ascii=False),
+                            category,
+                            fetched_at,
+                            json.dumps(issues),
+                            now,
+                        ),
+                    )
+                conn.execute(
+                    "DELETE FROM link_index WHERE rowid IN (SELECT rowid FROM link_index "
+                    "ORDER BY last_seen DESC LIMIT -1 OFFSET ?)",
+                    (self.max_items,),
+                )
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            self._count(errors=1)
+            return
+        self._count(writes=sum(1 for item in items if item[2] is not None))
+
+    def run(self, links, scrape_many, issue_url=None):
+        """카테고리별 유효 기간 안의 색인 결과는 그대로 쓰고 나머지만 scrape_many(urls)로 스크래핑
+
+        links는 url과 category를 담은 dict 목록, scrape_many는 URL을 키로 하는 dict를 반환한다.
+        새로 가져온 정상 결과는 색인에 저장하고, 모든 링크에 issue_url을 기록한다.
+        """
+        entries = self.lookup(links)
+        now = time.time()
+        results = {}
+        pending = []
+        for link in links:
+            url = link["url"]
+            entry = entries.get(canonical_url(url))
+            if entry is not None and entry["fetched_at"] + self.ttl(link.get("category")) > now:
+                results[url] = dict(entry["page_info"])
+                self._count(hits=1)
+            else:
+                pending.append(link)
+                self._count(**{"expired" if entry is not None else "misses": 1})
+
+        scraped = scrape_many(list(dict.fromkeys(link["url"] for link in pending))) if pending else {}
+        results.update(scraped)
+
+        fetched_at = time.time()
+        items = []
+        for link in links:
+            url = link["url"]
+            page_info = scraped.get(url)
+            if page_info is not None and not page_info.get("error"):
+                items.append((url, link.get("category"), page_info, fetched_at))
+            elif issue_url:
+                items.append((url, link.get("category"), None, None))
+        self.record(items, issue_url)
+        return results
+
+    def stats(self):
+        items = None
+        try:
+            if self.path:
+                items = self._connect().execute("SELECT COUNT(*) FROM link_index").fetchone()[0]
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            return {
+                "items": items,
+                "max_items": self.max_items,
+                "hits": self.hits,
+                "expired": self.expired,
+                "misses": self.misses,
+                "writes": self.writes,
+                "errors": self.errors,
+            }
+
+
+link_index = LinkIndex()
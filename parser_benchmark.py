@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""파서 백엔드별 페이지 정보 추출 시간과 결과 일치 여부 비교
+
+사용법:
+    python parser_benchmark.py                 # fixtures/field_corpus의 HTML로 비교
+    python parser_benchmark.py pages/*.html    # 저장해 둔 HTML 파일로 비교
+    python parser_benchmark.py --live          # 테스트 URL을 받아서 비교
+"""
+import glob
+import os
+import statistics
+import sys
+import time
+
+import http_client
+import scraper
+from scraper import extract_page_info
+
+# 같은 본문을 반복해서 추출하므로 본문 해시 캐시는 끄고,
+# 파서별 전체 파싱 시간을 재도록 <head> 빠른 경로도 끈다
+scraper.EXTRACTION_CACHE_SIZE = 0
+scraper.HEAD_FAST_PATH = False
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'field_corpus')
+
+test_urls = [
+    'https://matching.impact.career/impactcareer/grantors/careers/epuOpL',
+    'https://savethechildren.recruiter.co.kr/app/jobnotice/view?systemKindCode=MRS2&jobnoticeSn=220880',
+    'https://gcs.or.kr/28/?idx=165644616&bmode=view'
+]
+
+parsers = ['html.parser', 'lxml']
+repeat = 5
+
+
+def load_corpus(args):
+    corpus = []
+    if args != ['--live']:
+        for path in args or sorted(glob.glob(os.path.join(CORPUS_DIR, '*.html'))):
+            with open(path, 'rb') as f:
+                corpus.append((path, http_client.decode_html(f.read())))
+    else:
+        for url in test_urls:
+            try:
+                response = http_client.fetch_html(url, timeout=45, allow_redirects=True)
+                corpus.append((url, http_client.decode_response(response)))
+            except Exception as e:
+                print(f'Skip {url}: {e}')
+    return corpus
+
+
+def benchmark(corpus):
+    totals = {parser: [] for parser in parsers}
+
+    for url, content in corpus:
+        print(f'\n{url[:80]} ({len(content) / 1024:.0f} KB)')
+        reference = None
+
+        for parser in parsers:
+            times = []
+            result = None
+            try:
+                for _ in range(repeat):
+                    start_time = time.time()
+                    result = extract_page_info(url, content, [parser])
+                    times.append(time.time() - start_time)
+            except Exception as e:
+                print(f'  {parser:12s} ERROR - {e}')
+                continue
+
+            avg = statistics.mean(times)
+            totals[parser].append(avg)
+
+            if reference is None:
+                reference = result
+                print(f'  {parser:12s} {avg * 1000:8.1f} ms  (reference)')
+                continue
+
+            diffs = [key for key in reference if reference.get(key) != result.get(key)]
+            status = 'same output' if not diffs else f'differs: {", ".join(diffs)}'
+            print(f'  {parser:12s} {avg * 1000:8.1f} ms  {status}')
+
+    print('\n=== Summary ===')
+    for parser, times in totals.items():
+        if times:
+            print(f'{parser:12s} total {sum(times) * 1000:8.1f} ms over {len(times)} pages')
+
+
+if __name__ == "__main__":
+    benchmark(load_corpus(sys.argv[1:]))
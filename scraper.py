@@ -0,0 +1,1357 @@
+#!/usr/bin/env python3
+"""랜딩 페이지 스크래핑 및 정보 추출
+
+로컬 서버(server.py)와 Vercel 함수(api/)가 함께 사용한다.
+api/scraper.py는 이 파일과 동일하게 유지할 것.
+"""
+import copy
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from html import unescape
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup, NavigableString
+
+import http_client
+from circuit_breaker import host_breaker
+from short_links import is_short_link, short_link_resolver
+from url_canonical import canonical_url
+
+SCRAPE_TIMEOUT = 45  # 로컬/Vercel Pro: 30s -> 45s
+
+# HTML 파서 백엔드 우선순위 (앞의 파서가 없거나 파싱에 실패하면 다음 파서 사용)
+# 예: SCRAPE_PARSERS="lxml,html.parser"
+PARSER_BACKENDS = [
+    parser.strip()
+    for parser in os.environ.get("SCRAPE_PARSERS", "lxml,html.parser").split(",")
+    if parser.strip()
+]
+
+# 배치 스크래핑 동시성 설정: 전체 동시 요청 수와 호스트별 동시 요청 수
+BATCH_MAX_WORKERS = int(os.environ.get("BATCH_MAX_WORKERS", 12))
+BATCH_PER_HOST = int(os.environ.get("BATCH_PER_HOST", 3))
+
+# 일괄 스크래핑 전체 제한 시간 (초): Vercel 함수 제한(vercel.json maxDuration 60초)보다
+# 짧게 두고, 그때까지 끝나지 않은 링크는 시간 초과 결과로 돌려준다
+BATCH_DEADLINE = float(os.environ.get("SCRAPE_BATCH_DEADLINE", 50))
+
+# <head>의 구조화 데이터(OG, JSON-LD)만으로 핵심 항목이 정해지면 본문 파싱 생략
+# 예: SCRAPE_HEAD_FAST_PATH=0 으로 끄기
+HEAD_FAST_PATH = os.environ.get("SCRAPE_HEAD_FAST_PATH", "1") != "0"
+
+
+def scrape_page(url, validators=None):
+    """URL의 랜딩 페이지를 가져와 핵심 정보를 추출
+
+    validators(dict)를 넘기면 정상 응답의 ETag, Last-Modified, 최종 URL과
+    다운로드 크기, 파싱 시간을 기록한다. validators에 이전 응답의 ETag나
+    Last-Modified가 있으면 조건부 요청을 보내고, 304 응답이면 파싱 없이 None을 반환한다.
+    같은 호스트에서 시간 초과, 연결 오류, 봇 차단이 이어지면 요청 없이 바로 실패한다.
+    """
+    # 단축 URL 처리 (bit.ly, han.gl 등)
+    # 본문 없이 Location만 따라가서 최종 URL을 얻고, 페이지는 한 번만 받는다.
+    # 서킷 브레이커도 단축 URL 서비스가 아닌 도착 사이트 기준으로 센다
+    if is_short_link(url):
+        url = short_link_resolver.resolve(url)
+
+    page_info = host_breaker.before(url)
+    if page_info is not None:
+        return page_info
+    page_info = _scrape_page(url, validators)
+    host_breaker.after(url, page_info)
+    return page_info
+
+
+def _scrape_page(url, validators=None):
+    try:
+        # 특정 사이트에 대한 특별 처리
+        if "forms.gle" in url or "docs.google.com/forms" in url:
+            # Google Forms는 JavaScript 렌더링 필요
+            page_info = {
+                "title": "Google Form",
+                "description": "구글 폼 신청서",
+                "organizer": "Google Forms",
+                "period": "확인 필요",
+                "location": "온라인",
+                "target": "확인 필요",
+                "keywords": ["신청", "폼"],
+                "error": False,
+                "note": "구글 폼은 직접 방문이 필요합니다"
+            }
+            return page_info
+
+        # KOICA 사이트의 특별 처리 (로그인 필요)
+        if "job.koica.go.kr" in url:
+            page_info = {
+                "title": "KOICA 채용공고",
+                "description": "KOICA 채용공고 상세페이지",
+                "organizer": "KOICA",
+                "period": "확인 필요",
+                "location": "확인 필요",
+                "target": "확인 필요",
+                "keywords": ["채용", "KOICA"],
+                "error": False,
+                "note": "KOICA 사이트는 로그인이 필요합니다. 브라우저에서 직접 확인해주세요.",
+                "site_name": "job.koica.go.kr"
+            }
+            return page_info
+
+        # thepromise.or.kr 사이트의 특별 처리
+        if "thepromise.or.kr" in url:
+            # 메타 정보에서 제목 추출 시도
+            try:
+                # 브라우저 헤더 전체가 아니라 User-Agent만 지정해서 요청한다
+                simple_headers = http_client.plain_headers({
+                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+                })
+                response = http_client.fetch_html(url, headers=simple_headers, timeout=10)
+                content = http_client.decode_response(response)
+
+                # 제목 추출
+                title_match = re.search(r'<title>([^<]+)</title>', content)
+                title = title_match.group(1) if title_match else "더프라미스 공지사항"
+
+                # 더프라미스 관련 키워드로 판단
+                if "KOICA" in title or "YP" in title or "영프로패셔널" in title:
+                    page_info = {
+                        "title": title.split('>')[0].strip(),
+                        "description": "KOICA 개발협력 사업 영프로패셔널(YP) 모집 공고",
+                        "organizer": "더프라미스",
+                        "period": "확인 필요",
+                        "location": "해외파견",
+                        "target": "청년",
+                        "keywords": ["채용", "KOICA", "YP"],
+                        "error": False,
+                        "note": "자세한 내용은 사이트에서 직접 확인하세요"
+                    }
+                else:
+                    page_info = {
+                        "title": title.split('>')[0].strip(),
+                        "description": "더프라미스 공지사항",
+                        "organizer": "더프라미스",
+                        "period": "확인 필요",
+                        "location": "확인 필요",
+                        "target": "확인 필요",
+                        "keywords": ["공지"],
+                        "error": False,
+                        "note": "보안 검증이 필요한 페이지입니다"
+                    }
+
+                return page_info
+            except:
+                # 실패 시 일반적인 처리로 진행
+                pass
+        conditional = http_client.conditional_headers(validators)
+        response = http_client.fetch_html(
+            url, headers=conditional or None, timeout=SCRAPE_TIMEOUT, allow_redirects=True
+        )
+
+        # 바뀌지 않았으면 저장된 추출 결과를 그대로 쓰도록 알림
+        if response.status_code == 304 and conditional:
+            return None
+
+        # 404 페이지인지 먼저 확인
+        if response.status_code == 404:
+            page_info = {
+                "title": "페이지를 찾을 수 없음",
+                "description": "요청한 페이지가 존재하지 않습니다",
+                "organizer": "Unknown",
+                "period": "Unknown",
+                "location": "Unknown",
+                "target": "Unknown",
+                "keywords": ["error"],
+                "error": True,
+                "errorType": "http",
+                "errorCode": 404,
+                "errorMessage": "HTTP 404 오류 (페이지를 찾을 수 없음)"
+            }
+            return page_info
+
+        response.raise_for_status()
+
+        # 인코딩을 한 번만 판별해서 디코딩한 str을 파서에 넘긴다 (UnicodeDammit 추측 생략)
+        parse_start = time.perf_counter()
+        page_info = extract_page_info(url, http_client.decode_response(response))
+        page_info["truncated"] = response.truncated  # 크기 상한으로 다운로드를 중단했는지 여부
+        if validators is not None:
+            validators.update(
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                final_url=response.url,
+                content_bytes=len(response.content),
+                parse_ms=(time.perf_counter() - parse_start) * 1000,
+            )
+        return page_info
+    except requests.exceptions.Timeout:
+        # 타임아웃 에러 처리
+        page_info = {
+            "title": "시간 초과",
+            "description": "페이지 응답 시간이 너무 깁니다",
+            "organizer": "Unknown",
+            "period": "Unknown",
+            "location": "Unknown",
+            "target": "Unknown",
+            "keywords": ["timeout"],
+            "error": True,
+            "errorType": "timeout",
+            "errorMessage": "페이지 로딩 시간 초과 (45초)"
+        }
+        return page_info
+    except requests.exceptions.HTTPError as e:
+        # HTTP 에러 처리 (404, 403 등)
+        status_code = 0
+        if hasattr(e, 'response') and e.response is not None:
+            status_code = e.response.status_code
+        else:
+            # response가 없는 경우 에러 메시지에서 상태 코드 추출 시도
+            match = re.search(r'(\d{3})', str(e))
+            if match:
+                status_code = int(match.group(1))
+
+        error_messages = {
+            403: "접근 거부 (봇 차단)",
+            404: "페이지를 찾을 수 없음",
+            500: "서버 오류",
+            503: "서비스 일시 중단"
+        }
+        page_info = {
+            "title": f"HTTP {status_code} 오류" if status_code else "HTTP 오류",
+            "description": error_messages.get(status_code, str(e)),
+            "organizer": "Unknown",
+            "period": "Unknown",
+            "location": "Unknown",
+            "target": "Unknown",
+            "keywords": ["error"],
+            "error": True,
+            "errorType": "http",
+            "errorCode": status_code,
+            "errorMessage": error_messages.get(status_code, f"HTTP {status_code} 에러" if status_code else str(e))
+        }
+        return page_info
+    except requests.exceptions.ConnectionError as e:
+        # 연결 에러 처리
+        error_msg = str(e).lower()
+        if "connection reset" in error_msg:
+            error_desc = "서버가 연결을 거부했습니다"
+        elif "connection refused" in error_msg:
+            error_desc = "서버에 연결할 수 없습니다"
+        elif "ssl" in error_msg:
+            error_desc = "보안 연결 오류"
+        else:
+            error_desc = "네트워크 연결 오류"
+
+        page_info = {
+            "title": "연결 오류",
+            "description": error_desc,
+            "organizer": "Unknown",
+            "period": "Unknown",
+            "location": "Unknown",
+            "target": "Unknown",
+            "keywords": ["error"],
+            "error": True,
+            "errorType": "connection",
+            "errorMessage": error_desc
+        }
+        return page_info
+    except requests.exceptions.SSLError as e:
+        # SSL 에러 처리
+        page_info = {
+            "title": "보안 연결 오류",
+            "description": "SSL/TLS 인증서 문제가 발생했습니다",
+            "organizer": "Unknown",
+            "period": "Unknown",
+            "location": "Unknown",
+            "target": "Unknown",
+            "keywords": ["error"],
+            "error": True,
+            "errorType": "ssl",
+            "errorMessage": "보안 연결을 설정할 수 없습니다"
+        }
+        return page_info
+    except Exception as e:
+        # 기타 에러 처리
+        return failed_page_info(e)
+
+
+def make_soup(content, parsers=None):
+    """우선순위가 가장 높은 파서 백엔드로 BeautifulSoup 생성
+
+    파서가 설치되어 있지 않거나, 예외가 나거나, 내용이 있는데 요소를 하나도
+    만들지 못하면 다음 백엔드로 넘어간다.
+    """
+    last_error = None
+    for parser in parsers or PARSER_BACKENDS:
+        try:
+            soup = BeautifulSoup(content, parser)
+        except Exception as e:
+            # 파서 미설치(FeatureNotFound) 또는 파싱 실패
+            last_error = e
+            continue
+        if soup.find() is None and content.strip():
+            last_error = ValueError(f"{parser} produced an empty document")
+            continue
+        return soup
+    if last_error is None:
+        return BeautifulSoup(content, "html.parser")
+    raise last_error
+
+
+# 본문 주요 내용을 찾을 때 쓰는 선택자 (우선순위 순)
+CONTENT_SELECTORS = [
+    "main",
+    "article",
+    ".content",
+    ".post",
+    ".entry",
+]
+
+
+def _content_selector_matches(tag):
+    """CONTENT_SELECTORS 중 tag가 일치하는 선택자 목록"""
+    classes = tag.get("class") or []
+    return [
+        selector
+        for selector in CONTENT_SELECTORS
+        if selector == tag.name or (selector[0] == "." and selector[1:] in classes)
+    ]
+
+
+def collect_page_snapshot(soup):
+    """한 번의 DOM 순회로 정보 추출에 필요한 입력을 모두 수집
+
+    soup.find()/select_one()/get_text()를 필드마다 따로 호출하면 페이지를
+    20번 가까이 순회하므로, 첫 번째로 등장하는 요소와 텍스트를 한 번에 모은다.
+    반환값의 각 항목은 해당 bs4 호출 결과와 같다.
+    """
+    snapshot = {
+        "title_tag": None,  # soup.title
+        "meta_property": {},  # soup.find("meta", property=...)
+        "meta_name": {},  # soup.find("meta", attrs={"name": ...})
+        "h1": None,  # soup.find("h1").get_text()
+        "h2": None,  # soup.find("h2").get_text()
+        "json_ld": [],  # soup.find_all("script", type="application/ld+json")
+        "json_ld_data": None,  # 첫 번째 JSON-LD를 json.loads한 결과 (실패 시 None)
+        "content_text": {},  # 선택자별 soup.select_one(selector).get_text()
+        "paragraphs": [],  # 앞의 3개 p 태그의 get_text()
+        "images": [],  # soup.find_all("img", src=True)[:3]
+        "text": "",  # soup.get_text()
+    }
+
+    text_types = soup.interesting_string_types
+    pieces = []
+    span_ends = {}  # 마지막 자손 노드 id -> [(텍스트를 모을 대상, 시작 위치)]
+
+    def start_span(tag, store):
+        if tag.interesting_string_types != text_types:
+            # script/style 등 텍스트 종류가 다른 요소는 직접 계산
+            store(tag.get_text())
+            return
+        last = tag._last_descendant()
+        span_ends.setdefault(id(last), []).append((store, len(pieces)))
+
+    for node in soup.descendants:
+        if isinstance(node, NavigableString):
+            if isinstance(text_types, type):
+                if type(node) is text_types:
+                    pieces.append(node)
+            elif type(node) in text_types:
+                pieces.append(node)
+        else:
+            name = node.name
+            if name == "meta":
+                prop = node.get("property")
+                if isinstance(prop, str):
+                    snapshot["meta_property"].setdefault(prop, node)
+                meta_name = node.get("name")
+                if isinstance(meta_name, str):
+                    snapshot["meta_name"].setdefault(meta_name, node)
+            elif name == "title":
+                if snapshot["title_tag"] is None:
+                    snapshot["title_tag"] = node
+            elif name in ("h1", "h2"):
+                if snapshot[name] is None:
+                    snapshot[name] = ""
+                    start_span(node, lambda text, key=name: snapshot.__setitem__(key, text))
+            elif name == "script":
+                if node.get("type") == "application/ld+json":
+                    snapshot["json_ld"].append(node)
+            elif name == "p":
+                if len(snapshot["paragraphs"]) < 3:
+                    snapshot["paragraphs"].append("")
+                    index = len(snapshot["paragraphs"]) - 1
+                    start_span(
+                        node,
+                        lambda text, index=index: snapshot["paragraphs"].__setitem__(
+                            index, text
+                        ),
+                    )
+            elif name == "img":
+                if node.get("src") is not None and len(snapshot["images"]) < 3:
+                    snapshot["images"].append(node)
+
+            for selector in _content_selector_matches(node):
+                if selector not in snapshot["content_text"]:
+                    snapshot["content_text"][selector] = ""
+                    start_span(
+                        node,
+                        lambda text, selector=selector: snapshot[
+                            "content_text"
+                        ].__setitem__(selector, text),
+                    )
+
+        for store, start in span_ends.pop(id(node), ()):
+            store("".join(pieces[start:]))
+
+    snapshot["text"] = "".join(pieces)
+
+    if snapshot["json_ld"]:
+        try:
+            snapshot["json_ld_data"] = json.loads(snapshot["json_ld"][0].string)
+        except:
+            pass
+
+    return snapshot
+
+
+# 본문 텍스트에서 필드를 찾는 패턴 (필드별 플래그, 우선순위 순서)
+FIELD_PATTERNS = {
+    "organizer": (
+        re.IGNORECASE,
+        [
+            r"주최[:：]\s*([^\n\r\|]+)",
+            r"주관[:：]\s*([^\n\r\|]+)",
+            r"발행[:：]\s*([^\n\r\|]+)",
+            r"운영[:：]\s*([^\n\r\|]+)",
+            r"기관[:：]\s*([^\n\r\|]+)",
+            r"단체[:：]\s*([^\n\r\|]+)",
+            r"회사[:：]\s*([^\n\r\|]+)",
+            r"by\s+([^\n\r\|]+)",
+            r"©\s*([^\n\r\|]+)",
+            r"ⓒ\s*([^\n\r\|]+)",
+        ],
+    ),
+    "period": (
+        re.IGNORECASE,
+        [
+            # 기본 날짜 범위
+            r"(\d{4}[-./년]\s*\d{1,2}[-./월]\s*\d{1,2}[일]?)\s*[~-]\s*(\d{4}[-./년]\s*\d{1,2}[-./월]\s*\d{1,2}[일]?)",
+            r"(\d{1,2}[-./]\d{1,2})\s*[~-]\s*(\d{1,2}[-./]\d{1,2})",
+            # 특정 키워드와 함께
+            r"마감[:：]\s*(\d{4}[-./년]\s*\d{1,2}[-./월]\s*\d{1,2}[일]?)",
+            r"접수기간[:：]\s*([^\n\r]+?까지)",
+            r"신청기간[:：]\s*([^\n\r]+)",
+            r"모집기간[:：]\s*([^\n\r]+)",
+            r"기간[:：]\s*([^\n\r]+)",
+            r"일시[:：]\s*([^\n\r]+)",
+            r"날짜[:：]\s*([^\n\r]+)",
+            # 상대적 표현
+            r"(\d+[일월년]\s*[후뒤])\s*마감",
+            r"([^\n\r]*?까지)\s*접수",
+            r"([^\n\r]*?까지)\s*신청",
+            # 영어 패턴
+            r"until\s+([^\n\r]+)",
+            r"deadline[:：]\s*([^\n\r]+)",
+            r"due\s+([^\n\r]+)",
+        ],
+    ),
+    "online": (
+        re.IGNORECASE,
+        [
+            r"온라인|비대면|화상|웹|인터넷|virtual|online|zoom|webex|teams",
+            r"링크|URL|사이트에서",
+            r"Google\s+Meet|Zoom|Microsoft\s+Teams",
+        ],
+    ),
+    "location": (
+        re.IGNORECASE,
+        [
+            r"장소[:：]\s*([^\n\r]+)",
+            r"위치[:：]\s*([^\n\r]+)",
+            r"주소[:：]\s*([^\n\r]+)",
+            r"개최지[:：]\s*([^\n\r]+)",
+            r"회장[:：]\s*([^\n\r]+)",
+            r"venue[:：]\s*([^\n\r]+)",
+            r"location[:：]\s*([^\n\r]+)",
+            r"address[:：]\s*([^\n\r]+)",
+            # 지역명 패턴
+            r"([가-힣]+시\s+[가-힣]+구\s*[^\n\r]{0,30})",
+            r"([가-힣]+구\s+[가-힣]+동\s*[^\n\r]{0,30})",
+            r"(서울|부산|대구|인천|광주|대전|울산|세종|경기|강원|충북|충남|전북|전남|경북|경남|제주)[^\n\r]{0,50}",
+        ],
+    ),
+    "target": (
+        0,
+        [
+            r"대상[:：]\s*([^\n\r]+)",
+            r"자격[:：]\s*([^\n\r]+)",
+            r"경력[:：]\s*([^\n\r]+)",
+            r"(신입|경력|인턴|신입/경력)",
+        ],
+    ),
+    "contact": (
+        0,
+        [
+            r"연락처[:：]\s*([^\n\r]+)",
+            r"문의[:：]\s*([^\n\r]+)",
+            r"이메일[:：]\s*([^\n\r]+)",
+            r"전화[:：]\s*([^\n\r]+)",
+        ],
+    ),
+    "details": (
+        0,
+        [
+            r"내용[:：]\s*([^\n\r]+)",
+            r"상세[:：]\s*([^\n\r]+)",
+            r"설명[:：]\s*([^\n\r]+)",
+            r"소개[:：]\s*([^\n\r]+)",
+        ],
+    ),
+}
+
+# 한 줄 접두어 패턴 "([^\n\r]*?X)Y": 줄 시작마다 게으른 반복을 다시 시도하면
+# 긴 줄에서 시간이 제곱으로 늘어나므로 X+Y를 먼저 찾고 그 줄의 시작에서 확인한다
+_LINE_PREFIX_PATTERN = re.compile(r"^\(\[\^\\n\\r\]\*\?([^()\[\]\\.*+?{}|^$]+)\)(.*)$")
+
+
+class _FieldPattern:
+    """re.search와 같은 결과를 내는 컴파일된 필드 패턴"""
+
+    def __init__(self, pattern, flags):
+        self.regex = re.compile(pattern, flags)
+        self.anchor = None
+        prefix = _LINE_PREFIX_PATTERN.match(pattern)
+        if prefix:
+            self.anchor = re.compile(prefix.group(1) + prefix.group(2), flags)
+
+    def search(self, text):
+        if self.anchor is None:
+            return self.regex.search(text)
+        # 가장 앞의 매치는 X+Y가 처음 나오는 줄에서 시작한다
+        found = self.anchor.search(text)
+        if not found:
+            return None
+        position = found.start()
+        line_start = max(text.rfind("\n", 0, position), text.rfind("\r", 0, position)) + 1
+        return self.regex.match(text, line_start)
+
+
+class FieldScanner:
+    """필드별 패턴 목록을 미리 컴파일해 두고 우선순위 순서로 매치를 반환"""
+
+    def __init__(self, field_patterns):
+        self._patterns = {
+            field: [_FieldPattern(pattern, flags) for pattern in patterns]
+            for field, (flags, patterns) in field_patterns.items()
+        }
+
+    def iter(self, field, text):
+        """매치되는 패턴의 Match 객체를 패턴 순서대로 (필요한 만큼만) 반환"""
+        for pattern in self._patterns[field]:
+            match = pattern.search(text)
+            if match:
+                yield match
+
+
+FIELD_SCANNER = FieldScanner(FIELD_PATTERNS)
+
+
+# <head>만 파싱하는 1단계 추출에서 구조화 데이터가 있는지 미리 확인할 표식
+# (content는 디코딩한 str 또는 원본 bytes)
+_HEAD_END = {
+    str: re.compile(r"</head\s*>", re.IGNORECASE),
+    bytes: re.compile(rb"</head\s*>", re.IGNORECASE),
+}
+_STRUCTURED_MARKERS = ("application/ld+json", "event:start_time")
+
+# 1단계 추출에서 DOM 없이 본문 텍스트, 문단, 이미지를 얻는 패턴
+_SKIPPED_BLOCKS = re.compile(
+    r"<(script|style|noscript|template)\b.*?</\1\s*>|<!--.*?-->", re.IGNORECASE | re.DOTALL
+)
+_TAGS = re.compile(r"<[^>]*>")
+_PARAGRAPHS = re.compile(r"<p\b[^>]*>(.*?)</p\s*>", re.IGNORECASE | re.DOTALL)
+_IMG_TAGS = re.compile(r"<img\b[^>]*>", re.IGNORECASE)
+_DOCUMENT_START = re.compile(r"<(?:html|head)\b", re.IGNORECASE)
+_IMG_ATTRS = re.compile(
+    r"""(?<![\w-])(src|alt|title)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE
+)
+
+# 본문 요약은 CONTENT_SELECTORS 요소를 우선하므로 이런 요소가 있으면 전체 파싱에 맡긴다
+# (대소문자나 주석 안의 태그처럼 실제로는 일치하지 않는 경우도 걸리지만 전체 파싱으로 갈 뿐이다)
+_CONTENT_ELEMENT = r"""<(?:{})\b|\bclass\s*=\s*(?:"[^"]*|'[^']*|)(?<![\w-])(?:{})(?![\w-])""".format(
+    "|".join(selector for selector in CONTENT_SELECTORS if selector[0] != "."),
+    "|".join(selector[1:] for selector in CONTENT_SELECTORS if selector[0] == "."),
+)
+_CONTENT_ELEMENTS = {
+    str: re.compile(_CONTENT_ELEMENT, re.IGNORECASE),
+    bytes: re.compile(_CONTENT_ELEMENT.encode(), re.IGNORECASE),
+}
+
+
+def _json_ld_name(value):
+    """JSON-LD의 Organization/Person 값에서 이름 추출 (없으면 None)"""
+    if isinstance(value, list) and value:
+        value = value[0]
+    if isinstance(value, dict):
+        value = value.get("name")
+    if isinstance(value, str) and value.strip():
+        return value.strip()[:50]
+    return None
+
+
+def _json_ld_place(value):
+    """JSON-LD의 location/jobLocation 값을 장소 문자열로 변환"""
+    if isinstance(value, list):
+        value = value[0] if value else ""
+    if not isinstance(value, dict):
+        return str(value)
+    place = value.get("name", value.get("address", ""))
+    if isinstance(place, dict):
+        # PostalAddress는 지역, 도로명 순으로 사용
+        place = " ".join(
+            str(place[key])
+            for key in ("addressRegion", "addressLocality", "streetAddress")
+            if place.get(key)
+        )
+    return place
+
+
+def resolve_structured_fields(snapshot):
+    """메타 태그와 JSON-LD만으로 정해지는 제목, 설명, 주최, 기간, 장소
+
+    본문 텍스트는 보지 않으며, 찾지 못한 항목은 None (description은 빈 문자열)
+    """
+    fields = {
+        "title": None,
+        "description": "",
+        "organizer": None,
+        "period": None,
+        "location": None,
+    }
+    meta_property = snapshot["meta_property"]
+    meta_name = snapshot["meta_name"]
+
+    # 제목: og:title > title
+    og_title = meta_property.get("og:title")
+    title_tag = snapshot["title_tag"]
+    if og_title:
+        fields["title"] = og_title.get("content", "").strip()
+    elif title_tag:
+        fields["title"] = title_tag.string.strip() if title_tag.string else ""
+
+    # 설명 추출
+    og_desc = meta_property.get("og:description")
+    meta_desc = meta_name.get("description")
+    if og_desc:
+        fields["description"] = og_desc.get("content", "").strip()
+    elif meta_desc:
+        fields["description"] = meta_desc.get("content", "").strip()
+
+    data = snapshot["json_ld_data"]
+
+    # 주최: author 메타 > JSON-LD organizer/hiringOrganization (Event/JobPosting)
+    org_meta = meta_name.get("author")
+    if org_meta and org_meta.get("content"):
+        fields["organizer"] = org_meta.get("content").strip()[:50]
+    elif isinstance(data, dict):
+        fields["organizer"] = _json_ld_name(
+            data.get("organizer") or data.get("hiringOrganization")
+        )
+
+    # 기간: JSON-LD > event:start_time
+    if data is not None:
+        try:
+            if "startDate" in data and "endDate" in data:
+                fields["period"] = f"{data['startDate']} ~ {data['endDate']}"
+            elif "validThrough" in data:
+                fields["period"] = f"~{data['validThrough']}"
+        except:
+            pass
+    if fields["period"] is None:
+        event_meta = meta_property.get("event:start_time")
+        if event_meta:
+            fields["period"] = event_meta.get("content", "")[:30]
+
+    # 장소: JSON-LD location/jobLocation > event:location
+    if data is not None:
+        try:
+            if "location" in data:
+                fields["location"] = _json_ld_place(data["location"])
+            elif "jobLocation" in data:
+                fields["location"] = _json_ld_place(data["jobLocation"])
+        except:
+            pass
+    if fields["location"] is None:
+        location_meta = meta_property.get("event:location")
+        if location_meta:
+            fields["location"] = location_meta.get("content", "")[:50]
+
+    return fields
+
+
+def classify_keywords(title, description):
+    """제목과 설명으로 분류 키워드 결정"""
+    all_text = f"{title} {description}".lower()
+    keyword_mapping = {
+        "채용": ["채용", "구인", "모집", "입사", "리크루팅"],
+        "펀딩": ["펀딩", "후원", "기부", "캠페인", "크라우드"],
+        "교육": ["교육", "강의", "세미나", "워크샵", "컨퍼런스"],
+        "공모": ["공모", "공모전", "지원", "신청", "모집"],
+        "행사": ["행사", "이벤트", "축제", "박람회", "전시"],
+    }
+
+    for category, words in keyword_mapping.items():
+        if any(word in all_text for word in words):
+            return [category]
+    return ["general"]
+
+
+def _site_name(url):
+    """URL에서 사이트(호스트) 이름 추출"""
+    try:
+        return urlparse(url).netloc
+    except:
+        return url.split('/')[2] if '://' in url else url
+
+
+def _scan_body_fields(body_text):
+    """본문 텍스트에서 대상, 연락처, 상세 내용 찾기 (없으면 빈 문자열)"""
+    fields = {"target": "", "contact_info": "", "details": ""}
+    for key, field, limit in (
+        ("target", "target", 30),
+        ("contact_info", "contact", 50),
+        ("details", "details", 100),
+    ):
+        for match in FIELD_SCANNER.iter(field, body_text):
+            if match:
+                fields[key] = match.group(1).strip()[:limit]
+                break
+    return fields
+
+
+def _image_infos(url, img_tags):
+    """img 태그(또는 속성 dict) 목록을 절대 URL로 바꾼 이미지 정보 목록으로 변환"""
+    images = []
+    for img in img_tags:
+        if img.get("src"):
+            img_src = img.get("src")
+
+            # 상대 URL을 절대 URL로 변환
+            try:
+                if img_src.startswith("//"):
+                    img_src = "https:" + img_src
+                elif img_src.startswith("/"):
+                    parsed_base = urlparse(url)
+                    img_src = f"{parsed_base.scheme}://{parsed_base.netloc}{img_src}"
+                elif not img_src.startswith(("http://", "https://")):
+                    parsed_base = urlparse(url)
+                    img_src = f"{parsed_base.scheme}://{parsed_base.netloc}/{img_src.lstrip('/')}"
+            except:
+                # URL 파싱 실패 시 원본 사용
+                pass
+
+            images.append(
+                {
+                    "src": img_src,
+                    "alt": img.get("alt", ""),
+                    "title": img.get("title", ""),
+                    "ocr_text": "OCR disabled for Vercel deployment",
+                }
+            )
+    return images
+
+
+def _light_body(content, encoding, strip_prolog=False):
+    """DOM을 만들지 않고 정규식으로 얻은 (전체 텍스트, 앞의 3개 문단, 앞의 3개 이미지 속성)
+
+    soup.get_text()처럼 script/style/주석을 빼고 태그만 지운 텍스트라서 본문 패턴
+    (대상, 연락처 등)은 전체 파싱과 같은 줄에서 찾는다. strip_prolog이면 lxml처럼
+    <html> 앞(doctype 뒤 줄바꿈 등)의 공백을 뺀다.
+    """
+    if isinstance(content, bytes):
+        content = content.decode(encoding or "utf-8", "replace")
+    content = _SKIPPED_BLOCKS.sub("", content)
+    text = unescape(_TAGS.sub("", content))
+    match = _DOCUMENT_START.search(content) if strip_prolog else None
+    if match:
+        prolog = unescape(_TAGS.sub("", content[: match.start()]))
+        text = prolog.lstrip() + unescape(_TAGS.sub("", content[match.start():]))
+    paragraphs = [
+        unescape(_TAGS.sub("", match.group(1))) for match in _PARAGRAPHS.finditer(content)
+    ][:3]
+    images = []
+    for match in _IMG_TAGS.finditer(content):
+        attrs = {}
+        for found in _IMG_ATTRS.finditer(match.group(0)):
+            value = next(value for value in found.groups()[1:] if value is not None)
+            attrs.setdefault(found.group(1).lower(), unescape(value))
+        if "src" in attrs:
+            images.append(attrs)
+            if len(images) == 3:
+                break
+    return text, paragraphs, images
+
+
+def extract_head_info(url, content, parsers=None):
+    """<head>만 파싱해서 제목, 주최, 기간, 장소가 모두 구조화 데이터로 정해지면 page_info 반환
+
+    하나라도 비어 있으면 None을 반환하고, 호출한 쪽에서 본문까지 파싱한다.
+    본문에서만 얻을 수 있는 항목(대상, 연락처, 상세 내용, 본문 요약, 이미지)은 DOM을
+    만들지 않고 태그만 지운 본문 텍스트에서 찾는다 (본문 요약은 앞의 3개 문단).
+    본문에 CONTENT_SELECTORS 요소(main, article, .content 등)가 있으면 본문 요약을
+    그 요소에서 가져와야 하므로 None을 반환한다.
+    """
+    match = _HEAD_END[type(content)].search(content)
+    if not match:
+        return None
+    head = content[: match.end()]
+    if _CONTENT_ELEMENTS[type(content)].search(content, match.end()):
+        return None
+    markers = _STRUCTURED_MARKERS
+    if isinstance(head, bytes):
+        markers = [marker.encode() for marker in markers]
+    if not any(marker in head for marker in markers):
+        return None
+
+    try:
+        soup = make_soup(head, parsers)
+    except Exception:
+        # <head>만으로 파싱하지 못하면 전체 문서 파싱에 맡긴다
+        return None
+    fields = resolve_structured_fields(collect_page_snapshot(soup))
+    if not all(fields[key] for key in ("title", "organizer", "period", "location")):
+        return None
+
+    body_text, paragraphs, img_attrs = _light_body(
+        content,
+        getattr(soup, "original_encoding", None),
+        strip_prolog=soup.builder.NAME == "lxml",
+    )
+    body_fields = _scan_body_fields(body_text)
+    main_content = " ".join(text.strip() for text in paragraphs)[:200]
+
+    return {
+        "title": fields["title"],
+        "description": fields["description"] or "No description available",
+        "organizer": fields["organizer"],
+        "period": fields["period"],
+        "location": fields["location"],
+        "target": body_fields["target"] or "Unknown Target",
+        "keywords": classify_keywords(fields["title"], fields["description"]),
+        "main_content": main_content or "No content available",
+        "images": _image_infos(url, img_attrs),
+        "contact_info": body_fields["contact_info"] or "No contact info",
+        "details": body_fields["details"] or "No details available",
+        "site_name": _site_name(url),
+        "ocr_text": "OCR disabled for Vercel deployment",
+        "full_text": body_text[:500] + ("..." if len(body_text) > 500 else ""),
+        "confidence": {
+            "title": "high",
+            "organizer": "high",
+            "period": "high",
+            "location": "high",
+            "target": "medium" if body_fields["target"] else "low",
+        },
+    }
+
+
+# 주최자를 찾지 못했을 때 URL의 도메인으로 유추할 기관명
+DOMAIN_ORGANIZERS = {
+    "habitat.careers.team": "해비타트",
+    "koica.go.kr": "KOICA",
+    "msf.or.kr": "국경없는의사회",
+    "concern.or.kr": "컨선월드와이드",
+    "globalcare.or.kr": "굿네이버스",
+    "asannanum.career.greetinghr.com": "아산나눔재단",
+    "saramin.co.kr": "사람인",
+    "happybean.naver.com": "네이버 해피빈",
+    "cherry.charity": "체리",
+    "socialfunch.org": "소셜펀치",
+}
+
+
+def _domain_organizer(url):
+    """DOMAIN_ORGANIZERS에서 url에 해당하는 기관명 (없으면 None)"""
+    for domain, name in DOMAIN_ORGANIZERS.items():
+        if domain in url:
+            return name
+    return None
+
+
+# 본문 해시 -> 추출 결과 캐시 크기 (0이면 사용 안 함)
+# 로그인 화면, 보안 검증 페이지, SPA 껍데기, soft-404처럼 URL은 달라도
+# 본문이 같은 페이지를 한 번만 파싱한다
+EXTRACTION_CACHE_SIZE = int(os.environ.get("EXTRACTION_CACHE_SIZE", 256))
+
+_extraction_cache = OrderedDict()
+_extraction_lock = threading.Lock()
+_extraction_stats = {"hits": 0, "misses": 0}
+
+
+def _extraction_key(url, content, parsers):
+    """추출 결과가 같아지는 조건으로 만든 캐시 키
+
+    결과는 본문 외에 URL의 스킴/호스트(사이트 이름, 이미지 절대 경로)와
+    도메인별 처리(주최 기관 유추, 더프라미스 보안 페이지)에만 영향을 받는다.
+    """
+    data = content.encode("utf-8", "surrogatepass") if isinstance(content, str) else content
+    parsed = urlparse(url)
+    return (
+        hashlib.blake2b(data, digest_size=16).digest(),
+        parsed.scheme,
+        parsed.netloc,
+        _domain_organizer(url),
+        "thepromise.or.kr" in url,
+        tuple(parsers or PARSER_BACKENDS),
+    )
+
+
+def extraction_cache_stats():
+    """본문 해시 캐시 통계"""
+    with _extraction_lock:
+        return dict(
+            _extraction_stats,
+            items=len(_extraction_cache),
+            max_items=EXTRACTION_CACHE_SIZE,
+        )
+
+
+def extract_page_info(url, content, parsers=None):
+    """받아온 HTML에서 제목, 주최, 기간, 장소 등 핵심 정보를 추출
+
+    본문이 같은 페이지를 이미 추출했으면 파싱 없이 그 결과의 복사본을 반환한다.
+    """
+    if EXTRACTION_CACHE_SIZE <= 0:
+        return _extract_page_info(url, content, parsers)
+
+    key = _extraction_key(url, content, parsers)
+    with _extraction_lock:
+        page_info = _extraction_cache.get(key)
+        if page_info is not None:
+            _extraction_cache.move_to_end(key)
+            _extraction_stats["hits"] += 1
+            return copy.deepcopy(page_info)
+        _extraction_stats["misses"] += 1
+
+    page_info = _extract_page_info(url, content, parsers)
+    with _extraction_lock:
+        _extraction_cache[key] = copy.deepcopy(page_info)
+        while len(_extraction_cache) > EXTRACTION_CACHE_SIZE:
+            _extraction_cache.popitem(last=False)
+    return page_info
+
+
+def _extract_page_info(url, content, parsers=None):
+    """extract_page_info의 실제 추출 (캐시 없이)"""
+    # 1단계: <head>의 구조화 데이터만으로 충분하면 본문은 파싱하지 않는다
+    if HEAD_FAST_PATH:
+        page_info = extract_head_info(url, content, parsers)
+        if page_info is not None:
+            return page_info
+
+    # 2단계: 전체 문서 파싱 (구조화 데이터로 정해지지 않은 항목만 본문에서 찾는다)
+    soup = make_soup(content, parsers)
+    snapshot = collect_page_snapshot(soup)
+
+    # 보안 검증 페이지 확인
+    body_text = snapshot["text"]
+    if "자동등록방지를 위해 보안절차를 거치고 있습니다" in body_text:
+        # HTML 메타 정보에서 기본 정보 추출 시도
+        meta_title = snapshot["title_tag"]
+        if meta_title and meta_title.string:
+            extracted_title = meta_title.string.strip()
+            # 제목에서 핵심 정보 추출
+            main_title = extracted_title.split('>')[0].strip()
+
+            page_info = {
+                "title": main_title,
+                "description": "보안 검증이 필요한 페이지입니다",
+                "organizer": "확인 필요",
+                "period": "확인 필요",
+                "location": "확인 필요",
+                "target": "확인 필요",
+                "keywords": ["보안검증"],
+                "error": False,
+                "note": "이 페이지는 보안 검증이 필요합니다. 브라우저에서 직접 확인해주세요.",
+                "site_name": url.split('/')[2] if '://' in url else url,
+                "confidence": {
+                    "title": "medium",
+                    "organizer": "low",
+                    "period": "low",
+                    "location": "low",
+                    "target": "low",
+                },
+            }
+
+            # 도메인별 추가 정보
+            if "thepromise.or.kr" in url:
+                page_info["organizer"] = "더프라미스"
+                page_info["confidence"]["organizer"] = "medium"
+                if "KOICA" in main_title or "YP" in main_title:
+                    page_info["keywords"] = ["채용", "KOICA"]
+                    page_info["target"] = "청년"
+                    page_info["location"] = "해외파견"
+                    page_info["confidence"]["target"] = "medium"
+                    page_info["confidence"]["location"] = "medium"
+
+            return page_info
+
+    # 메타 태그와 JSON-LD에서 정해지는 항목 (없으면 None)
+    fields = resolve_structured_fields(snapshot)
+    # 항목별 신뢰도: 구조화 데이터는 high, 본문 패턴/제목 태그/도메인 유추는 medium,
+    # 기본값("Unknown ...")은 low (아래에서 항목을 정한 뒤 채운다)
+    confidence = {
+        key: "high" if fields[key] else "low"
+        for key in ("title", "organizer", "period", "location")
+    }
+    confidence["target"] = "low"
+
+    # 페이지 정보 추출 개선
+    # 제목 추출 우선순위: og:title > title > h1 > h2
+    title = fields["title"]
+    if title is None:
+        title = ""
+        if snapshot["h1"] is not None:
+            title = snapshot["h1"].strip()
+        elif snapshot["h2"] is not None:
+            title = snapshot["h2"].strip()
+        if title:
+            confidence["title"] = "medium"
+
+    description = fields["description"]
+
+    # 주최자 정보 추출 (맥락 고려 개선)
+    # 1. 메타 데이터에서 추출
+    organizer = fields["organizer"]
+    if organizer is None:
+        organizer = "Unknown Organizer"
+        # 2. 패턴 매칭으로 추출
+        for match in FIELD_SCANNER.iter("organizer", body_text):
+            if match:
+                candidate = match.group(1).strip()
+                # 의미있는 길이의 텍스트만 채택
+                if 2 <= len(candidate) <= 50 and not re.match(
+                    r"^\d+$", candidate
+                ):
+                    organizer = candidate
+                    break
+
+    # 3. URL에서 도메인 정보로 유추
+    if organizer == "Unknown Organizer":
+        organizer = _domain_organizer(url) or organizer
+
+    # 기간 정보 추출 (맥락 고려 개선)
+    # 1. 구조화된 데이터에서 추출 (JSON-LD, OpenGraph 등)
+    period = fields["period"]
+    if period is None:
+        period = "Unknown Period"
+        # 3. 패턴 매칭으로 추출 (개선된 패턴)
+        for match in FIELD_SCANNER.iter("period", body_text):
+            if match:
+                if len(match.groups()) > 1:
+                    period = f"{match.group(1).strip()} ~ {match.group(2).strip()}"
+                else:
+                    candidate = match.group(1).strip()[:50]
+                    # 의미있는 날짜 정보인지 검증
+                    if any(
+                        word in candidate
+                        for word in [
+                            "월",
+                            "일",
+                            "년",
+                            "까지",
+                            "until",
+                            "deadline",
+                            "/",
+                            "-",
+                            ".",
+                        ]
+                    ):
+                        period = candidate
+                break
+
+    # 장소 정보 추출 (맥락 고려 개선)
+    # 1. 구조화된 데이터에서 추출
+    location = fields["location"]
+    if location is None:
+        location = "Unknown Location"
+        # 3. 패턴 매칭으로 추출 (개선된 패턴)
+        # 우선 온라인 여부 확인
+        for match in FIELD_SCANNER.iter("online", body_text):
+            if match:
+                location = "온라인"
+                break
+
+        if location == "Unknown Location":
+            # 물리적 장소 패턴
+            for match in FIELD_SCANNER.iter("location", body_text):
+                if match:
+                    candidate = match.group(1).strip()[:50]
+                    # 의미있는 장소 정보인지 검증
+                    if len(candidate) >= 2 and not re.match(
+                        r"^\d+$", candidate
+                    ):
+                        location = candidate
+                        break
+
+    # 대상, 연락처, 상세 내용 정보 추출
+    body_fields = _scan_body_fields(body_text)
+    target = body_fields["target"] or "Unknown Target"
+
+    # 구조화 데이터로 정해지지 않았지만 기본값도 아닌 항목은 본문 패턴(또는 유추)으로 찾은 것
+    for key, value, default in (
+        ("organizer", organizer, "Unknown Organizer"),
+        ("period", period, "Unknown Period"),
+        ("location", location, "Unknown Location"),
+        ("target", target, "Unknown Target"),
+    ):
+        if confidence[key] == "low" and value and value != default:
+            confidence[key] = "medium"
+
+    # 키워드 추출 (제목과 설명에서)
+    keywords = classify_keywords(title, description)
+
+    # 추가 컨텐츠 정보 추출
+    # 본문 주요 내용 추출 (첫 200자)
+    main_content = ""
+    for selector in CONTENT_SELECTORS:
+        if selector in snapshot["content_text"]:
+            main_content = snapshot["content_text"][selector][:200].strip()
+            break
+
+    if not main_content:
+        # 본문을 찾지 못한 경우 body에서 추출
+        body_paragraphs = snapshot["paragraphs"]
+        if body_paragraphs:
+            main_content = " ".join(
+                [text.strip() for text in body_paragraphs]
+            )[:200]
+
+    # 이미지 정보 및 OCR 텍스트 추출
+    ocr_text = ""
+    images = _image_infos(url, snapshot["images"])  # 최대 3개
+
+    contact_info = body_fields["contact_info"]
+    details = body_fields["details"]
+
+    # URL에서 사이트 정보 추출
+    site_name = _site_name(url)
+
+    # OCR 텍스트를 기존 텍스트와 통합하여 재분석
+    if ocr_text.strip():
+        combined_text = body_text + " " + ocr_text
+
+        # OCR 텍스트에서 추가 정보 재추출
+        if organizer == "Unknown Organizer":
+            for pattern in [
+                r"주최[:：]\s*([^\n\r\|]+)",
+                r"주관[:：]\s*([^\n\r\|]+)",
+            ]:
+                match = re.search(pattern, ocr_text, re.IGNORECASE)
+                if match:
+                    candidate = match.group(1).strip()
+                    if 2 <= len(candidate) <= 50:
+                        organizer = candidate
+                        break
+
+        if period == "Unknown Period":
+            for pattern in [
+                r"마감[:：]\s*(\d{4}[-./년]\s*\d{1,2}[-./월]\s*\d{1,2}[일]?)",
+                r"기간[:：]\s*([^\n\r]+)",
+            ]:
+                match = re.search(pattern, ocr_text, re.IGNORECASE)
+                if match:
+                    candidate = match.group(1).strip()[:50]
+                    if any(
+                        word in candidate
+                        for word in [
+                            "월",
+                            "일",
+                            "년",
+                            "까지",
+                            "/",
+                            "-",
+                            ".",
+                        ]
+                    ):
+                        period = candidate
+                        break
+
+        if location == "Unknown Location":
+            for pattern in [
+                r"장소[:：]\s*([^\n\r]+)",
+                r"위치[:：]\s*([^\n\r]+)",
+            ]:
+                match = re.search(pattern, ocr_text, re.IGNORECASE)
+                if match:
+                    candidate = match.group(1).strip()[:50]
+                    if len(candidate) >= 2:
+                        location = candidate
+                        break
+    else:
+        combined_text = body_text
+
+    page_info = {
+        "title": title or "Unknown Title",
+        "description": description or "No description available",
+        "organizer": organizer,
+        "period": period,
+        "location": location,
+        "target": target,
+        "keywords": keywords,
+        "main_content": main_content or "No content available",
+        "images": images,
+        "contact_info": contact_info or "No contact info",
+        "details": details or "No details available",
+        "site_name": site_name,
+        "ocr_text": "OCR disabled for Vercel deployment",
+        "full_text": combined_text[:500]
+        + (
+            "..." if len(combined_text) > 500 else ""
+        ),  # OCR 텍스트 포함한 전체 텍스트
+        "confidence": confidence,
+    }
+
+    return page_info
+
+
+def _interleave_by_host(urls):
+    """같은 호스트가 연달아 오지 않도록 호스트별로 번갈아 정렬"""
+    by_host = {}
+    for url in urls:
+        by_host.setdefault(urlparse(url).netloc.lower(), []).append(url)
+    ordered = []
+    queues = list(by_host.values())
+    while queues:
+        for queue in queues:
+            ordered.append(queue.pop(0))
+        queues = [queue for queue in queues if queue]
+    return ordered
+
+
+def deadline_page_info():
+    """일괄 스크래핑 제한 시간 안에 끝나지 않은 링크의 결과"""
+    return {
+        "title": "시간 초과",
+        "description": "제한 시간 안에 페이지를 가져오지 못했습니다",
+        "organizer": "Unknown",
+        "period": "Unknown",
+        "location": "Unknown",
+        "target": "Unknown",
+        "keywords": ["timeout"],
+        "error": True,
+        "errorType": "timeout",
+        "errorMessage": "일괄 스크래핑 제한 시간 초과 (다시 분석하면 이어서 가져옵니다)",
+    }
+
+
+def failed_page_info(error):
+    """처리하지 못한 예외로 실패한 링크의 결과"""
+    error_str = str(error)
+    if "codec" in error_str.lower():
+        error_desc = "문자 인코딩 오류"
+    elif "json" in error_str.lower():
+        error_desc = "데이터 형식 오류"
+    else:
+        error_desc = error_str[:100] or type(error).__name__  # 에러 메시지 길이 제한
+    return {
+        "title": "페이지 로드 실패",
+        "description": error_desc,
+        "organizer": "Unknown",
+        "period": "Unknown",
+        "location": "Unknown",
+        "target": "Unknown",
+        "keywords": ["error"],
+        "error": True,
+        "errorType": "general",
+        "errorMessage": error_desc,
+    }
+
+
+def batch_request(data):
+    """/api/scrape-batch 요청 본문을 (url이 있는 링크 dict 목록, 호 dict 또는 None)으로 확인
+
+    {"urls": [...]} 또는 analyze-batch와 같은 {"links": [{"url": ...}]} 형식을 받는다.
+    형식이 맞지 않으면 ValueError (핸들러는 400으로 응답한다).
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Request body must be a JSON object")
+    urls = data.get("urls") or []
+    links = data.get("links") or []
+    issue = data.get("issue")
+    if not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+        raise ValueError("urls must be a list of strings")
+    if not isinstance(links, list) or not all(
+        isinstance(link, dict)
+        and all(isinstance(link.get(field) or "", str) for field in ("url", "category", "text"))
+        for link in links
+    ):
+        raise ValueError("links must be a list of objects with url/category/text strings")
+    if issue is not None and not (isinstance(issue, dict) and isinstance(issue.get("url") or "", str)):
+        raise ValueError("issue must be an object with a url string")
+    links = links or [{"url": url} for url in urls]
+    return [link for link in links if link.get("url")], issue
+
+
+def scrape_batch(
+    urls,
+    max_workers=BATCH_MAX_WORKERS,
+    per_host=BATCH_PER_HOST,
+    scrape_func=scrape_page,
+    deadline=None,
+):
+    """여러 URL을 동시에 스크래핑해 URL을 키로 하는 dict로 반환
+
+    정규 URL이 같은 링크는 처음 나온 URL로 한 번만 스크래핑해서 결과를 함께 쓴다.
+    전체 동시 요청 수는 max_workers, 호스트별 동시 요청 수는 per_host로 제한한다.
+    deadline(time.monotonic() 기준 시각)까지 끝나지 않은 링크는 기다리지 않고
+    deadline_page_info()를 돌려준다 (진행 중인 요청은 뒤에서 끝나 캐시에 저장된다).
+    scrape_func에서 예외가 난 링크는 failed_page_info() 결과가 된다.
+    """
+    requested_urls = list(dict.fromkeys(url for url in urls if url))
+    if not requested_urls:
+        return {}
+    # 단축 URL은 먼저 한꺼번에 최종 URL을 확인해서 같은 페이지를 가리키는 링크와 합친다
+    final_urls = short_link_resolver.resolve_many(requested_urls)
+    representatives = {}  # 정규 URL -> 실제로 요청할 (처음 나온) URL
+    for url in requested_urls:
+        representatives.setdefault(canonical_url(final_urls[url]), final_urls[url])
+    unique_urls = list(representatives.values())
+
+    host_slots = {}
+    host_lock = threading.Lock()
+
+    def scrape_with_host_limit(url):
+        host = urlparse(url).netloc.lower()
+        with host_lock:
+            slot = host_slots.setdefault(host, threading.BoundedSemaphore(per_host))
+        with slot:
+            return scrape_func(url)
+
+    ordered_urls = _interleave_by_host(unique_urls)
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(unique_urls)))
+    futures = {url: executor.submit(scrape_with_host_limit, url) for url in ordered_urls}
+    wait(
+        futures.values(),
+        timeout=None if deadline is None else max(0, deadline - time.monotonic()),
+    )
+    executor.shutdown(wait=False, cancel_futures=True)
+    page_infos = {}
+    for url, future in futures.items():
+        if not future.done() or future.cancelled():
+            page_infos[url] = deadline_page_info()
+        elif future.exception() is not None:
+            # 한 링크의 예외로 일괄 요청 전체가 실패하지 않도록 그 링크만 오류 결과로 돌려준다
+            page_infos[url] = failed_page_info(future.exception())
+        else:
+            page_infos[url] = future.result()
+    return {
+        url: page_infos[representatives[canonical_url(final_urls[url])]]
+        for url in requested_urls
+    }
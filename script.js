@@ -56,7 +56,8 @@ const elements = {
     modalClose: document.getElementById('modal-close'),
     modalCancel: document.getElementById('modal-cancel'),
     toastContainer: document.getElementById('toast-container'),
-    aiToggleBtn: document.getElementById('ai-toggle-btn')
+    aiToggleBtn: document.getElementById('ai-toggle-btn'),
+    aiModeBtn: document.getElementById('ai-mode-btn')
 };
 
 // 푸시 알림 관련 함수
@@ -209,6 +210,38 @@ function updateAIButtonState() {
         elements.aiToggleBtn.classList.remove('active');
         elements.aiToggleBtn.title = 'AI 분석 비활성화됨 (클릭하여 활성화)';
     }
+    
+    updateAIModeButtonState();
+}
+
+// AI 분석 방식: 보강(기본, 신뢰도가 낮은 링크만 AI로 보강) / 전체(모든 링크를 AI로 분석)
+function handleAIModeToggle() {
+    const fullAIAnalysis = localStorage.getItem('aiAnalysisMode') === 'full';
+    
+    if (!fullAIAnalysis) {
+        localStorage.setItem('aiAnalysisMode', 'full');
+        showToast('모든 링크를 AI로 분석합니다. 다음 분석부터 적용됩니다.', 'info');
+    } else {
+        localStorage.removeItem('aiAnalysisMode');
+        showToast('신뢰도가 낮은 링크만 AI로 보강합니다.', 'info');
+    }
+    
+    updateAIModeButtonState();
+}
+
+function updateAIModeButtonState() {
+    if (!elements.aiModeBtn) return;
+    
+    const useBedrockAPI = localStorage.getItem('useBedrockAPI') === 'true';
+    const fullAIAnalysis = localStorage.getItem('aiAnalysisMode') === 'full';
+    
+    // AI 분석이 꺼져 있으면 방식 선택은 의미가 없으므로 숨긴다
+    elements.aiModeBtn.style.display = useBedrockAPI ? '' : 'none';
+    elements.aiModeBtn.textContent = fullAIAnalysis ? '전체' : '보강';
+    elements.aiModeBtn.classList.toggle('active', fullAIAnalysis);
+    elements.aiModeBtn.title = fullAIAnalysis
+        ? 'AI 분석 방식: 모든 링크를 AI로 분석 (클릭하여 보강 방식으로)'
+        : 'AI 분석 방식: 신뢰도가 낮은 링크만 AI로 보강 (클릭하여 전체 분석으로)';
 }
 
 // 이벤트 리스너 등록
@@ -231,6 +264,9 @@ document.addEventListener('DOMContentLoaded', function() {
         elements.aiToggleBtn.addEventListener('click', handleAIToggle);
         updateAIButtonState();
     }
+    if (elements.aiModeBtn) {
+        elements.aiModeBtn.addEventListener('click', handleAIModeToggle);
+    }
     
     elements.analyzeBtn.addEventListener('click', handleAnalyze);
     elements.urlInput.addEventListener('keypress', function(e) {
@@ -303,54 +339,89 @@ async function handleAnalyze() {
         // 3. 검증 대상 링크만 필터링
         const verifiedLinks = links.filter(link => isVerifiedCategory(link.category));
         
+        // 같은 호를 다시 분석하면 서버가 바뀐 링크만 다시 AI로 보강하도록 호 URL 전달
+        const issue = { url: url };
+        
         // 4. 각 링크 분석 - Bedrock Claude API 사용 시도
         updateLoadingText('링크를 분석하는 중...');
         analysisData = [];
         
         // Bedrock Claude API 사용 가능 여부 확인
         const useBedrockAPI = localStorage.getItem('useBedrockAPI') === 'true';
+        // 기본은 규칙 기반 추출 후 신뢰도가 낮은 링크만 AI로 보강 (헤더의 AI 분석 방식 버튼으로 aiAnalysisMode를 full로 바꾸면 모든 링크를 AI로 분석)
+        const fullAIAnalysis = useBedrockAPI && localStorage.getItem('aiAnalysisMode') === 'full';
         
-        if (useBedrockAPI) {
+        if (fullAIAnalysis) {
             try {
-                // Bedrock Claude API로 일괄 분석
+                // Bedrock Claude API로 일괄 분석 (링크별 결과가 완성되는 대로 받아서 표에 바로 반영)
                 updateLoadingText('AI로 링크를 일괄 분석하는 중...');
-                const response = await fetch('/api/analyze-batch', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json'
-                    },
-                    body: JSON.stringify({ links: verifiedLinks })
+                const analyzedIds = new Set();
+                let lastRender = 0;
+                await fetchAnalysisStream(verifiedLinks, (url, aiResult) => {
+                    // AI 분석 결과를 기존 포맷에 맞게 변환
+                    for (const link of verifiedLinks) {
+                        if (link.url === url && !analyzedIds.has(link.id)) {
+                            analyzedIds.add(link.id);
+                            analysisData.push(toAIAnalysis(link, aiResult));
+                        }
+                    }
+                    updateProgress(analyzedIds.size, verifiedLinks.length,
+                        `AI로 링크를 분석하는 중... (${analyzedIds.size}/${verifiedLinks.length})`);
+                    
+                    // 첫 결과부터 표를 보여주고, 너무 자주 다시 그리지 않도록 0.5초 간격으로 갱신
+                    if (Date.now() - lastRender > 500) {
+                        lastRender = Date.now();
+                        elements.loadingOverlay.classList.add('hidden');
+                        displayResults(analysisData, links.filter(link =>
+                            !isVerifiedCategory(link.category) || analyzedIds.has(link.id)));
+                    }
                 });
                 
-                if (response.ok) {
-                    const results = await response.json();
-                    // AI 분석 결과를 기존 포맷에 맞게 변환
-                    for (let i = 0; i < verifiedLinks.length; i++) {
-                        const link = verifiedLinks[i];
-                        const aiResult = results[link.url] || {};
-                        analysisData.push({
-                            ...link,
-                            pageInfo: aiResult.key_info || {},
-                            suggestedText: aiResult.suggested_text || link.text,
-                            accuracy: aiResult.accuracy || 0,
-                            issues: aiResult.issues || [],
-                            breakdown: calculateDetailedScore(link.text, aiResult.suggested_text || link.text, aiResult.key_info || {}, link.category)
-                        });
+                // 결과를 받지 못한 링크는 AI 분석 실패로 표시
+                for (const link of verifiedLinks) {
+                    if (!analyzedIds.has(link.id)) {
+                        analysisData.push(toAIAnalysis(link, {}));
                     }
-                    showToast('AI 분석을 사용하여 빠르게 완료되었습니다!', 'success');
-                } else {
-                    throw new Error('Bedrock API 호출 실패');
                 }
+                showToast('AI 분석을 사용하여 빠르게 완료되었습니다!', 'success');
             } catch (error) {
                 console.warn('Bedrock API 사용 실패, 기본 방식으로 전환:', error);
                 showToast('AI 분석을 사용할 수 없어 기본 방식으로 진행합니다.', 'warning');
+                analysisData = [];
+                elements.loadingOverlay.classList.remove('hidden');
                 await analyzeLinksInBatches(verifiedLinks);
             }
         } else {
-            await analyzeLinksInBatches(verifiedLinks);
+            await analyzeLinksInBatches(verifiedLinks, useBedrockAPI);
         }
         
-        async function analyzeLinksInBatches(links) {
+        async function analyzeLinksInBatches(links, escalate = false) {
+            // 서버 측 일괄 스크래핑 우선 시도 (이슈당 1회 왕복)
+            updateProgress(0, links.length, `링크 분석 중... (0/${links.length})`);
+            const batchPageInfos = await scrapePageInfoBatch(links, issue, escalate);
+            if (batchPageInfos) {
+                const escalatedCount = Object.values(batchPageInfos)
+                    .filter(pageInfo => pageInfo && pageInfo.escalated).length;
+                if (escalatedCount > 0) {
+                    showToast(`정보가 부족한 링크 ${escalatedCount}개를 AI로 보강했습니다.`, 'success');
+                }
+                for (const link of links) {
+                    const pageInfo = batchPageInfos[link.url] || {
+                        title: "페이지 로드 실패",
+                        description: "일괄 스크래핑 결과가 없습니다",
+                        organizer: "Unknown",
+                        period: "Unknown",
+                        location: "Unknown",
+                        target: "Unknown",
+                        keywords: ["error"],
+                        error: true,
+                        errorType: 'general'
+                    };
+                    analysisData.push(analyzeLink(link, pageInfo));
+                }
+                return;
+            }
+            
             const batchSize = 12;  // 안정성 우선하여 15 -> 12로 조정
             
             for (let i = 0; i < links.length; i += batchSize) {
@@ -819,6 +890,86 @@ async function scrapePageInfo(url) {
     }
 }
 
+// 여러 페이지 정보를 한 번에 스크래핑 (실패 시 null 반환 후 개별 스크래핑으로 전환)
+// escalate가 true면 서버가 규칙 기반 추출의 신뢰도가 낮은 링크만 AI로 다시 추출
+async function scrapePageInfoBatch(links, issue = null, escalate = false) {
+    try {
+        const response = await fetch('/api/scrape-batch', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                // 카테고리별로 지난 호의 결과를 다시 쓸 수 있는 기간이 다르므로 카테고리도 전달
+                // (링크 텍스트는 같은 호를 다시 분석할 때 바뀐 링크만 AI로 보강하는 데 쓴다)
+                links: links.map(link => ({ url: link.url, category: link.category, text: link.text })),
+                issue: issue,
+                escalate: escalate
+            })
+        });
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+        }
+        return await response.json();
+    } catch (error) {
+        console.warn('일괄 스크래핑 실패, 개별 스크래핑으로 전환:', error.message);
+        return null;
+    }
+}
+
+// AI 일괄 분석 결과를 줄 단위(NDJSON)로 받아 링크별로 onResult(url, result) 호출
+async function fetchAnalysisStream(links, onResult) {
+    const response = await fetch('/api/analyze-batch', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'Accept': 'application/x-ndjson'
+        },
+        body: JSON.stringify({ links: links, stream: true })
+    });
+    if (!response.ok || !response.body) {
+        throw new Error('Bedrock API 호출 실패');
+    }
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let received = 0;
+    const handleLine = (line) => {
+        if (!line.trim()) return;
+        const message = JSON.parse(line);
+        if (message.url) {
+            received++;
+            onResult(message.url, message.result || {});
+        } else if (message.error && received === 0) {
+            // 자격 증명 없음 등 결과를 하나도 받지 못한 오류는 기본 방식으로 전환
+            throw new Error(message.error);
+        }
+    };
+    
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.forEach(handleLine);
+    }
+    handleLine(buffer + decoder.decode());
+    return received;
+}
+
+// AI 분석 결과를 분석 결과 포맷으로 변환
+function toAIAnalysis(link, aiResult) {
+    return {
+        ...link,
+        pageInfo: aiResult.key_info || {},
+        suggestedText: aiResult.suggested_text || link.text,
+        accuracy: aiResult.accuracy || 0,
+        issues: aiResult.issues || [],
+        breakdown: calculateDetailedScore(link.text, aiResult.suggested_text || link.text, aiResult.key_info || {}, link.category)
+    };
+}
 
 // 시뮬레이션된 페이지 정보 생성
 function generateSimulatedPageInfo(url) {
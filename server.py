@@ -2,15 +2,33 @@
 import http.server
 import json
 import os
-import re
-import socketserver
+import threading
+import time
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from urllib.parse import parse_qs, urlparse
 
-import requests
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 
+import http_client
+from analysis_cache import analysis_cache
+from bedrock_batch import batch_stats, stream_line
+from circuit_breaker import host_breaker
+from escalation import escalate, escalation_stats
+from issue_store import issue_store
+from link_index import link_index
+from link_prompt import prompt_stats
+from scrape_cache import cache_stats, cached_scrape
+from scraper import (
+    BATCH_DEADLINE,
+    batch_request,
+    extraction_cache_stats,
+    scrape_batch,
+    scrape_page,
+)
+from short_links import short_link_resolver
+
 # Load environment variables
 load_dotenv()
 
@@ -24,6 +42,101 @@ except ImportError:
 
 PORT = 8080
 
+# 동시 처리 설정: 요청 처리 워커 수와 동시에 진행할 수 있는 스크래핑 수
+SERVER_MAX_WORKERS = int(os.environ.get("SERVER_MAX_WORKERS", 32))
+MAX_INFLIGHT_SCRAPES = int(os.environ.get("MAX_INFLIGHT_SCRAPES", 12))
+
+
+class ScrapeLimiter:
+    """동시 스크래핑 수를 제한하고 대기열 깊이를 집계"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self._semaphore = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+
+    @contextmanager
+    def slot(self):
+        with self._lock:
+            self.waiting += 1
+        self._semaphore.acquire()
+        with self._lock:
+            self.waiting -= 1
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+            self._semaphore.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "max_inflight": self.limit,
+                "in_flight": self.in_flight,
+                "queue_depth": self.waiting,
+                "completed": self.completed,
+            }
+
+
+scrape_limiter = ScrapeLimiter(MAX_INFLIGHT_SCRAPES)
+
+
+def limited_scrape_page(url, validators=None):
+    """전역 스크래핑 한도 안에서 scrape_page 실행"""
+    with scrape_limiter.slot():
+        return scrape_page(url, validators)
+
+
+def cached_scrape_page(url):
+    """캐시에 없을 때만 스크래핑 한도 안에서 scrape_page 실행"""
+    return cached_scrape(url, limited_scrape_page)
+
+
+class PooledHTTPServer(http.server.HTTPServer):
+    """고정 크기 워커 풀에서 요청을 처리하는 HTTP 서버
+
+    socketserver.TCPServer는 연결을 하나씩 처리하므로 느린 스크래핑 하나가
+    정적 파일 서빙을 포함한 다른 모든 요청을 막는다.
+    """
+
+    def __init__(self, server_address, handler_class, max_workers=SERVER_MAX_WORKERS):
+        super().__init__(server_address, handler_class)
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="http-worker"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+
+    def process_request(self, request, client_address):
+        with self._lock:
+            self._queued += 1
+        self._executor.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        with self._lock:
+            self._queued -= 1
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._executor.shutdown(wait=False)
+
+    def stats(self):
+        with self._lock:
+            return {"workers": self.max_workers, "queued_connections": self._queued}
+
 
 class CORSHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     def end_headers(self):
@@ -48,7 +161,13 @@ class CORSHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
                 data = json.loads(post_data.decode("utf-8"))
                 links = data.get("links", [])
 
-                if bedrock_claude and links:
+                # 같은 링크(URL/텍스트/카테고리)를 같은 모델과 프롬프트로 분석한 결과는
+                # analysis_cache에서 바로 돌려주고 나머지만 모델로 보낸다
+                if bedrock_claude and links and data.get("stream"):
+                    # 링크별 결과가 완성되는 대로 NDJSON(Accept: text/event-stream이면 SSE)으로 전송
+                    entries = bedrock_claude.analyze_links_stream(links)
+                    self._stream_entries(entries, len(links))
+                elif bedrock_claude and links:
                     # Use Bedrock Claude for batch analysis
                     analysis_results = bedrock_claude.analyze_links_batch(links)
 
@@ -73,9 +192,99 @@ class CORSHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
                 self.wfile.write(error_response.encode())
             return
 
+        # 서버 측 일괄 스크래핑 엔드포인트
+        if parsed_path.path == "/api/scrape-batch":
+            content_length = int(self.headers.get("Content-Length", 0))
+            post_data = self.rfile.read(content_length)
+
+            try:
+                data = json.loads(post_data.decode("utf-8"))
+                # {"urls": [...]} 또는 analyze-batch와 같은 {"links": [{"url": ...}]} 형식 지원
+                links, issue = batch_request(data)
+            except ValueError as e:
+                # 잘못된 JSON이나 형식이 맞지 않는 요청 본문
+                error_response = json.dumps({"error": str(e)})
+                self.send_response(400)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(error_response.encode())
+                return
+
+            try:
+                # escalate: 규칙 기반 추출의 신뢰도가 낮은 링크만 Bedrock으로 다시 추출
+                use_llm = bool(data.get("escalate") and bedrock_claude)
+                # 느린 링크가 있어도 응답은 제한 시간 안에 보낸다 (끝나지 않은 링크는 시간 초과 결과)
+                deadline = time.monotonic() + BATCH_DEADLINE
+
+                if links:
+                    # URL을 키로 하는 결과 (analyze-batch 응답과 같은 형식)
+                    # 지난 호에서 가져온 결과가 카테고리별 유효 기간 안이면 다시 쓴다
+                    results = link_index.run(
+                        links,
+                        lambda pending_urls: scrape_batch(
+                            pending_urls, scrape_func=cached_scrape_page, deadline=deadline
+                        ),
+                        issue.get("url") if issue else None,
+                    )
+                    if use_llm:
+                        def escalate_links(results, pending):
+                            return escalate(
+                                results, pending, bedrock_claude.extract_page_info, deadline=deadline
+                            )
+
+                        if issue and issue.get("url"):
+                            # 같은 호를 다시 분석하면 새로 생기거나 바뀐 링크만 모델로 보낸다
+                            results = issue_store.run(issue, links, results, escalate_links)
+                        else:
+                            results = escalate_links(results, links)
+
+                    response_data = json.dumps(results, ensure_ascii=False)
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json; charset=utf-8")
+                    self.end_headers()
+                    self.wfile.write(response_data.encode("utf-8"))
+                else:
+                    error_response = json.dumps({"error": "No URLs provided"})
+                    self.send_response(400)
+                    self.send_header("Content-Type", "application/json")
+                    self.end_headers()
+                    self.wfile.write(error_response.encode())
+            except Exception as e:
+                error_response = json.dumps({"error": str(e)})
+                self.send_response(500)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(error_response.encode())
+            return
+
         # Default to parent implementation
         super().do_POST()
 
+    def _stream_entries(self, entries, total):
+        """(URL, 결과)를 한 줄씩 보내고 마지막에 done 줄을 보낸다"""
+        sse = "text/event-stream" in self.headers.get("Accept", "")
+        self.send_response(200)
+        self.send_header(
+            "Content-Type",
+            "text/event-stream; charset=utf-8" if sse else "application/x-ndjson; charset=utf-8",
+        )
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        count = 0
+        try:
+            for url, result in entries:
+                self.wfile.write(stream_line({"url": url, "result": result}, sse))
+                self.wfile.flush()
+                count += 1
+            self.wfile.write(stream_line({"done": True, "count": count, "total": total}, sse))
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # 브라우저가 연결을 끊음
+        except Exception as e:
+            self.wfile.write(
+                stream_line({"done": True, "count": count, "total": total, "error": str(e)}, sse)
+            )
+
     def do_GET(self):
         parsed_path = urlparse(self.path)
 
@@ -85,30 +294,8 @@ class CORSHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
             url = query_params.get("url", [None])[0]
 
             if url:
-                try:
-                    headers = {
-                        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                        "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
-                        "Accept-Encoding": "gzip, deflate, br",
-                        "Connection": "keep-alive",
-                        "Upgrade-Insecure-Requests": "1"
-                    }
-                    response = requests.get(url, headers=headers, timeout=45, allow_redirects=True)  # 로컬: 30s -> 45s
-                    response.raise_for_status()
-
-                    self.send_response(200)
-                    self.send_header("Content-Type", "text/html; charset=utf-8")
-                    self.end_headers()
-                    self.wfile.write(response.content)
-                    return
-                except Exception as e:
-                    self.send_response(500)
-                    self.send_header("Content-Type", "application/json")
-                    self.end_headers()
-                    error_response = json.dumps({"error": str(e)})
-                    self.wfile.write(error_response.encode())
-                    return
+                self._proxy_fetch(url)
+                return
             else:
                 self.send_response(400)
                 self.send_header("Content-Type", "application/json")
@@ -123,530 +310,129 @@ class CORSHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
             url = query_params.get("url", [None])[0]
 
             if url:
-                try:
-                    # 특정 사이트에 대한 특별 처리
-                    if "forms.gle" in url or "docs.google.com/forms" in url:
-                        # Google Forms는 JavaScript 렌더링 필요
-                        page_info = {
-                            "title": "Google Form",
-                            "description": "구글 폼 신청서",
-                            "organizer": "Google Forms",
-                            "period": "확인 필요",
-                            "location": "온라인",
-                            "target": "확인 필요",
-                            "keywords": ["신청", "폼"],
-                            "error": False,
-                            "note": "구글 폼은 직접 방문이 필요합니다"
-                        }
-                        self.send_response(200)
-                        self.send_header("Content-Type", "application/json; charset=utf-8")
-                        self.end_headers()
-                        response_data = json.dumps(page_info, ensure_ascii=False)
-                        self.wfile.write(response_data.encode("utf-8"))
-                        return
-                    
-                    # KOICA 사이트의 특별 처리 (로그인 필요)
-                    if "job.koica.go.kr" in url:
-                        page_info = {
-                            "title": "KOICA 채용공고",
-                            "description": "KOICA 채용공고 상세페이지",
-                            "organizer": "KOICA",
-                            "period": "확인 필요",
-                            "location": "확인 필요",
-                            "target": "확인 필요",
-                            "keywords": ["채용", "KOICA"],
-                            "error": False,
-                            "note": "KOICA 사이트는 로그인이 필요합니다. 브라우저에서 직접 확인해주세요.",
-                            "site_name": "job.koica.go.kr"
-                        }
-                        self.send_response(200)
-                        self.send_header("Content-Type", "application/json; charset=utf-8")
-                        self.end_headers()
-                        response_data = json.dumps(page_info, ensure_ascii=False)
-                        self.wfile.write(response_data.encode("utf-8"))
-                        return
-                    
-                    # thepromise.or.kr 사이트의 특별 처리
-                    if "thepromise.or.kr" in url:
-                        # 메타 정보에서 제목 추출 시도
-                        try:
-                            simple_headers = {
-                                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                            }
-                            response = requests.get(url, headers=simple_headers, timeout=10)
-                            content = response.text
-                            
-                            # 제목 추출
-                            title_match = re.search(r'<title>([^<]+)</title>', content)
-                            title = title_match.group(1) if title_match else "더프라미스 공지사항"
-                            
-                            # 더프라미스 관련 키워드로 판단
-                            if "KOICA" in title or "YP" in title or "영프로패셔널" in title:
-                                page_info = {
-                                    "title": title.split('>')[0].strip(),
-                                    "description": "KOICA 개발협력 사업 영프로패셔널(YP) 모집 공고",
-                                    "organizer": "더프라미스",
-                                    "period": "확인 필요",
-                                    "location": "해외파견",
-                                    "target": "청년",
-                                    "keywords": ["채용", "KOICA", "YP"],
-                                    "error": False,
-                                    "note": "자세한 내용은 사이트에서 직접 확인하세요"
-                                }
-                            else:
-                                page_info = {
-                                    "title": title.split('>')[0].strip(),
-                                    "description": "더프라미스 공지사항",
-                                    "organizer": "더프라미스",
-                                    "period": "확인 필요",
-                                    "location": "확인 필요",
-                                    "target": "확인 필요",
-                                    "keywords": ["공지"],
-                                    "error": False,
-                                    "note": "보안 검증이 필요한 페이지입니다"
-                                }
-                            
-                            self.send_response(200)
-                            self.send_header("Content-Type", "application/json; charset=utf-8")
-                            self.end_headers()
-                            response_data = json.dumps(page_info, ensure_ascii=False)
-                            self.wfile.write(response_data.encode("utf-8"))
-                            return
-                        except:
-                            # 실패 시 일반적인 처리로 진행
-                            pass
-                    
-                    headers = {
-                        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-                        "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
-                        "Accept-Encoding": "gzip, deflate, br",
-                        "Connection": "keep-alive",
-                        "Upgrade-Insecure-Requests": "1"
-                    }
-                    response = requests.get(url, headers=headers, timeout=45, allow_redirects=True)  # 로컬: 30s -> 45s
-                    
-                    # 404 페이지인지 먼저 확인
-                    if response.status_code == 404:
-                        page_info = {
-                            "title": "페이지를 찾을 수 없음",
-                            "description": "요청한 페이지가 존재하지 않습니다",
-                            "organizer": "Unknown",
-                            "period": "Unknown",
-                            "location": "Unknown",
-                            "target": "Unknown",
-                            "keywords": ["error"],
-                            "error": True,
-                            "errorType": "http",
-                            "errorCode": 404,
-                            "errorMessage": "HTTP 404 오류 (페이지를 찾을 수 없음)"
-                        }
-                        self.send_response(200)
-                        self.send_header("Content-Type", "application/json; charset=utf-8")
-                        self.end_headers()
-                        response_data = json.dumps(page_info, ensure_ascii=False)
-                        self.wfile.write(response_data.encode("utf-8"))
-                        return
-                    
-                    response.raise_for_status()
-
-                    soup = BeautifulSoup(response.content, "html.parser")
-                    
-                    # 보안 검증 페이지 확인
-                    body_text = soup.get_text()
-                    if "자동등록방지를 위해 보안절차를 거치고 있습니다" in body_text:
-                        # HTML 메타 정보에서 기본 정보 추출 시도
-                        meta_title = soup.find("title")
-                        if meta_title and meta_title.string:
-                            extracted_title = meta_title.string.strip()
-                            # 제목에서 핵심 정보 추출
-                            main_title = extracted_title.split('>')[0].strip()
-                            
-                            page_info = {
-                                "title": main_title,
-                                "description": "보안 검증이 필요한 페이지입니다",
-                                "organizer": "확인 필요",
-                                "period": "확인 필요",
-                                "location": "확인 필요",
-                                "target": "확인 필요",
-                                "keywords": ["보안검증"],
-                                "error": False,
-                                "note": "이 페이지는 보안 검증이 필요합니다. 브라우저에서 직접 확인해주세요.",
-                                "site_name": url.split('/')[2] if '://' in url else url
-                            }
-                            
-                            # 도메인별 추가 정보
-                            if "thepromise.or.kr" in url:
-                                page_info["organizer"] = "더프라미스"
-                                if "KOICA" in main_title or "YP" in main_title:
-                                    page_info["keywords"] = ["채용", "KOICA"]
-                                    page_info["target"] = "청년"
-                                    page_info["location"] = "해외파견"
-                            
-                            self.send_response(200)
-                            self.send_header("Content-Type", "application/json; charset=utf-8")
-                            self.end_headers()
-                            response_data = json.dumps(page_info, ensure_ascii=False)
-                            self.wfile.write(response_data.encode("utf-8"))
-                            return
-
-                    # 페이지 정보 추출 개선
-                    title = ""
-                    # 제목 추출 우선순위: og:title > title > h1 > h2
-                    og_title = soup.find("meta", property="og:title")
-                    if og_title:
-                        title = og_title.get("content", "").strip()
-                    elif soup.title:
-                        title = soup.title.string.strip() if soup.title.string else ""
-                    elif soup.find("h1"):
-                        title = soup.find("h1").get_text().strip()
-                    elif soup.find("h2"):
-                        title = soup.find("h2").get_text().strip()
-
-                    # 설명 추출
-                    description = ""
-                    og_desc = soup.find("meta", property="og:description")
-                    meta_desc = soup.find("meta", attrs={"name": "description"})
-                    if og_desc:
-                        description = og_desc.get("content", "").strip()
-                    elif meta_desc:
-                        description = meta_desc.get("content", "").strip()
-
-                    # 본문에서 추가 정보 추출
-                    body_text = soup.get_text()
-
-                    # 주최자 정보 추출 (맥락 고려 개선)
-                    organizer = "Unknown Organizer"
-
-                    # 1. 메타 데이터에서 추출
-                    org_meta = soup.find("meta", attrs={"name": "author"})
-                    if org_meta and org_meta.get("content"):
-                        organizer = org_meta.get("content").strip()[:50]
-                    else:
-                        # 2. 패턴 매칭으로 추출
-                        organizer_patterns = [
-                            r"주최[:：]\s*([^\n\r\|]+)",
-                            r"주관[:：]\s*([^\n\r\|]+)",
-                            r"발행[:：]\s*([^\n\r\|]+)",
-                            r"운영[:：]\s*([^\n\r\|]+)",
-                            r"기관[:：]\s*([^\n\r\|]+)",
-                            r"단체[:：]\s*([^\n\r\|]+)",
-                            r"회사[:：]\s*([^\n\r\|]+)",
-                            r"by\s+([^\n\r\|]+)",
-                            r"©\s*([^\n\r\|]+)",
-                            r"ⓒ\s*([^\n\r\|]+)",
-                        ]
-                        for pattern in organizer_patterns:
-                            match = re.search(pattern, body_text, re.IGNORECASE)
-                            if match:
-                                candidate = match.group(1).strip()
-                                # 의미있는 길이의 텍스트만 채택
-                                if 2 <= len(candidate) <= 50 and not re.match(
-                                    r"^\d+$", candidate
-                                ):
-                                    organizer = candidate
-                                    break
-
-                    # 3. URL에서 도메인 정보로 유추
-                    if organizer == "Unknown Organizer":
-                        domain_mapping = {
-                            "habitat.careers.team": "해비타트",
-                            "koica.go.kr": "KOICA",
-                            "msf.or.kr": "국경없는의사회",
-                            "concern.or.kr": "컨선월드와이드",
-                            "globalcare.or.kr": "굿네이버스",
-                            "asannanum.career.greetinghr.com": "아산나눔재단",
-                            "saramin.co.kr": "사람인",
-                            "happybean.naver.com": "네이버 해피빈",
-                            "cherry.charity": "체리",
-                            "socialfunch.org": "소셜펀치",
-                        }
-                        for domain, name in domain_mapping.items():
-                            if domain in url:
-                                organizer = name
-                                break
-
-                    # 기간 정보 추출 (맥락 고려 개선)
-                    period = "Unknown Period"
-
-                    # 1. 구조화된 데이터에서 추출 (JSON-LD, OpenGraph 등)
-                    json_ld = soup.find("script", type="application/ld+json")
-                    if json_ld:
-                        try:
-                            data = json.loads(json_ld.string)
-                            if "startDate" in data and "endDate" in data:
-                                period = f"{data['startDate']} ~ {data['endDate']}"
-                            elif "validThrough" in data:
-                                period = f"~{data['validThrough']}"
-                        except:
-                            pass
-
-                    if period == "Unknown Period":
-                        # 2. 메타 태그에서 추출
-                        event_meta = soup.find("meta", property="event:start_time")
-                        if event_meta:
-                            period = event_meta.get("content", "")[:30]
-
-                    if period == "Unknown Period":
-                        # 3. 패턴 매칭으로 추출 (개선된 패턴)
-                        date_patterns = [
-                            # 기본 날짜 범위
-                            r"(\d{4}[-./년]\s*\d{1,2}[-./월]\s*\d{1,2}[일]?)\s*[~-]\s*(\d{4}[-./년]\s*\d{1,2}[-./월]\s*\d{1,2}[일]?)",
-                            r"(\d{1,2}[-./]\d{1,2})\s*[~-]\s*(\d{1,2}[-./]\d{1,2})",
-                            # 특정 키워드와 함께
-                            r"마감[:：]\s*(\d{4}[-./년]\s*\d{1,2}[-./월]\s*\d{1,2}[일]?)",
-                            r"접수기간[:：]\s*([^\n\r]+?까지)",
-                            r"신청기간[:：]\s*([^\n\r]+)",
-                            r"모집기간[:：]\s*([^\n\r]+)",
-                            r"기간[:：]\s*([^\n\r]+)",
-                            r"일시[:：]\s*([^\n\r]+)",
-                            r"날짜[:：]\s*([^\n\r]+)",
-                            # 상대적 표현
-                            r"(\d+[일월년]\s*[후뒤])\s*마감",
-                            r"([^\n\r]*?까지)\s*접수",
-                            r"([^\n\r]*?까지)\s*신청",
-                            # 영어 패턴
-                            r"until\s+([^\n\r]+)",
-                            r"deadline[:：]\s*([^\n\r]+)",
-                            r"due\s+([^\n\r]+)",
-                        ]
-
-                        for pattern in date_patterns:
-                            match = re.search(pattern, body_text, re.IGNORECASE)
-                            if match:
-                                if len(match.groups()) > 1:
-                                    period = f"{match.group(1).strip()} ~ {match.group(2).strip()}"
-                                else:
-                                    candidate = match.group(1).strip()[:50]
-                                    # 의미있는 날짜 정보인지 검증
-                                    if any(
-                                        word in candidate
-                                        for word in [
-                                            "월",
-                                            "일",
-                                            "년",
-                                            "까지",
-                                            "until",
-                                            "deadline",
-                                            "/",
-                                            "-",
-                                            ".",
-                                        ]
-                                    ):
-                                        period = candidate
-                                break
-
-                    # 장소 정보 추출 (맥락 고려 개선)
-                    location = "Unknown Location"
-
-                    # 1. 구조화된 데이터에서 추출
-                    if json_ld:
-                        try:
-                            data = (
-                                json.loads(json_ld.string)
-                                if isinstance(json_ld, str)
-                                else json.loads(json_ld.string)
-                            )
-                            if "location" in data:
-                                if isinstance(data["location"], dict):
-                                    location = data["location"].get(
-                                        "name", data["location"].get("address", "")
-                                    )
-                                else:
-                                    location = str(data["location"])
-                        except:
-                            pass
-
-                    if location == "Unknown Location":
-                        # 2. 메타 태그에서 추출
-                        location_meta = soup.find("meta", property="event:location")
-                        if location_meta:
-                            location = location_meta.get("content", "")[:50]
-
-                    if location == "Unknown Location":
-                        # 3. 패턴 매칭으로 추출 (개선된 패턴)
-                        # 우선 온라인 여부 확인
-                        online_patterns = [
-                            r"온라인|비대면|화상|웹|인터넷|virtual|online|zoom|webex|teams",
-                            r"링크|URL|사이트에서",
-                            r"Google\s+Meet|Zoom|Microsoft\s+Teams",
-                        ]
-
-                        for pattern in online_patterns:
-                            if re.search(pattern, body_text, re.IGNORECASE):
-                                location = "온라인"
-                                break
-
-                        if location == "Unknown Location":
-                            # 물리적 장소 패턴
-                            location_patterns = [
-                                r"장소[:：]\s*([^\n\r]+)",
-                                r"위치[:：]\s*([^\n\r]+)",
-                                r"주소[:：]\s*([^\n\r]+)",
-                                r"개최지[:：]\s*([^\n\r]+)",
-                                r"회장[:：]\s*([^\n\r]+)",
-                                r"venue[:：]\s*([^\n\r]+)",
-                                r"location[:：]\s*([^\n\r]+)",
-                                r"address[:：]\s*([^\n\r]+)",
-                                # 지역명 패턴
-                                r"([가-힣]+시\s+[가-힣]+구\s*[^\n\r]{0,30})",
-                                r"([가-힣]+구\s+[가-힣]+동\s*[^\n\r]{0,30})",
-                                r"(서울|부산|대구|인천|광주|대전|울산|세종|경기|강원|충북|충남|전북|전남|경북|경남|제주)[^\n\r]{0,50}",
-                            ]
-
-                            for pattern in location_patterns:
-                                match = re.search(pattern, body_text, re.IGNORECASE)
-                                if match:
-                                    candidate = match.group(1).strip()[:50]
-                                    # 의미있는 장소 정보인지 검증
-                                    if len(candidate) >= 2 and not re.match(
-                                        r"^\d+$", candidate
-                                    ):
-                                        location = candidate
-                                        break
-
-                    # 대상 정보 추출
-                    target = "Unknown Target"
-                    target_patterns = [
-                        r"대상[:：]\s*([^\n\r]+)",
-                        r"자격[:：]\s*([^\n\r]+)",
-                        r"경력[:：]\s*([^\n\r]+)",
-                        r"(신입|경력|인턴|신입/경력)",
-                    ]
-                    for pattern in target_patterns:
-                        match = re.search(pattern, body_text)
-                        if match:
-                            target = match.group(1).strip()[:30]
-                            break
-
-                    # 키워드 추출 (제목과 설명에서)
-                    keywords = ["general"]
-                    all_text = f"{title} {description}".lower()
-                    keyword_mapping = {
-                        "채용": ["채용", "구인", "모집", "입사", "리크루팅"],
-                        "펀딩": ["펀딩", "후원", "기부", "캠페인", "크라우드"],
-                        "교육": ["교육", "강의", "세미나", "워크샵", "컨퍼런스"],
-                        "공모": ["공모", "공모전", "지원", "신청", "모집"],
-                        "행사": ["행사", "이벤트", "축제", "박람회", "전시"],
-                    }
-
-                    for category, words in keyword_mapping.items():
-                        if any(word in all_text for word in words):
-                            keywords = [category]
-                            break
-
-                    # 추가 컨텐츠 정보 추출
-                    # 본문 주요 내용 추출 (첫 200자)
-                    main_content = ""
-                    content_selectors = [
-                        "main",
-                        "article",
-                        ".content",
-                        ".post",
-                        ".entry",
-                    ]
-                    for selector in content_selectors:
-                        content_elem = soup.select_one(selector)
-                        if content_elem:
-                            main_content = content_elem.get_text()[:200].strip()
-                            break
-
-                    if not main_content:
-                        # 본문을 찾지 못한 경우 body에서 추출
-                        body_paragraphs = soup.find_all("p")
-                        if body_paragraphs:
-                            main_content = " ".join(
-                                [p.get_text().strip() for p in body_paragraphs[:3]]
-                            )[:200]
-
-                    # 이미지 정보
-                    images = []
-                    img_tags = soup.find_all("img", src=True)[:3]  # 최대 3개
-                    for img in img_tags:
-                        if img.get("src"):
-                            images.append(
-                                {
-                                    "src": img.get("src"),
-                                    "alt": img.get("alt", ""),
-                                    "title": img.get("title", ""),
-                                }
-                            )
-
-                    # 연락처 정보
-                    contact_info = ""
-                    contact_patterns = [
-                        r"연락처[:：]\s*([^\n\r]+)",
-                        r"문의[:：]\s*([^\n\r]+)",
-                        r"이메일[:：]\s*([^\n\r]+)",
-                        r"전화[:：]\s*([^\n\r]+)",
-                    ]
-                    for pattern in contact_patterns:
-                        match = re.search(pattern, body_text)
-                        if match:
-                            contact_info = match.group(1).strip()[:50]
-                            break
-
-                    # 상세 내용 정보
-                    details = ""
-                    detail_patterns = [
-                        r"내용[:：]\s*([^\n\r]+)",
-                        r"상세[:：]\s*([^\n\r]+)",
-                        r"설명[:：]\s*([^\n\r]+)",
-                        r"소개[:：]\s*([^\n\r]+)",
-                    ]
-                    for pattern in detail_patterns:
-                        match = re.search(pattern, body_text)
-                        if match:
-                            details = match.group(1).strip()[:100]
-                            break
-
-                    # URL에서 사이트 정보 추출
-                    try:
-                        parsed_url = urlparse(url)
-                        site_name = parsed_url.netloc
-                    except:
-                        site_name = url.split('/')[2] if '://' in url else url
-
-                    page_info = {
-                        "title": title or "Unknown Title",
-                        "description": description or "No description available",
-                        "organizer": organizer,
-                        "period": period,
-                        "location": location,
-                        "target": target,
-                        "keywords": keywords,
-                        "main_content": main_content or "No content available",
-                        "images": images,
-                        "contact_info": contact_info or "No contact info",
-                        "details": details or "No details available",
-                        "site_name": site_name,
-                        "full_text": body_text[:500]
-                        + ("..." if len(body_text) > 500 else ""),  # 전체 텍스트 일부
-                    }
+                # 캐시에 없을 때만 동시 스크래핑 수 제한을 거친다 (초과 요청은 대기열에서 대기)
+                self._handle_scrape(url)
+                return
 
-                    self.send_response(200)
-                    self.send_header("Content-Type", "application/json; charset=utf-8")
-                    self.end_headers()
-                    response_data = json.dumps(page_info, ensure_ascii=False)
-                    self.wfile.write(response_data.encode("utf-8"))
-                    return
-                except Exception as e:
-                    self.send_response(500)
-                    self.send_header("Content-Type", "application/json")
-                    self.end_headers()
-                    error_response = json.dumps({"error": str(e)})
-                    self.wfile.write(error_response.encode())
-                    return
+        elif parsed_path.path == "/api/metrics":
+            response_data = json.dumps(
+                {
+                    "server": self.server.stats(),
+                    "scrape": scrape_limiter.stats(),
+                    "circuit": host_breaker.stats(),
+                    "cache": cache_stats(),
+                    "revalidation": http_client.revalidation_stats(),
+                    "short_links": short_link_resolver.stats(),
+                    "extraction": extraction_cache_stats(),
+                    "issues": issue_store.stats(),
+                    "bedrock": batch_stats(),
+                    "prompt": prompt_stats(),
+                    "link_index": link_index.stats(),
+                    "charset": http_client.charset_stats(),
+                    "escalation": escalation_stats(),
+                    "analysis_cache": analysis_cache.stats(),
+                }
+            )
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.end_headers()
+            self.wfile.write(response_data.encode("utf-8"))
+            return
 
         # 일반 파일 서빙
         super().do_GET()
 
+    def _proxy_fetch(self, url):
+        """업스트림 HTML을 메모리에 모으지 않고 청크 단위로 그대로 전달"""
+        response = None
+        try:
+            # 클라이언트가 보낸 검증자로 업스트림에 조건부 요청
+            response, content_encoding, chunks = http_client.stream_upstream(
+                url,
+                self.headers.get("Accept-Encoding", ""),
+                headers=http_client.forwarded_conditional_headers(self.headers) or None,
+                timeout=45,  # 로컬: 30s -> 45s
+                allow_redirects=True,
+            )
+            response.raise_for_status()
+        except Exception as e:
+            if response is not None:
+                response.close()
+            self.send_response(500)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            error_response = json.dumps({"error": str(e)})
+            self.wfile.write(error_response.encode())
+            return
+
+        validators = http_client.validator_headers(response, content_encoding)
+        if response.status_code == 304:
+            # 바뀌지 않았으면 본문 없이 304만 전달
+            response.close()
+            self.send_response(304)
+            for name, value in validators:
+                self.send_header(name, value)
+            self.end_headers()
+            return
+
+        # HTTP/1.1 클라이언트에는 이 응답만 chunked 전송으로 보내고, 그 외에는 연결 종료로 끝을 알림
+        chunked = self.request_version == "HTTP/1.1"
+        if chunked:
+            self.protocol_version = "HTTP/1.1"
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            if content_encoding:
+                self.send_header("Content-Encoding", content_encoding)
+            self.send_header("Vary", "Accept-Encoding")
+            for name, value in validators:
+                self.send_header(name, value)
+            if chunked:
+                self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                if chunked:
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                else:
+                    self.wfile.write(chunk)
+            if chunked:
+                self.wfile.write(b"0\r\n\r\n")
+        except Exception as e:
+            # 헤더를 보낸 뒤에는 상태 코드를 바꿀 수 없으므로 기록만 하고 연결을 닫는다
+            self.log_error("fetch proxy aborted: %s", e)
+        finally:
+            self.close_connection = True
+            response.close()
+
+    def _handle_scrape(self, url):
+        """단일 URL 스크래핑 요청 처리"""
+        try:
+            page_info = cached_scrape_page(url)
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.end_headers()
+            response_data = json.dumps(page_info, ensure_ascii=False)
+            self.wfile.write(response_data.encode("utf-8"))
+        except Exception as e:
+            self.send_response(500)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            error_response = json.dumps({"error": str(e)})
+            self.wfile.write(error_response.encode())
+
 
 if __name__ == "__main__":
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
-    with socketserver.TCPServer(("", PORT), CORSHTTPRequestHandler) as httpd:
+    with PooledHTTPServer(("", PORT), CORSHTTPRequestHandler) as httpd:
         print(f"Server running at http://localhost:{PORT}")
+        print(
+            f"Workers: {SERVER_MAX_WORKERS}, max in-flight scrapes: {MAX_INFLIGHT_SCRAPES}"
+        )
         print("Press Ctrl+C to stop the server")
 
         # 자동으로 브라우저 열기
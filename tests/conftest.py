@@ -0,0 +1,5 @@
+import os
+
+# 테스트가 임시 디렉터리의 공유 SQLite 캐시를 읽거나 쓰지 않도록 디스크 캐시를 끈다
+# (모듈을 import하기 전에 설정해야 한다)
+os.environ["SCRAPE_CACHE_DB"] = ""
@@ -0,0 +1,156 @@
+import json
+import random
+
+import pytest
+
+import bedrock_batch
+from bedrock_batch import (
+    JsonObjectStream,
+    analyze_in_chunks,
+    chunk_links,
+    estimate_output_tokens,
+    stream_in_chunks,
+)
+
+RESPONSE = {
+    "https://a.org/1": {"suggestion": "중괄호 } 와 쉼표 , 가 든 \"문장\"", "tags": ["a", {"b": [1, 2]}]},
+    "https://a.org/2?x=1&y={2}": {"suggestion": "역슬래시 \\ 와 줄바꿈\n", "score": 3},
+    "https://a.org/3": {"nested": {"deep": {"deeper": []}}, "empty": {}},
+}
+
+
+@pytest.fixture(autouse=True)
+def no_retry_sleep(monkeypatch):
+    monkeypatch.setattr(bedrock_batch.time, "sleep", lambda seconds: None)
+
+
+def links(count, text=""):
+    return [{"url": f"https://a.org/{i}", "text": text} for i in range(count)]
+
+
+def test_json_stream_whole_text():
+    parser = JsonObjectStream()
+    text = "분석 결과입니다:\n" + json.dumps(RESPONSE, ensure_ascii=False)
+    assert parser.feed(text) == list(RESPONSE.items())
+
+
+def test_json_stream_random_splits():
+    text = json.dumps(RESPONSE, ensure_ascii=False, indent=2)
+    rng = random.Random(0)
+    for _ in range(200):
+        cuts = sorted(rng.sample(range(1, len(text)), rng.randint(1, 30)))
+        parser = JsonObjectStream()
+        entries = []
+        for start, end in zip([0] + cuts, cuts + [len(text)]):
+            entries.extend(parser.feed(text[start:end]))
+        assert entries == list(RESPONSE.items())
+
+
+def test_json_stream_emits_each_entry_as_soon_as_it_closes():
+    parser = JsonObjectStream()
+    assert parser.feed('{"u1": {"a": 1}') == []
+    assert parser.feed(", ") == [("u1", {"a": 1})]
+    assert parser.feed('"u2": {"b": "}"}') == []
+    assert parser.feed("}") == [("u2", {"b": "}"})]
+
+
+def test_json_stream_drops_truncated_entry():
+    parser = JsonObjectStream()
+    assert parser.feed('{"u1": {"a": 1}, "u2": {"b": "잘린') == [("u1", {"a": 1})]
+
+
+def test_chunk_links_respects_output_budget():
+    items = links(60, text="청년 활동가 모집 공고")
+    chunks = chunk_links(items, max_tokens=4000)
+    budget = 4000 * bedrock_batch.OUTPUT_BUDGET_RATIO
+    assert len(chunks) > 1
+    assert [link for chunk in chunks for link in chunk] == items
+    for chunk in chunks:
+        assert sum(estimate_output_tokens(link) for link in chunk) <= budget
+
+
+def test_chunk_links_oversized_link_gets_its_own_chunk():
+    items = links(2) + [{"url": "https://a.org/long", "text": "가" * 10000}] + links(2)
+    chunks = chunk_links(items, max_tokens=4000)
+    assert [items[2]] in chunks
+    assert [link for chunk in chunks for link in chunk] == items
+
+
+def test_chunk_links_empty():
+    assert chunk_links([]) == []
+
+
+def test_run_chunk_retries_only_missing_links():
+    calls = []
+
+    def analyze(chunk):
+        calls.append([link["url"] for link in chunk])
+        # 첫 호출은 마지막 링크를 빠뜨린다
+        return {link["url"]: {"ok": True} for link in chunk[: 2 if len(calls) == 1 else None]}
+
+    results, error = bedrock_batch._run_chunk(links(3), analyze, retries=2)
+    assert set(results) == {"https://a.org/0", "https://a.org/1", "https://a.org/2"}
+    assert calls == [["https://a.org/0", "https://a.org/1", "https://a.org/2"], ["https://a.org/2"]]
+    assert error is None
+
+
+def test_run_chunk_survives_exceptions_and_reports_last_error():
+    calls = []
+
+    def analyze(chunk):
+        calls.append(len(chunk))
+        if len(calls) == 1:
+            raise RuntimeError("throttled")
+        return {"error": "Failed to parse response"}
+
+    results, error = bedrock_batch._run_chunk(links(2), analyze, retries=2)
+    assert results == {}
+    assert calls == [2, 2, 2]
+    assert error == "Failed to parse response"
+
+
+def test_analyze_in_chunks_retries_failed_chunk_without_rerunning_others():
+    items = links(6)
+    calls = []
+
+    def analyze(chunk):
+        urls = [link["url"] for link in chunk]
+        calls.append(urls)
+        if "https://a.org/4" in urls and sum(call == urls for call in calls) == 1:
+            return {"error": "timeout"}
+        return {url: {"url": url} for url in urls}
+
+    # 링크 하나에 약 210토큰이므로 max_tokens 600이면 두 개씩 세 묶음
+    results = analyze_in_chunks(items, analyze, max_tokens=600, max_workers=3, retries=1)
+    assert set(results) == {link["url"] for link in items}
+    assert sorted(map(tuple, calls)) == sorted(
+        [
+            ("https://a.org/0", "https://a.org/1"),
+            ("https://a.org/2", "https://a.org/3"),
+            ("https://a.org/4", "https://a.org/5"),
+            ("https://a.org/4", "https://a.org/5"),
+        ]
+    )
+
+
+def test_analyze_in_chunks_all_failed_returns_error():
+    assert analyze_in_chunks(links(2), lambda chunk: {"error": "denied"}, retries=0) == {
+        "error": "denied"
+    }
+
+
+def test_stream_in_chunks_resends_links_missing_after_a_cut_stream():
+    calls = []
+
+    def stream(chunk):
+        calls.append([link["url"] for link in chunk])
+        text = json.dumps({link["url"]: {"ok": True} for link in chunk})
+        if len(calls) == 1:
+            # 첫 응답은 두 번째 항목 중간에서 끊긴다
+            yield text[: text.index("a.org/1") + 10]
+            raise ConnectionError("stream closed")
+        yield text
+
+    entries = list(stream_in_chunks(links(3), stream, retries=1))
+    assert sorted(url for url, _ in entries) == ["https://a.org/0", "https://a.org/1", "https://a.org/2"]
+    assert calls[1] == ["https://a.org/1", "https://a.org/2"]
@@ -0,0 +1,121 @@
+import pytest
+
+import circuit_breaker
+from circuit_breaker import HostCircuitBreaker, host_of, is_host_failure
+
+TIMEOUT = {"error": True, "errorType": "timeout", "errorMessage": "시간 초과"}
+BLOCKED = {"error": True, "errorType": "http", "errorCode": 403, "description": "접근 거부"}
+NOT_FOUND = {"error": True, "errorType": "http", "errorCode": 404}
+PAGE = {"title": "채용 공고"}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def breaker(clock):
+    return HostCircuitBreaker(threshold=2, open_seconds=60)
+
+
+def state(breaker, url):
+    circuit = breaker._hosts.get(host_of(url))
+    return circuit["state"] if circuit else "closed"
+
+
+def test_host_failure_classification():
+    assert is_host_failure(TIMEOUT)
+    assert is_host_failure(BLOCKED)
+    assert is_host_failure({"error": True, "errorType": "connection"})
+    assert not is_host_failure(NOT_FOUND)
+    assert not is_host_failure(PAGE)
+    assert not is_host_failure(None)  # 304
+
+
+def test_opens_after_threshold_consecutive_failures(breaker):
+    url = "https://slow.example.org/a"
+    breaker.after(url, TIMEOUT)
+    assert state(breaker, url) == "closed"
+    assert breaker.before(url) is None
+    breaker.after(url, TIMEOUT)
+    assert state(breaker, url) == "open"
+
+    # 같은 호스트의 다른 링크는 요청하지 않고 마지막 오류로 바로 실패
+    fast = breaker.before("https://www.slow.example.org/b")
+    assert fast["circuitOpen"] is True
+    assert fast["errorType"] == "timeout"
+    assert breaker.stats()["fast_failed"] == 1
+    # 다른 호스트는 영향이 없다
+    assert breaker.before("https://other.example.org/") is None
+
+
+def test_success_resets_failure_count(breaker):
+    url = "https://flaky.example.org/"
+    breaker.after(url, TIMEOUT)
+    breaker.after(url, NOT_FOUND)  # 호스트는 응답했다
+    breaker.after(url, TIMEOUT)
+    assert state(breaker, url) == "closed"
+
+
+def test_half_open_probe_success_closes(breaker, clock):
+    url = "https://down.example.org/"
+    breaker.after(url, BLOCKED)
+    breaker.after(url, BLOCKED)
+    clock.now += 61
+    assert breaker.before(url) is None  # 확인 요청 하나는 보낸다
+    assert state(breaker, url) == "half_open"
+    assert breaker.before(url)["circuitOpen"]  # 확인 중에는 나머지를 막는다
+    breaker.after(url, PAGE)
+    assert state(breaker, url) == "closed"
+    assert breaker.before(url) is None
+    assert breaker.stats()["recovered"] == 1
+
+
+def test_half_open_probe_failure_reopens(breaker, clock):
+    url = "https://down.example.org/"
+    breaker.after(url, TIMEOUT)
+    breaker.after(url, TIMEOUT)
+    clock.now += 61
+    assert breaker.before(url) is None
+    breaker.after(url, TIMEOUT)
+    assert state(breaker, url) == "open"
+    clock.now += 30
+    assert breaker.before(url)["circuitOpen"]
+    assert breaker.stats()["opened"] == 2
+
+
+def test_unfinished_probe_is_retried_after_open_seconds(breaker, clock):
+    url = "https://hang.example.org/"
+    breaker.after(url, TIMEOUT)
+    breaker.after(url, TIMEOUT)
+    clock.now += 61
+    assert breaker.before(url) is None
+    clock.now += 61
+    assert breaker.before(url) is None
+    assert breaker.stats()["probes"] == 2
+
+
+def test_disabled_with_zero_threshold(clock):
+    breaker = HostCircuitBreaker(threshold=0)
+    for _ in range(5):
+        breaker.after("https://slow.example.org/", TIMEOUT)
+    assert breaker.before("https://slow.example.org/") is None
+
+
+def test_remembers_at_most_max_hosts(clock):
+    breaker = HostCircuitBreaker(threshold=1, open_seconds=60, max_hosts=2)
+    for host in ("a", "b", "c"):
+        breaker.after(f"https://{host}.example.org/", TIMEOUT)
+    assert breaker.before("https://a.example.org/") is None
+    assert breaker.before("https://c.example.org/")["circuitOpen"]
@@ -0,0 +1,95 @@
+import glob
+import os
+import random
+import re
+
+import pytest
+
+import http_client
+import scraper
+from scraper import FIELD_PATTERNS, FIELD_SCANNER
+
+CORPUS = sorted(
+    glob.glob(os.path.join(os.path.dirname(__file__), "..", "fixtures", "field_corpus", "*.html"))
+)
+
+# 본문 패턴의 키워드와 구분자를 섞어 만드는 임의 본문 조각
+FRAGMENTS = [
+    "까지", "까지 ", " 접수", "접수", " 신청", "신청", "\n", "\r", "\r\n", " ", "|",
+    "주최: 아름다운재단", "주관：센터", "by Ashoka", "ⓒ 오렌지레터",
+    "2026.01.02 ~ 2026.02.03", "12/1-12/3", "3일 후 마감", "마감: 2026년 5월 1일",
+    "접수기간: 11월 30일까지", "until May 3", "deadline: soon",
+    "장소: 서울", "서울시 마포구 합정동", "부산 해운대", "온라인", "Zoom",
+    "대상: 청년", "자격：누구나", "신입", "경력",
+    "문의: 02-123-4567", "이메일: a@b.org", "상세: 안내", "내용: 본문", "가나다", "abc",
+]
+
+
+def sequential_matches(field, text):
+    """user-008 이전 방식: 패턴마다 re.search"""
+    flags, patterns = FIELD_PATTERNS[field]
+    return [match for match in (re.search(pattern, text, flags) for pattern in patterns) if match]
+
+
+def signatures(matches):
+    return [(match.span(), match.groups()) for match in matches]
+
+
+def corpus_texts():
+    for path in CORPUS:
+        with open(path, "rb") as f:
+            content = http_client.decode_html(f.read())
+        yield scraper.collect_page_snapshot(scraper.make_soup(content))["text"]
+
+
+@pytest.mark.parametrize("field", list(FIELD_PATTERNS))
+def test_field_scanner_matches_sequential_search_on_corpus(field):
+    for text in corpus_texts():
+        assert signatures(FIELD_SCANNER.iter(field, text)) == signatures(
+            sequential_matches(field, text)
+        )
+
+
+def test_field_scanner_matches_sequential_search_on_random_text():
+    rng = random.Random(8)
+    for _ in range(2000):
+        text = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 40)))
+        for field in FIELD_PATTERNS:
+            assert signatures(FIELD_SCANNER.iter(field, text)) == signatures(
+                sequential_matches(field, text)
+            ), (field, text)
+
+
+def test_field_scanner_long_line_is_linear():
+    # 게으른 접두어 패턴을 그대로 re.search하면 수 초가 걸리는 줄바꿈 없는 본문
+    text = "지역 돌봄 활동가 모임 소식 " * 20000 + "12월 31일까지 접수"
+    match = next(FIELD_SCANNER.iter("period", text))
+    assert match.group(1).endswith("12월 31일까지")
+
+
+def extract(content, fast_path, parsers=None):
+    old = scraper.HEAD_FAST_PATH, scraper.EXTRACTION_CACHE_SIZE
+    scraper.HEAD_FAST_PATH, scraper.EXTRACTION_CACHE_SIZE = fast_path, 0
+    try:
+        return scraper.extract_page_info("https://example.org/page", content, parsers)
+    finally:
+        scraper.HEAD_FAST_PATH, scraper.EXTRACTION_CACHE_SIZE = old
+
+
+@pytest.mark.parametrize("parsers", [None, ["html.parser"]])
+@pytest.mark.parametrize("path", CORPUS, ids=os.path.basename)
+def test_head_fast_path_matches_full_parse(path, parsers):
+    with open(path, "rb") as f:
+        raw = f.read()
+    for content in (raw, http_client.decode_html(raw)):
+        assert extract(content, True, parsers) == extract(content, False, parsers)
+
+
+def test_head_fast_path_used_only_without_content_elements():
+    def load(name):
+        with open(os.path.join(os.path.dirname(CORPUS[0]), name), encoding="utf-8") as f:
+            return f.read()
+
+    assert scraper.extract_head_info("https://example.org/", load("structured_plain.html"))
+    # <main>이 있으면 본문 요약을 그 요소에서 가져와야 하므로 전체 파싱에 맡긴다
+    assert scraper.extract_head_info("https://example.org/", load("structured_main.html")) is None
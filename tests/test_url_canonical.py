@@ -0,0 +1,54 @@
+import pytest
+
+from url_canonical import canonical_url, is_tracking_param
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        # 스킴 통일, 호스트 소문자, 기본 포트, 끝의 /, fragment, 쿼리 정렬
+        ("HTTP://Example.COM:80/a/b/?utm_source=x&b=2&a=1#sec", "https://example.com/a/b?a=1&b=2"),
+        (" https://www.Example.com/ ", "https://www.example.com/"),
+        ("https://example.com.", "https://example.com/"),
+        ("https://example.com:8443/", "https://example.com:8443/"),
+        ("https://[::1]:8080/x", "https://[::1]:8080/x"),
+        # 해시 라우팅은 유지
+        ("https://example.com/#/route", "https://example.com/#/route"),
+        ("https://example.com/app#!/route", "https://example.com/app#!/route"),
+        # 퍼센트 인코딩은 대문자로
+        ("https://example.com/%7euser", "https://example.com/%7Euser"),
+        ("https://example.com/p?x=%2f", "https://example.com/p?x=%2F"),
+        # 추적 파라미터만 지우고 빈 값은 유지
+        ("https://example.com/?fbclid=1&UTM_Campaign=2&ref=a&empty=", "https://example.com/?empty=&ref=a"),
+    ],
+)
+def test_canonical_url(url, expected):
+    assert canonical_url(url) == expected
+
+
+@pytest.mark.parametrize(
+    "url",
+    ["mailto:a@b.c", "javascript:void(0)", "/relative/path", "http://exa mple.com:99999/"],
+)
+def test_non_http_or_invalid_urls_are_returned_unchanged(url):
+    assert canonical_url(url) == url
+
+
+def test_variants_of_the_same_page_share_a_key():
+    variants = [
+        "https://saramin.co.kr/job?id=1&rec=2",
+        "http://saramin.co.kr/job/?rec=2&id=1&utm_medium=email",
+        "https://SARAMIN.co.kr:443/job?id=1&rec=2&gclid=abc#apply",
+    ]
+    assert len({canonical_url(url) for url in variants}) == 1
+
+
+def test_different_query_values_stay_distinct():
+    assert canonical_url("https://a.org/view?id=1") != canonical_url("https://a.org/view?id=2")
+
+
+def test_tracking_param_prefix_match():
+    assert is_tracking_param("utm_anything")
+    assert is_tracking_param("FBCLID")
+    assert not is_tracking_param("utm")
+    assert not is_tracking_param("id")